@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the audit log.
+
+Records a stream of changes to a store and reports what the log adds to
+each change, its size on disk next to keeping a copy of the store file
+per change, and looking up one task's history through the per-task
+index against scanning the whole log.
+
+Usage: python benchmarks/bench_audit.py [task_count] [changes]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.audit import AuditLog
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def changes_per_second(storage: TaskStorage, changes: int, seed: int) -> float:
+    """Apply a mix of updates and toggles and return the mean time per change, in microseconds."""
+    rng = random.Random(seed)
+    task_count = storage.get_task_count()
+    start = time.perf_counter()
+    for i in range(changes):
+        task_id = rng.randint(1, task_count)
+        if i % 2:
+            storage.toggle_task_status(task_id)
+        else:
+            storage.update_task(task_id, description=f"Revision {i}", priority=rng.choice(["low", "high"]))
+    return (time.perf_counter() - start) / changes * 1e6
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    print(f"Audit log benchmark with {task_count:,} tasks and {changes:,} changes")
+    print("=" * 55)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        # A long flush interval keeps saves out of the per-change timings
+        storage = TaskStorage(filename, flush_interval_ms=600_000, flush_max_pending=changes * 10)
+        storage.import_tasks([{"title": f"Task number {i}", "project": "Ops"} for i in range(task_count)])
+        storage.flush()
+        store_bytes = os.path.getsize(filename)
+        plain = changes_per_second(storage, changes, seed=1)
+
+        log = AuditLog(os.path.join(tmp_dir, "audit"))
+        storage.add_listener(log.on_change)
+        audited = changes_per_second(storage, changes, seed=2)
+        stats = log.get_stats()
+        log_bytes = stats["sealed_bytes"] + stats["active_bytes"]
+
+        task_ids = random.Random(3).sample(range(1, task_count + 1), 20)
+        indexed = timed(lambda: [log.history(task_id) for task_id in task_ids]) / len(task_ids)
+        scan = timed(lambda: [entry for entry in log.iter_entries() if entry["task_id"] == task_ids[0]],
+                     repeat=1)
+        entries = sum(len(log.history(task_id)) for task_id in task_ids) / len(task_ids)
+        storage.close()
+        log.close()
+
+    print(f"Change without audit log:         {plain:10.1f} us")
+    print(f"Change with audit log:            {audited:10.1f} us")
+    print(f"Audit log on disk:                {log_bytes / 1e6:10.2f} MB "
+          f"({stats['sealed_segments']} sealed segments, {log_bytes / changes:.0f} bytes/change)")
+    print(f"A store copy per change:          {store_bytes * changes / 1e6:10.2f} MB")
+    print(f"history(task) via the index:      {indexed * 1000:10.2f} ms ({entries:.0f} entries)")
+    print(f"history(task) by scanning the log:{scan * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
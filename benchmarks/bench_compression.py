@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compressed storage formats.
+
+Saves and loads the same store uncompressed and with each available
+codec at a few compression levels, reporting file size, compression
+ratio and save/load times.
+
+Usage: python benchmarks/bench_compression.py [task_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.file_codecs import available_codecs
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+LEVELS = {"gzip": [1, 6, 9], "lzma": [0, 6], "zstd": [1, 3, 19]}
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Compression benchmark with {task_count:,} tasks")
+    print("=" * 72)
+    print(f"{'Format':<10}{'Level':>6}{'Size':>14}{'Ratio':>8}{'Save ms':>12}{'Load ms':>12}")
+
+    records = [
+        {"title": f"Task number {i}", "description": f"Description for task {i}",
+         "tags": ["work"] if i % 3 else [], "project": f"Project {i % 10}"}
+        for i in range(task_count)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = TaskStorage(os.path.join(tmp_dir, "source.json"))
+        source.import_tasks(records)
+        records = list(source.iter_records())
+        next_id = source.get_next_id()
+
+        configurations = [(None, None)] + [(codec, level) for codec in available_codecs()
+                                           for level in LEVELS[codec]]
+        plain_size = None
+        for codec, level in configurations:
+            filename = os.path.join(tmp_dir, f"{codec}-{level}.json")
+            storage = TaskStorage(filename, compression=codec, compression_level=level)
+            storage.replace_tasks(iter(records), next_id, trusted=True)
+
+            save = timed(storage.save_to_file)
+            load = timed(lambda: TaskStorage(filename))
+            size = os.path.getsize(filename)
+            plain_size = plain_size or size
+            print(f"{codec or 'none':<10}{'-' if level is None else level:>6}{size:>14,}"
+                  f"{plain_size / size:>8.1f}{save * 1000:>12.1f}{load * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
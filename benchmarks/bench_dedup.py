@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark near-duplicate detection.
+
+Builds a store of random titles with a known number of planted
+near-duplicates, then compares the MinHash/LSH index with exhaustive
+pairwise comparison, both for a whole-store report and for checking a
+single new title before it is added.
+
+Usage: python benchmarks/bench_dedup.py [task_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.dedup import DuplicateIndex, jaccard, shingles, task_text
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+WORDS = ("buy call email fix write review plan book pay send update clean order check "
+         "schedule prepare submit renew cancel organise milk report invoice dentist car "
+         "passport meeting budget slides garden kitchen tickets insurance taxes gift "
+         "laptop backup server release draft contract team client weekly monthly").split()
+
+
+def timed(func, repeat: int = 1) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    planted = task_count // 100
+    rng = random.Random(42)
+    titles = [" ".join(rng.sample(WORDS, 5)) + f" {rng.randrange(1000)}" for _ in range(task_count)]
+    titles += [title.upper() + "!" for title in titles[:planted]]
+    print(f"Duplicate detection benchmark with {len(titles):,} tasks ({planted:,} planted duplicates)")
+    print("=" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        storage.import_tasks([{"title": title} for title in titles])
+
+        index = None
+
+        def build():
+            nonlocal index
+            index = DuplicateIndex(storage)
+
+        print(f"{'Build LSH index':<40}{timed(build):>10.2f} s")
+        groups = []
+
+        def report():
+            nonlocal groups
+            groups = index.find_duplicates()
+
+        print(f"{'find_duplicates() with LSH':<40}{timed(report):>10.2f} s   {len(groups):,} groups")
+
+        # Pairwise comparison is quadratic, so time a sample and extrapolate
+        sample = [shingles(task_text(title)) for title in titles[:2000]]
+
+        def pairwise_sample():
+            for i, first in enumerate(sample):
+                for second in sample[i + 1:]:
+                    jaccard(first, second)
+
+        pairs = len(titles) * (len(titles) - 1) / 2
+        sample_pairs = len(sample) * (len(sample) - 1) / 2
+        estimate = timed(pairwise_sample) * pairs / sample_pairs
+        print(f"{'Pairwise comparison (extrapolated)':<40}{estimate:>10.2f} s")
+
+        queries = [rng.choice(titles) for _ in range(200)]
+        lsh = timed(lambda: [index.find_similar(query) for query in queries])
+        query_shingles = [shingles(task_text(query)) for query in queries[:5]]
+        all_shingles = [shingles(task_text(title)) for title in titles]
+        scan = timed(lambda: [[jaccard(query, other) for other in all_shingles]
+                              for query in query_shingles])
+        print(f"{'Check one new title, LSH':<40}{lsh / len(queries) * 1e3:>10.3f} ms")
+        print(f"{'Check one new title, full scan':<40}{scan / len(query_shingles) * 1e3:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
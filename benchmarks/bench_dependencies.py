@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the incrementally maintained ready set.
+
+Builds a store where most tasks wait on a few earlier ones and compares
+next_actionable(), which reads the ready set, with finding the ready
+tasks by checking every task's blockers. Also measures what keeping the
+ready set current adds to a toggle and to adding a dependency.
+
+Usage: python benchmarks/bench_dependencies.py [task_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def full_scan(storage: TaskStorage):
+    """Find the ready tasks by looking at every task and its blockers."""
+    ready = []
+    for task in storage.iter_tasks():
+        if not task.completed and all(
+                (blocker := storage.get_task(blocker_id)) is None or blocker.completed
+                for blocker_id in task.blocked_by):
+            ready.append(task)
+    return ready
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    changes = 5_000
+    rng = random.Random(7)
+    print(f"Dependency benchmark with {task_count:,} tasks")
+    print("=" * 55)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # A long flush interval keeps saves out of the per-change timings
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"), flush_interval_ms=600_000,
+                              flush_max_pending=changes * 10)
+        # Nine in ten tasks wait on up to three tasks from earlier imports
+        for first in range(0, task_count, 1000):
+            storage.import_tasks([{"title": f"Task number {i}", "priority": rng.choice(["low", "high"]),
+                                   "blocked_by": rng.sample(range(1, first + 1), rng.randint(1, 3))
+                                   if first and rng.random() < 0.9 else []}
+                                  for i in range(first, min(first + 1000, task_count))])
+
+        ready = len(storage.next_actionable())
+        assert ready == len(full_scan(storage))
+        scan = timed(lambda: full_scan(storage))
+        incremental = timed(storage.next_actionable, repeat=20)
+        top = timed(lambda: storage.next_actionable(limit=10), repeat=20)
+
+        start = time.perf_counter()
+        for _ in range(changes):
+            storage.toggle_task_status(rng.randint(1, task_count))
+        toggle = (time.perf_counter() - start) / changes * 1e6
+
+        start = time.perf_counter()
+        for _ in range(changes):
+            task_id, blocker_id = sorted(rng.sample(range(1, task_count + 1), 2), reverse=True)
+            try:
+                storage.add_dependency(task_id, blocker_id)
+            except ValueError:
+                pass  # Blocker limit reached
+        add_edge = (time.perf_counter() - start) / changes * 1e6
+        storage.close()
+
+    print(f"Ready tasks:                        {ready:10,}")
+    print(f"Ready tasks by full scan:           {scan * 1000:10.1f} ms")
+    print(f"next_actionable() (all, sorted):    {incremental * 1000:10.1f} ms")
+    print(f"next_actionable(limit=10):          {top * 1000:10.1f} ms")
+    print(f"Toggle, ready set kept current:     {toggle:10.1f} us")
+    print(f"Add dependency with cycle check:    {add_edge:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming exports.
+
+Exports the same store in every format, reporting throughput in tasks
+and megabytes per second, plus the peak memory allocated while
+exporting, which stays flat however large the store is.
+
+Usage: python benchmarks/bench_export.py [task_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.export import EXPORT_FORMATS, export_tasks
+from phase_i_in_memory_python_console_app.storage import TaskStorage, task_filter
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Export benchmark with {task_count:,} tasks")
+    print("=" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        storage.replace_tasks(({"id": i, "title": f"Task {i}", "description": "Some details",
+                                "completed": i % 3 == 0, "tags": ["bench"], "project": f"p{i % 10}",
+                                "priority": "medium"}
+                               for i in range(1, task_count + 1)), task_count + 1, trusted=True)
+        output_path = os.path.join(tmp_dir, "export")
+
+        print(f"{'Format':<8}{'Tasks/s':>14}{'MB/s':>10}{'Size MB':>10}{'Seconds':>10}{'Peak KiB':>11}")
+        for format in EXPORT_FORMATS:
+            with open(output_path, 'w', encoding='utf-8', newline='') as f:
+                start = time.perf_counter()
+                count = export_tasks(storage, f, format)
+                elapsed = time.perf_counter() - start
+            size = os.path.getsize(output_path) / 1e6
+
+            # Peak memory on a slice of the store; it does not grow with the task count
+            tracemalloc.start()
+            with open(output_path, 'w', encoding='utf-8', newline='') as f:
+                export_tasks(storage, f, format, filter=lambda task: task.id <= 100_000)
+            peak = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+
+            print(f"{format:<8}{count / elapsed:>14,.0f}{size / elapsed:>10.1f}{size:>10.1f}"
+                  f"{elapsed:>10.2f}{peak:>11.0f}")
+
+        matches = task_filter(project="p3", completed=False)
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            start = time.perf_counter()
+            count = export_tasks(storage, f, "csv", order_by="title", filter=matches)
+            elapsed = time.perf_counter() - start
+        print(f"\nFiltered csv by title: {count:,} of {task_count:,} tasks in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
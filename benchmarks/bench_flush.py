@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark write coalescing with the background flusher.
+
+Measures the latency of single toggles on a store of the given size when
+every change is saved synchronously, and when saves are handed to the
+background flusher, along with how many saves each mode made.
+
+Usage: python benchmarks/bench_flush.py [task_count] [changes]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+
+def measure(storage: TaskStorage, changes: int):
+    """Return per-change latencies in seconds for a run of toggles."""
+    task_count = storage.get_task_count()
+    latencies = []
+    for i in range(changes):
+        start = time.perf_counter()
+        storage.toggle_task_status(i % task_count + 1)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label: str, latencies, elapsed: float, saves: int):
+    p50 = statistics.median(latencies) * 1000
+    p99 = sorted(latencies)[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{label:<14} p50 {p50:8.2f} ms   p99 {p99:8.2f} ms   "
+          f"total {elapsed * 1000:8.1f} ms   saves {saves}")
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"Flush benchmark: {changes} changes on {task_count:,} tasks")
+    print("=" * 75)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        TaskStorage(filename).import_tasks([{"title": f"Task {i}"} for i in range(task_count)])
+
+        storage = TaskStorage(filename)
+        start = time.perf_counter()
+        latencies = measure(storage, changes)
+        report("Synchronous", latencies, time.perf_counter() - start, changes)
+
+        storage = TaskStorage(filename, flush_interval_ms=200)
+        start = time.perf_counter()
+        latencies = measure(storage, changes)
+        stats = storage.get_flush_stats()
+        storage.close()  # Final save of whatever is still pending
+        report("Background", latencies, time.perf_counter() - start,
+               stats["flushes"] + (1 if stats["pending"] else 0))
+
+
+if __name__ == "__main__":
+    main()
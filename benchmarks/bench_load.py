@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark decoding the store file as a stream.
+
+Decodes the same store file with json.loads on the whole document and
+with json_stream.iter_members, uncompressed and gzip-compressed,
+reporting the decode time and the peak memory of each, with every
+decoded record kept. Both include reading (and decompressing) the file
+and the sha256 of its bytes, as a load does.
+
+Usage: python benchmarks/bench_load.py [task_count]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.file_codecs import open_read
+from phase_i_in_memory_python_console_app.json_stream import iter_members
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func) -> int:
+    """Return the peak traced memory of one run, in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def decode_whole(filename: str):
+    """Decode the file as one document, as json.load does."""
+    with open_read(filename) as f:
+        raw = f.read()
+    hashlib.sha256(raw).hexdigest()
+    return json.loads(raw)["tasks"]
+
+
+def decode_stream(filename: str):
+    """Decode the file one window of task records at a time."""
+    digest = hashlib.sha256()
+    with open_read(filename) as f:
+        tasks = {key: value for section, key, value in iter_members(f, "tasks", digest) if section}
+    digest.hexdigest()
+    return tasks
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Streaming decode benchmark with {task_count:,} tasks")
+    print("=" * 72)
+    print(f"{'Format':<8}{'Whole ms':>12}{'Stream ms':>12}{'Overhead':>10}"
+          f"{'Whole MB':>14}{'Stream MB':>14}")
+
+    records = [
+        {"title": f"Task number {i}", "description": f"Description for task {i}" * 3,
+         "tags": ["work"] if i % 3 else []}
+        for i in range(task_count)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for codec in (None, "gzip"):
+            filename = os.path.join(tmp_dir, f"{codec}.json")
+            TaskStorage(filename, compression=codec).import_tasks(records)
+
+            whole = timed(lambda: decode_whole(filename))
+            stream = timed(lambda: decode_stream(filename))
+            # Both keep every decoded record, as a load does; the difference
+            # is the file text held alongside them
+            whole_peak = peak_memory(lambda: decode_whole(filename))
+            stream_peak = peak_memory(lambda: decode_stream(filename))
+            print(f"{codec or 'none':<8}{whole * 1000:>12.1f}{stream * 1000:>12.1f}"
+                  f"{(stream / whole - 1) * 100:>9.1f}%"
+                  f"{whole_peak / 2**20:>14.1f}{stream_peak / 2**20:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
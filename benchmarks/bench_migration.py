@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark opening a store written with an older schema.
+
+Writes a version 1 (unversioned) task file and compares the time until
+the store is usable, with the rewrite left to the background thread,
+against also waiting for the rewrite, and against opening a file that is
+already in the current schema.
+
+Usage: python benchmarks/bench_migration.py [task_count]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.schema import SCHEMA_VERSION
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Schema migration benchmark with {task_count:,} tasks")
+    print("=" * 55)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy = os.path.join(tmp_dir, "legacy.json")
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump({"tasks": {str(i): {"id": i, "title": f"Task number {i}",
+                                          "description": f"Description for task {i}",
+                                          "completed": i % 3 == 0}
+                                 for i in range(1, task_count + 1)},
+                       "next_id": task_count + 1}, f)
+
+        filename = os.path.join(tmp_dir, "tasks.json")
+        shutil.copy(legacy, filename)
+        start = time.perf_counter()
+        storage = TaskStorage(filename)
+        usable = time.perf_counter() - start
+        storage.wait_for_upgrade()
+        upgraded = time.perf_counter() - start
+        assert storage.get_schema_info()["file_schema_version"] == SCHEMA_VERSION
+
+        start = time.perf_counter()
+        TaskStorage(filename)
+        current = time.perf_counter() - start
+
+    print(f"Open current schema file:      {current * 1000:9.1f} ms")
+    print(f"Open old file, store usable:   {usable * 1000:9.1f} ms")
+    print(f"Open old file, file rewritten: {upgraded * 1000:9.1f} ms")
+    print(f"Start-up time saved by the background rewrite: {(upgraded - usable) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
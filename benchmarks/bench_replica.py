@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark shared-memory read replicas.
+
+Publishes a store into shared memory and compares the cost of publishing
+and of a reader attaching to the snapshot with reloading the store file,
+plus point lookups served from the replica vs the writer's store.
+
+Usage: python benchmarks/bench_replica.py [task_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.replica import ReplicaPublisher, ReplicaReader
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Read replica benchmark with {task_count:,} tasks")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        storage = TaskStorage(filename)
+        storage.import_tasks([{"title": f"Task {i}", "description": "Some details",
+                               "tags": ["bench"], "project": f"p{i % 10}"}
+                              for i in range(task_count)])
+        publisher = ReplicaPublisher(storage, f"todo-bench-{os.getpid()}")
+        try:
+            print(f"{'Publish snapshot':<36}{timed(publisher.publish) * 1000:>12.1f} ms")
+            print(f"{'Reload store file (per reader)':<36}"
+                  f"{timed(lambda: TaskStorage(filename)) * 1000:>12.1f} ms")
+            print(f"{'Attach replica (per reader)':<36}"
+                  f"{timed(lambda: ReplicaReader(publisher.name).close()) * 1000:>12.3f} ms")
+
+            reader = ReplicaReader(publisher.name)
+            ids = [random.randint(1, task_count) for _ in range(10_000)]
+            for label, get_task in (("Store get_task", storage.get_task),
+                                    ("Replica get_task", reader.get_task)):
+                seconds = timed(lambda: [get_task(task_id) for task_id in ids])
+                print(f"{label:<36}{seconds / len(ids) * 1e6:>12.2f} µs")
+            reader.close()
+        finally:
+            publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark related-task search.
+
+Fills a store with generated tasks and compares find_related() on the
+exact and the approximate (LSH) index with embedding every task on each
+query in a plain Python loop. Also reports the recall of approximate
+search against exact search, the cost of keeping the index current on a
+change, and which backend (NumPy or sparse) is in use.
+
+Usage: python benchmarks/bench_semantic.py [task_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.semantic import SemanticIndex, hashing_embedding, task_text
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+VERBS = ["Draft", "Review", "Send", "Update", "Plan", "Book", "Fix", "Prepare", "Call", "Renew"]
+NOUNS = ["quarterly report", "budget", "flight", "hotel", "invoice", "slides", "contract",
+         "passport", "dentist appointment", "newsletter", "roadmap", "team offsite", "tax return"]
+DETAILS = ["for the board", "before Friday", "with finance", "for the client", "next week",
+           "and share it", "for the Berlin trip", "with the landlord"]
+QUERIES = ["anything about the quarterly report?", "travel plans for Berlin", "money owed to us",
+           "prepare the board slides", "renew my passport", "plan the team offsite"]
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def brute_force(storage: TaskStorage, query: str, k: int):
+    """Embed every task and score it against the query, with no index."""
+    vector = hashing_embedding(query)
+    scores = []
+    for task in storage.iter_tasks():
+        other = hashing_embedding(task_text(task.title, task.description))
+        scores.append((sum(value * other.get(dimension, 0.0) for dimension, value in vector.items()),
+                       task.id))
+    scores.sort(key=lambda match: (-match[0], match[1]))
+    return [task_id for score, task_id in scores[:k] if score > 0]
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    k = 10
+    changes = 2_000
+    rng = random.Random(5)
+    print(f"Related-task search benchmark with {task_count:,} tasks")
+    print("=" * 55)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # A long flush interval keeps saves out of the per-change timings
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"), flush_interval_ms=600_000,
+                              flush_max_pending=changes * 10)
+        storage.import_tasks([{"title": f"{rng.choice(VERBS)} the {rng.choice(NOUNS)} {rng.choice(DETAILS)}",
+                               "description": f"Item {i}"} for i in range(task_count)])
+
+        start = time.perf_counter()
+        exact = SemanticIndex(storage)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        approximate = SemanticIndex(storage, approximate=True)
+        build_approximate = time.perf_counter() - start
+
+        scan = timed(lambda: brute_force(storage, QUERIES[0], k), repeat=1)
+        exact_time = timed(lambda: [exact.find_related(query, k) for query in QUERIES]) / len(QUERIES)
+        approximate_time = timed(lambda: [approximate.find_related(query, k)
+                                          for query in QUERIES]) / len(QUERIES)
+        # Many generated tasks tie, so an approximate result counts as found
+        # if it scores at least as high as the k-th exact result
+        found = total = 0
+        for query in QUERIES:
+            expected = exact.find_related(query, k)
+            kth = expected[-1][1] - 1e-6
+            found += sum(score >= kth for _, score in approximate.find_related(query, k))
+            total += len(expected)
+
+        start = time.perf_counter()
+        for i in range(changes):
+            storage.update_task(rng.randint(1, task_count), title=f"{rng.choice(VERBS)} the {rng.choice(NOUNS)}")
+        update = (time.perf_counter() - start) / changes * 1e6
+        stats = exact.get_stats()
+        storage.close()
+
+    print(f"Backend:                            {stats['backend']:>10}")
+    print(f"Build exact index:                  {build * 1000:10.1f} ms")
+    print(f"Build approximate index:            {build_approximate * 1000:10.1f} ms")
+    print(f"Query by embedding every task:      {scan * 1000:10.1f} ms")
+    print(f"find_related(), exact:              {exact_time * 1000:10.1f} ms")
+    print(f"find_related(), approximate:        {approximate_time * 1000:10.1f} ms")
+    print(f"Approximate recall@{k}:              {found / total:10.2f}")
+    print(f"Title update, both indexes current: {update:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark agent session start-up with and without the skill pool.
+
+For stores of growing size, compares building a fresh skill per session
+(create_skill, which loads the store file) with checking a pre-warmed
+skill out of a SkillPool.
+
+Usage: python benchmarks/bench_skill_pool.py [max_task_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add the repository root to the path so the skill's imports resolve
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.phase_i_in_memory_python_console_app.agent_skill import SkillPool, create_skill
+from src.phase_i_in_memory_python_console_app.storage import TaskStorage
+
+
+def timed(func, repeat: int = 5) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    max_task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print("Agent session start-up")
+    print("=" * 55)
+    print(f"{'Tasks':>10}{'create_skill ms':>20}{'pool checkout ms':>20}")
+
+    task_count = 1_000
+    while task_count <= max_task_count:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "tasks.json")
+            TaskStorage(filename).import_tasks([{"title": f"Task {i}"} for i in range(task_count)])
+
+            fresh = timed(lambda: create_skill(filename))
+            pool = SkillPool(filename, size=4)
+            pooled = timed(lambda: pool.checkin(pool.checkout()))
+            print(f"{task_count:>10,}{fresh * 1000:>20.2f}{pooled * 1000:>20.4f}")
+        task_count *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark copy-on-write snapshots.
+
+Compares taking a consistent copy of the store by deep-copying every task
+with TaskStorage.snapshot(), and measures what keeping snapshots current
+adds to each change.
+
+Usage: python benchmarks/bench_snapshot.py [task_count]
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def toggles(storage: TaskStorage, changes: int) -> float:
+    """Return the mean time of a toggle, in microseconds."""
+    task_count = storage.get_task_count()
+    start = time.perf_counter()
+    for i in range(changes):
+        storage.toggle_task_status(i * 7919 % task_count + 1)
+    return (time.perf_counter() - start) / changes * 1e6
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    changes = 20_000
+    print(f"Snapshot benchmark with {task_count:,} tasks")
+    print("=" * 55)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # A long flush interval keeps saves out of the per-change timings
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"), flush_interval_ms=600_000,
+                              flush_max_pending=changes * 10)
+        storage.import_tasks([{"title": f"Task number {i}", "tags": ["work"]}
+                              for i in range(task_count)])
+
+        deep_copy = timed(lambda: copy.deepcopy(storage.get_all_tasks()), repeat=1)
+        plain_change = toggles(storage, changes)
+        start = time.perf_counter()
+        storage.snapshot()
+        first = time.perf_counter() - start
+        later = timed(storage.snapshot, repeat=1000)
+        cow_change = toggles(storage, changes)
+        snapshot = storage.snapshot()
+        read = timed(lambda: sum(1 for _ in snapshot.iter_tasks()))
+        storage.close()
+
+    print(f"Deep copy of all tasks:        {deep_copy * 1000:10.1f} ms")
+    print(f"First snapshot (builds copy):  {first * 1000:10.1f} ms")
+    print(f"Later snapshots:               {later * 1e6:10.2f} us")
+    print(f"Full scan of a snapshot:       {read * 1000:10.1f} ms")
+    print(f"Toggle without snapshots:      {plain_change:10.1f} us")
+    print(f"Toggle with snapshots:         {cow_change:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the validation fast paths.
+
+Compares loading a checksummed snapshot (trusted, no per-task validation)
+with loading the same file without its checksum (every task validated),
+and both with the original loader, which read the file with json.load and
+built every task with validation. Also compares per-object validation with
+the bulk column validator used by imports.
+
+Usage: python benchmarks/bench_validation.py [task_count]
+"""
+
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.models import Task
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+from phase_i_in_memory_python_console_app.validation import validate_columns
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_records(task_count: int):
+    """Build import records for a store of task_count tasks."""
+    return [
+        {"title": f"Task number {i}", "description": f"Description for task {i}" * 3}
+        for i in range(task_count)
+    ]
+
+
+@dataclass
+class OriginalTask:
+    """The task model as it was before validation on assignment, for the original loader."""
+    id: int
+    title: str
+    description: Optional[str] = None
+    completed: bool = False
+
+    def __post_init__(self):
+        if not (1 <= len(self.title) <= 200):
+            raise ValueError("Title must be between 1 and 200 characters")
+        if self.description and len(self.description) > 1000:
+            raise ValueError("Description must be at most 1000 characters")
+
+
+def load_with_json_load(filename: str):
+    """Load the file the way TaskStorage did before trusted loads and indexes."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {int(task_id): OriginalTask(id=task_data["id"], title=task_data["title"],
+                                       description=task_data.get("description"),
+                                       completed=task_data.get("completed", False))
+            for task_id, task_data in data.get("tasks", {}).items()}
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Validation benchmark with {task_count:,} tasks")
+    print("=" * 55)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        TaskStorage(filename).import_tasks(make_records(task_count))
+        # Free the writing store, so every load runs with the same live heap
+        gc.collect()
+
+        original = timed(lambda: load_with_json_load(filename))
+        trusted = timed(lambda: TaskStorage(filename))
+        os.remove(filename + ".sha256")
+        validated = timed(lambda: TaskStorage(filename))
+
+    print(f"Load, original json.load:    {original * 1000:9.1f} ms")
+    print(f"Load, checksummed snapshot:  {trusted * 1000:9.1f} ms"
+          f"  ({(trusted / original - 1) * 100:+.1f} % vs original)")
+    print(f"Load, full validation:       {validated * 1000:9.1f} ms"
+          f"  ({(validated / original - 1) * 100:+.1f} % vs original)")
+
+    records = make_records(task_count)
+    titles = [record["title"] for record in records]
+    descriptions = [record["description"] for record in records]
+    per_object = timed(lambda: [Task(id=i, title=t, description=d)
+                                for i, (t, d) in enumerate(zip(titles, descriptions))])
+    bulk = timed(lambda: validate_columns(titles, descriptions))
+    trusted_build = timed(lambda: [Task.from_trusted(id=i, title=t, description=d)
+                                   for i, (t, d) in enumerate(zip(titles, descriptions))])
+
+    print(f"Validated construction:      {per_object * 1000:9.1f} ms")
+    print(f"Bulk validation + trusted:   {(bulk + trusted_build) * 1000:9.1f} ms"
+          f"  (validation alone {bulk * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,41 @@ This module provides programmatic access to todo management functions
 that can be used by AI agents.
 """
 
-from typing import List, Optional, Dict, Any
-from src.phase_i_in_memory_python_console_app.storage import TaskStorage
+import functools
+import io
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterator
+from src.phase_i_in_memory_python_console_app.audit import acting_as
+from src.phase_i_in_memory_python_console_app.storage import TaskStorage, task_filter
+from src.phase_i_in_memory_python_console_app.dedup import DuplicateIndex
+from src.phase_i_in_memory_python_console_app.export import export_tasks
 from src.phase_i_in_memory_python_console_app.models import Task
+from src.phase_i_in_memory_python_console_app.semantic import SemanticIndex
+from src.phase_i_in_memory_python_console_app.scheduler import (
+    SCHEDULE_SUFFIX,
+    Schedule,
+    ScheduledEvent,
+    TaskScheduler
+)
+from src.phase_i_in_memory_python_console_app.tenants import TenantStore
+
+# What add_task does when the new task looks like an existing one
+DUPLICATE_MODES = ("allow", "flag", "reject")
+
+
+def _as_actor(method):
+    """
+    Attribute the store changes a skill method makes to the skill's actor
+    in the audit log.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with acting_as(self.actor):
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class TodoAgentSkill:
@@ -15,54 +47,373 @@ class TodoAgentSkill:
     access to todo operations for AI agents.
     """
 
-    def __init__(self, filename: str = "tasks.json"):
-        self.storage = TaskStorage(filename)
+    def __init__(self, filename: str = "tasks.json", tenant: Optional[str] = None,
+                 tenants: Optional[TenantStore] = None, storage: Optional[TaskStorage] = None,
+                 scheduler: Optional[TaskScheduler] = None, duplicates: str = "allow",
+                 duplicate_index: Optional[DuplicateIndex] = None, actor: str = "agent",
+                 audit_dir: Optional[str] = None, semantic_index: Optional[SemanticIndex] = None):
+        """
+        Args:
+            filename: Task store file, used when no tenant or storage is given
+            tenant: Name of the tenant whose task list this skill manages (optional)
+            tenants: Tenant shards to use with a tenant (optional, a
+                TenantStore in "tenants/" if omitted)
+            storage: An already loaded store to operate on, e.g. one shared
+                by a SkillPool (optional)
+            scheduler: Reminder and repeating task scheduler to use (optional;
+                one is created on first use, kept next to the store file, or
+                in memory only when a storage was given)
+            duplicates: What add_task does with a near-duplicate of an existing
+                task: "allow" it, add it but "flag" the similar tasks, or
+                "reject" it (default "allow")
+            duplicate_index: Near-duplicate index to use (optional; one is
+                built on first use)
+            actor: Name the audit log records for changes made through this
+                skill (default "agent")
+            audit_dir: Directory to keep an audit log of the store in, used
+                when the skill opens the store from filename (optional)
+            semantic_index: Vector index for find_related to use, e.g. one
+                with a model's embedder (optional; one is built on first use)
+        """
+        if duplicates not in DUPLICATE_MODES:
+            raise ValueError(f"Duplicates must be one of: {', '.join(DUPLICATE_MODES)}")
+        self.tenant = tenant
+        self.duplicates = duplicates
+        self.actor = actor
+        self._duplicate_index = duplicate_index
+        self._semantic_index = semantic_index
+        self._scheduler = scheduler
+        if tenant is None:
+            self.tenants = tenants
+            self._schedule_filename = filename + SCHEDULE_SUFFIX if storage is None else None
+            self._storage = storage if storage is not None else TaskStorage(filename, audit_dir=audit_dir)
+        else:
+            self.tenants = tenants if tenants is not None else TenantStore()
+            self._schedule_filename = self.tenants.get_filename(tenant) + SCHEDULE_SUFFIX
+            self._storage = None
+
+    @property
+    def storage(self) -> TaskStorage:
+        """
+        The task store this skill operates on. A tenant's shard is fetched
+        on every access, so it is reloaded if it was evicted in between.
+        """
+        if self.tenant is None:
+            return self._storage
+        return self.tenants.get(self.tenant)
+
+    @property
+    def scheduler(self) -> TaskScheduler:
+        """
+        The scheduler for reminders and repeating tasks in this skill's store.
+        """
+        storage = self.storage
+        if self._scheduler is None:
+            self._scheduler = TaskScheduler(storage, self._schedule_filename)
+        elif self._scheduler.storage is not storage:
+            self._scheduler.storage = storage  # The tenant's shard was evicted and reloaded
+        return self._scheduler
+
+    @property
+    def duplicate_index(self) -> DuplicateIndex:
+        """
+        The near-duplicate index over this skill's store, built on first use
+        and kept up to date with every change afterwards.
+        """
+        storage = self.storage
+        if self._duplicate_index is None or self._duplicate_index.storage is not storage:
+            self._duplicate_index = DuplicateIndex(storage)
+        return self._duplicate_index
+
+    @property
+    def semantic_index(self) -> SemanticIndex:
+        """
+        The vector index over this skill's store, built on first use and
+        kept up to date with every change afterwards.
+        """
+        storage = self.storage
+        if self._semantic_index is None or self._semantic_index.storage is not storage:
+            self._semantic_index = SemanticIndex(storage)
+        return self._semantic_index
+
+    def for_tenant(self, tenant: str) -> "TodoAgentSkill":
+        """
+        Creates a skill for another tenant that shares this skill's tenant shards.
+
+        Args:
+            tenant: The tenant name
+
+        Returns:
+            A TodoAgentSkill addressing the tenant
+        """
+        return TodoAgentSkill(tenant=tenant, tenants=self.tenants or TenantStore(),
+                              duplicates=self.duplicates, actor=self.actor)
+
+    @staticmethod
+    def _task_to_dict(task: Task) -> Dict[str, Any]:
+        """
+        Converts a task into the dictionary shape returned to agents.
+        """
+        return {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "completed": task.completed,
+            "tags": list(task.tags),
+            "project": task.project,
+            "priority": task.priority,
+            "due_date": task.due_date.isoformat() if task.due_date else None,
+            "blocked_by": list(task.blocked_by)
+        }
 
-    def add_task(self, title: str, description: Optional[str] = None) -> Dict[str, Any]:
+    @_as_actor
+    def add_task(self, title: str, description: Optional[str] = None,
+                 tags: Optional[List[str]] = None, project: Optional[str] = None,
+                 priority: str = "medium", due_date: Optional[str] = None,
+                 blocked_by: Optional[List[int]] = None) -> Dict[str, Any]:
         """
         Adds a new task to the todo list.
 
         Args:
             title: The task title (1-200 characters)
             description: The task description (max 1000 characters)
+            tags: List of tags, or a comma-separated string (optional)
+            project: The project the task belongs to (optional)
+            priority: "low", "medium" or "high" (default "medium")
+            due_date: Due date in YYYY-MM-DD format (optional)
+            blocked_by: IDs of existing tasks that must be done first (optional)
 
         Returns:
-            Dictionary with 'success' boolean and 'task_id' if successful
+            Dictionary with 'success' boolean and 'task_id' if successful.
+            Unless duplicates are allowed, similar existing tasks are listed
+            under 'duplicates' (and the task is not added when rejecting them).
         """
         try:
-            task_id = self.storage.add_task(title, description)
-            return {
+            similar = []
+            if self.duplicates != "allow":
+                similar = self._similar_tasks(title, description)
+                if similar and self.duplicates == "reject":
+                    return {
+                        "success": False,
+                        "error": f"Possible duplicate of task {similar[0]['id']}",
+                        "duplicates": similar
+                    }
+            task_id = self.storage.add_task(title, description, tags, project, priority, due_date,
+                                            blocked_by)
+            result = {
                 "success": True,
                 "task_id": task_id,
                 "message": f"Task added successfully with ID: {task_id}"
             }
+            if similar:
+                result["duplicates"] = similar
+            return result
         except ValueError as e:
             return {
                 "success": False,
                 "error": str(e)
             }
 
-    def view_tasks(self) -> Dict[str, Any]:
+    def _similar_tasks(self, title: str, description: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Lists existing tasks similar to the given text, most similar first.
+        """
+        similar = []
+        for task_id, similarity in self.duplicate_index.find_similar(title, description):
+            task = self.storage.get_task(task_id)
+            if task is not None:
+                similar.append({"id": task_id, "title": task.title,
+                                "similarity": round(similarity, 2)})
+        return similar
+
+    def find_duplicates(self, threshold: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Finds groups of near-duplicate tasks across the whole todo list.
+
+        Args:
+            threshold: Minimum similarity of title and description, from 0
+                to 1 (optional, 0.6 if omitted)
+
+        Returns:
+            Dictionary with 'success' boolean and 'groups', a list of task
+            lists, each holding two or more similar tasks
+        """
+        try:
+            groups = []
+            for task_ids in self.duplicate_index.find_duplicates(threshold):
+                tasks = [self.storage.get_task(task_id) for task_id in task_ids]
+                groups.append([self._task_to_dict(task) for task in tasks if task is not None])
+            return {
+                "success": True,
+                "groups": [group for group in groups if len(group) > 1]
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def find_related(self, query: str, k: int = 5) -> Dict[str, Any]:
+        """
+        Finds the tasks closest in meaning to a free-text query, e.g.
+        "anything about the quarterly report?", by comparing embeddings of
+        the query and of each task's title and description.
+
+        Args:
+            query: Free text to match
+            k: Maximum number of tasks to return (default 5)
+
+        Returns:
+            Dictionary with 'success' boolean and 'tasks', most related
+            first, each with a 'score' from 0 to 1
+        """
+        try:
+            tasks = []
+            for task_id, score in self.semantic_index.find_related(query, k):
+                task = self.storage.get_task(task_id)
+                if task is not None:
+                    tasks.append({**self._task_to_dict(task), "score": round(score, 3)})
+            return {
+                "success": True,
+                "tasks": tasks
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @_as_actor
+    def import_tasks(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Adds many tasks at once. The batch is validated in one pass and is
+        all-or-nothing: if any task is invalid, none are added.
+
+        Args:
+            tasks: List of dictionaries with a 'title' and optional
+                'description', 'completed', 'tags', 'project', 'priority',
+                'due_date' and 'blocked_by' values
+
+        Returns:
+            Dictionary with 'success' boolean and 'task_ids' if successful
+        """
+        try:
+            task_ids = self.storage.import_tasks(tasks)
+            return {
+                "success": True,
+                "task_ids": task_ids,
+                "message": f"Imported {len(task_ids)} tasks"
+            }
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def view_tasks(self, limit: Optional[int] = None, cursor: Optional[int] = None,
+                   order_by: str = "id") -> Dict[str, Any]:
+        """
+        Retrieves tasks from the todo list, optionally one page at a time.
+
+        Args:
+            limit: Maximum number of tasks to return (optional, all tasks if omitted)
+            cursor: The 'next_cursor' value from a previous page (optional)
+            order_by: Ordering to list tasks in: "id", "pending_first", "title",
+                "recently_updated", "priority" or "due_date" (default "id")
+
+        Returns:
+            Dictionary with 'success' boolean, 'tasks' list and 'next_cursor',
+            which is None once there are no more tasks
+        """
+        try:
+            if limit is None:
+                tasks = self.storage.iter_tasks(cursor, order_by=order_by)
+                next_cursor = None
+            else:
+                tasks, next_cursor = self.storage.get_tasks_page(limit, cursor, order_by=order_by)
+
+            return {
+                "success": True,
+                "tasks": [self._task_to_dict(task) for task in tasks],
+                "next_cursor": next_cursor
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def query_tasks(self, project: Optional[str] = None, tags: Optional[List[str]] = None,
+                    priority: Optional[str] = None, due_before: Optional[str] = None,
+                    due_after: Optional[str] = None, overdue: bool = False,
+                    completed: Optional[bool] = None) -> Dict[str, Any]:
         """
-        Retrieves all tasks from the todo list.
+        Finds tasks matching all of the given criteria.
+
+        Args:
+            project: Only tasks in this project (optional)
+            tags: Only tasks carrying all of these tags (optional)
+            priority: Only tasks with this priority (optional)
+            due_before: Only tasks due on or before this YYYY-MM-DD date (optional)
+            due_after: Only tasks due on or after this YYYY-MM-DD date (optional)
+            overdue: Only pending tasks past their due date (default False)
+            completed: Only completed (True) or pending (False) tasks (optional)
 
         Returns:
             Dictionary with 'success' boolean and 'tasks' list
         """
         try:
-            tasks = self.storage.get_all_tasks()
-            task_list = []
-            for task in tasks:
-                task_list.append({
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "completed": task.completed
-                })
+            tasks = self.storage.query_tasks(project, tags, priority, due_before,
+                                             due_after, overdue, completed)
+            return {
+                "success": True,
+                "tasks": [self._task_to_dict(task) for task in tasks]
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def export(self, format: str, path: Optional[str] = None, order_by: str = "id",
+               project: Optional[str] = None, tags: Optional[List[str]] = None,
+               priority: Optional[str] = None, due_before: Optional[str] = None,
+               due_after: Optional[str] = None, overdue: bool = False,
+               completed: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Exports tasks as CSV, a Markdown table, an HTML table or JSON lines.
 
+        Tasks are streamed to the file in chunks, so exporting to a path
+        uses the same memory for any number of tasks.
+
+        Args:
+            format: "csv", "md", "html" or "jsonl"
+            path: File to write (optional; without it the export is
+                returned as 'content', which is only sensible for small lists)
+            order_by: Ordering to export tasks in (default "id")
+            project, tags, priority, due_before, due_after, overdue, completed:
+                Filters, as in query_tasks (optional)
+
+        Returns:
+            Dictionary with 'success' boolean, 'count' of exported tasks and
+            either 'path' or 'content'
+        """
+        try:
+            matches = task_filter(project, tags, priority, due_before, due_after, overdue, completed)
+            if path is None:
+                output = io.StringIO()
+                count = export_tasks(self.storage, output, format, order_by, matches)
+                return {
+                    "success": True,
+                    "count": count,
+                    "content": output.getvalue()
+                }
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                count = export_tasks(self.storage, f, format, order_by, matches)
             return {
                 "success": True,
-                "tasks": task_list
+                "count": count,
+                "path": path
             }
         except Exception as e:
             return {
@@ -70,20 +421,129 @@ class TodoAgentSkill:
                 "error": str(e)
             }
 
-    def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None) -> Dict[str, Any]:
+    def next_actionable(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """
-        Updates an existing task's title and/or description.
+        Lists the pending tasks that are not waiting on any other task.
+
+        Args:
+            limit: Maximum number of tasks to return (optional)
+
+        Returns:
+            Dictionary with 'success' boolean and 'tasks' list, highest
+            priority first, then earliest due date
+        """
+        try:
+            return {
+                "success": True,
+                "tasks": [self._task_to_dict(task) for task in self.storage.next_actionable(limit)]
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @_as_actor
+    def add_dependency(self, task_id: int, blocker_id: int) -> Dict[str, Any]:
+        """
+        Marks a task as blocked by another task.
+
+        Args:
+            task_id: The ID of the task that has to wait
+            blocker_id: The ID of the task that must be done first
+
+        Returns:
+            Dictionary with 'success' boolean and message; fails if the
+            dependency would create a cycle
+        """
+        try:
+            if self.storage.add_dependency(task_id, blocker_id):
+                return {
+                    "success": True,
+                    "message": f"Task with ID {task_id} is now blocked by task {blocker_id}"
+                }
+            return {
+                "success": False,
+                "error": f"Task with ID {task_id} not found"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @_as_actor
+    def remove_dependency(self, task_id: int, blocker_id: int) -> Dict[str, Any]:
+        """
+        Removes a "blocked by" relation between two tasks.
+
+        Args:
+            task_id: The ID of the blocked task
+            blocker_id: The ID of the blocking task
+
+        Returns:
+            Dictionary with 'success' boolean and message
+        """
+        try:
+            if self.storage.remove_dependency(task_id, blocker_id):
+                return {
+                    "success": True,
+                    "message": f"Task with ID {task_id} is no longer blocked by task {blocker_id}"
+                }
+            return {
+                "success": False,
+                "error": f"Task with ID {task_id} is not blocked by task {blocker_id}"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retrieves aggregate statistics about the todo list.
+
+        Returns:
+            Dictionary with 'success' boolean and 'stats': total, completed and
+            pending counts, completion rate, per-project and per-priority
+            breakdowns and hourly completion throughput for the last 24 hours
+        """
+        try:
+            return {
+                "success": True,
+                "stats": self.storage.stats()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @_as_actor
+    def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None,
+                    tags: Optional[List[str]] = None, project: Optional[str] = None,
+                    priority: Optional[str] = None, due_date: Optional[str] = None,
+                    blocked_by: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Updates an existing task's fields. Fields left as None are unchanged.
 
         Args:
             task_id: The ID of the task to update
             title: New title for the task (optional)
             description: New description for the task (optional)
+            tags: New tags, replacing the current ones (optional)
+            project: New project, or "" to clear it (optional)
+            priority: New priority (optional)
+            due_date: New due date in YYYY-MM-DD format, or "" to clear it (optional)
+            blocked_by: New blocking task IDs, or [] to clear them (optional)
 
         Returns:
             Dictionary with 'success' boolean and message
         """
         try:
-            success = self.storage.update_task(task_id, title, description)
+            success = self.storage.update_task(task_id, title, description, tags,
+                                               project, priority, due_date, blocked_by)
             if success:
                 return {
                     "success": True,
@@ -100,6 +560,7 @@ class TodoAgentSkill:
                 "error": str(e)
             }
 
+    @_as_actor
     def delete_task(self, task_id: int) -> Dict[str, Any]:
         """
         Deletes a task from the todo list.
@@ -128,6 +589,7 @@ class TodoAgentSkill:
                 "error": str(e)
             }
 
+    @_as_actor
     def mark_task_complete(self, task_id: int) -> Dict[str, Any]:
         """
         Toggles the completion status of a task.
@@ -179,12 +641,7 @@ class TodoAgentSkill:
             if task:
                 return {
                     "success": True,
-                    "task": {
-                        "id": task.id,
-                        "title": task.title,
-                        "description": task.description,
-                        "completed": task.completed
-                    }
+                    "task": self._task_to_dict(task)
                 }
             else:
                 return {
@@ -197,10 +654,348 @@ class TodoAgentSkill:
                 "error": str(e)
             }
 
+    def history(self, task_id: int) -> Dict[str, Any]:
+        """
+        Retrieves who changed a task, when, and what changed, from the audit log.
+
+        Args:
+            task_id: The ID of the task, which may since have been deleted
+
+        Returns:
+            Dictionary with 'success' boolean and 'history' list, oldest
+            first; each entry has 'seq', 'at' (an ISO timestamp), 'actor',
+            'action' and 'changes' (field -> [old value, new value])
+        """
+        try:
+            entries = self.storage.history(task_id)
+            for entry in entries:
+                entry["at"] = datetime.fromtimestamp(entry["at"]).isoformat()
+            return {
+                "success": True,
+                "history": entries
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @staticmethod
+    def _schedule_to_dict(schedule: Schedule) -> Dict[str, Any]:
+        """
+        Converts a schedule into the dictionary shape returned to agents.
+        """
+        result = {
+            "id": schedule.id,
+            "kind": schedule.kind,
+            "next": datetime.fromtimestamp(schedule.fire_at).isoformat(timespec="minutes")
+        }
+        if schedule.kind == "reminder":
+            result.update(task_id=schedule.task_id, message=schedule.message)
+        else:
+            result.update(rule=schedule.rule, at=schedule.at, task=dict(schedule.template))
+        return result
+
+    @staticmethod
+    def _event_to_dict(event: ScheduledEvent) -> Dict[str, Any]:
+        """
+        Converts a scheduler event into the dictionary shape returned to agents.
+        """
+        return {
+            "kind": event.kind,
+            "schedule_id": event.schedule_id,
+            "task_id": event.task_id,
+            "due": datetime.fromtimestamp(event.fire_at).isoformat(timespec="minutes"),
+            "message": event.message
+        }
+
+    def add_reminder(self, task_id: int, when: str, message: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Schedules a reminder for a task.
+
+        Args:
+            task_id: The ID of the task to be reminded of
+            when: Reminder time in YYYY-MM-DD HH:MM format
+            message: Text to deliver with the reminder (optional)
+
+        Returns:
+            Dictionary with 'success' boolean and 'schedule_id' if successful
+        """
+        try:
+            schedule_id = self.scheduler.add_reminder(task_id, when, message)
+            return {
+                "success": True,
+                "schedule_id": schedule_id,
+                "message": f"Reminder set with ID: {schedule_id}"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @_as_actor
+    def add_recurring_task(self, title: str, rule: str, description: Optional[str] = None,
+                           tags: Optional[List[str]] = None, project: Optional[str] = None,
+                           priority: str = "medium", start: Optional[str] = None,
+                           at: str = "09:00") -> Dict[str, Any]:
+        """
+        Schedules a task that is added again on every occurrence of a repeat rule.
+
+        Args:
+            title: The task title
+            rule: "daily", "weekdays", "weekly", "every N days" or "every monday[, thursday...]"
+            description: The task description (optional)
+            tags: List of tags (optional)
+            project: The project (optional)
+            priority: "low", "medium" or "high" (default "medium")
+            start: First day it may occur on, in YYYY-MM-DD format (optional, today if omitted)
+            at: Time of day each occurrence is added, in HH:MM format (default "09:00")
+
+        Returns:
+            Dictionary with 'success' boolean and 'schedule_id' if successful
+        """
+        try:
+            schedule_id = self.scheduler.add_recurring(title, rule, description, tags, project,
+                                                       priority, start, at)
+            return {
+                "success": True,
+                "schedule_id": schedule_id,
+                "message": f"Repeating task scheduled with ID: {schedule_id}"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def get_schedules(self) -> Dict[str, Any]:
+        """
+        Lists active reminders and repeating tasks, soonest first.
+
+        Returns:
+            Dictionary with 'success' boolean and 'schedules' list
+        """
+        try:
+            return {
+                "success": True,
+                "schedules": [self._schedule_to_dict(schedule)
+                              for schedule in self.scheduler.get_schedules()]
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def cancel_schedule(self, schedule_id: int) -> Dict[str, Any]:
+        """
+        Cancels a reminder or repeating task. Tasks already added are kept.
+
+        Args:
+            schedule_id: The ID returned when it was scheduled
+
+        Returns:
+            Dictionary with 'success' boolean and message
+        """
+        try:
+            if self.scheduler.cancel(schedule_id):
+                return {
+                    "success": True,
+                    "message": f"Schedule with ID {schedule_id} cancelled"
+                }
+            return {
+                "success": False,
+                "error": f"Schedule with ID {schedule_id} not found"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @_as_actor
+    def get_due_events(self) -> Dict[str, Any]:
+        """
+        Fires everything that is due and returns the events not yet delivered.
+
+        Repeating tasks that came due are added to the list; reminders are
+        returned for the agent to act on.
+
+        Returns:
+            Dictionary with 'success' boolean and 'events' list, oldest first
+        """
+        try:
+            scheduler = self.scheduler
+            scheduler.tick()
+            return {
+                "success": True,
+                "events": [self._event_to_dict(event) for event in scheduler.drain_events()]
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @_as_actor
+    def undo(self) -> Dict[str, Any]:
+        """
+        Reverses the most recent change to the todo list.
+
+        Returns:
+            Dictionary with 'success' boolean and message
+        """
+        try:
+            if self.storage.undo():
+                return {
+                    "success": True,
+                    "message": "Last change undone"
+                }
+            return {
+                "success": False,
+                "error": "Nothing to undo"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @_as_actor
+    def redo(self) -> Dict[str, Any]:
+        """
+        Re-applies the most recently undone change.
+
+        Returns:
+            Dictionary with 'success' boolean and message
+        """
+        try:
+            if self.storage.redo():
+                return {
+                    "success": True,
+                    "message": "Last undone change redone"
+                }
+            return {
+                "success": False,
+                "error": "Nothing to redo"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+
+class SkillPool:
+    """
+    Fixed pool of pre-warmed skills for concurrent agent sessions.
+
+    All skills share one TaskStorage, loaded once when the pool is built,
+    so starting a session is a queue checkout whose cost does not depend on
+    the size of the store. TaskStorage serializes changes with its own
+    lock, so sessions may run on separate threads. Sessions share the
+    store's undo history as well as its tasks.
+    """
+
+    def __init__(self, filename: str = "tasks.json", size: int = 4,
+                 storage: Optional[TaskStorage] = None, duplicates: str = "allow",
+                 semantic: bool = False):
+        """
+        Args:
+            filename: Task store file, used when no storage is given
+            size: Number of skills in the pool
+            storage: An already loaded store to share (optional)
+            duplicates: Near-duplicate handling of every skill's add_task;
+                see TodoAgentSkill (default "allow")
+            semantic: Build one semantic index up front for every skill's
+                find_related; otherwise each skill builds its own on first
+                use (default False)
+        """
+        if size < 1:
+            raise ValueError("Pool size must be a positive integer")
+        if duplicates not in DUPLICATE_MODES:
+            raise ValueError(f"Duplicates must be one of: {', '.join(DUPLICATE_MODES)}")
+        self.storage = storage if storage is not None else TaskStorage(filename)
+        # Sessions share one scheduler too, so each reminder is delivered once
+        self.scheduler = TaskScheduler(self.storage,
+                                       filename + SCHEDULE_SUFFIX if storage is None else None)
+        # ...and one duplicate index, built up front when add_task needs it
+        self.duplicate_index = DuplicateIndex(self.storage) if duplicates != "allow" else None
+        # ...and one vector index, when find_related is expected, so each change is embedded once
+        self.semantic_index = SemanticIndex(self.storage) if semantic else None
+        self.size = size
+        self._idle: "queue.LifoQueue[TodoAgentSkill]" = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(TodoAgentSkill(storage=self.storage, scheduler=self.scheduler,
+                                          duplicates=duplicates,
+                                          duplicate_index=self.duplicate_index,
+                                          semantic_index=self.semantic_index))
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0  # Checkouts that found no idle skill and had to wait
+
+    def checkout(self, timeout: Optional[float] = None) -> TodoAgentSkill:
+        """
+        Takes a skill out of the pool, waiting for one to be returned if none is idle.
+
+        Args:
+            timeout: Maximum seconds to wait (optional, waits indefinitely if omitted)
+
+        Returns:
+            A skill for the caller's exclusive use until it is checked back in
+
+        Raises:
+            TimeoutError: If no skill became idle within the timeout
+        """
+        try:
+            skill = self._idle.get_nowait()
+        except queue.Empty:
+            with self._stats_lock:
+                self.waits += 1
+            try:
+                skill = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError("No idle skill available in the pool")
+        with self._stats_lock:
+            self.checkouts += 1
+        return skill
+
+    def checkin(self, skill: TodoAgentSkill):
+        """
+        Returns a checked out skill to the pool.
+
+        Args:
+            skill: The skill returned by checkout
+        """
+        self._idle.put(skill)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[TodoAgentSkill]:
+        """
+        Checks out a skill for the duration of a with block.
+
+        Args:
+            timeout: Maximum seconds to wait for an idle skill (optional)
+        """
+        skill = self.checkout(timeout)
+        try:
+            yield skill
+        finally:
+            self.checkin(skill)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Pool size, idle skills and checkout counters.
+        """
+        with self._stats_lock:
+            return {"size": self.size, "idle": self._idle.qsize(),
+                    "checkouts": self.checkouts, "waits": self.waits}
 
 # Convenience function to create a skill instance
-def create_skill(filename: str = "tasks.json") -> TodoAgentSkill:
+def create_skill(filename: str = "tasks.json", tenant: Optional[str] = None,
+                 tenants: Optional[TenantStore] = None) -> TodoAgentSkill:
     """
     Creates and returns a new instance of the TodoAgentSkill.
     """
-    return TodoAgentSkill(filename)
\ No newline at end of file
+    return TodoAgentSkill(filename, tenant, tenants)
\ No newline at end of file
@@ -0,0 +1,369 @@
+import getpass
+import json
+import os
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from .models import Task
+
+AUDIT_SUFFIX = ".audit"  # Default audit directory, next to the store file
+SEGMENT_BYTES = 1024 * 1024  # Seal the active segment once it reaches this size
+BLOCK_BYTES = 64 * 1024  # Entries compressed together in a sealed segment
+
+# Fields every change touches; the entry's own timestamp already records them
+_IGNORED_FIELDS = ("id", "updated_at")
+
+_actor: ContextVar[Optional[str]] = ContextVar("audit_actor", default=None)
+
+
+@contextmanager
+def acting_as(actor: str) -> Iterator[None]:
+    """
+    Attribute the changes made inside the block to an actor:
+
+        with acting_as("agent"):
+            storage.delete_task(3)
+
+    The actor follows the current thread or asyncio task, so concurrent
+    callers can act as different actors on the same store.
+    """
+    token = _actor.set(actor)
+    try:
+        yield
+    finally:
+        _actor.reset(token)
+
+
+def _default_actor() -> str:
+    try:
+        return getpass.getuser()
+    except Exception:  # No user name in the environment
+        return "user"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot record a value of type {type(value).__name__}")
+
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, default=_encode_value)
+
+
+class AuditLog:
+    """
+    Append-only record of every change to a task store: when, by whom,
+    and which fields changed from what to what.
+
+    Entries are appended as JSON lines to an active segment file. Once it
+    reaches segment_bytes it is sealed: rewritten as independently
+    zlib-compressed blocks of about block_bytes each, next to a small index
+    file listing the blocks and the tasks each block mentions. Sealed
+    segments are never changed again; with max_segments set, the oldest
+    are deleted as new ones are sealed.
+
+    An in-memory index maps each task to the blocks (and active segment
+    offsets) holding its entries, loaded from the index files on start-up,
+    so history() decompresses only the blocks that mention the task rather
+    than scanning the log.
+
+    Register on_change as a TaskStorage listener (TaskStorage does this
+    when given an audit_dir). Changes are attributed to the actor set with
+    acting_as(), or to the default actor, the current OS user.
+    """
+
+    def __init__(self, directory: str, actor: Optional[str] = None,
+                 segment_bytes: int = SEGMENT_BYTES, block_bytes: int = BLOCK_BYTES,
+                 max_segments: Optional[int] = None):
+        """
+        Args:
+            directory: Directory holding the segment files (created if missing)
+            actor: Actor recorded when none is set with acting_as (optional,
+                the current OS user by default)
+            segment_bytes: Size at which the active segment is sealed
+            block_bytes: Uncompressed size of each compressed block
+            max_segments: Number of sealed segments to keep (optional; all
+                are kept by default)
+        """
+        self.directory = directory
+        self.actor = actor or _default_actor()
+        self.segment_bytes = segment_bytes
+        self.block_bytes = block_bytes
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        # Sealed segment number -> (offset, length) of each compressed block
+        self._blocks: Dict[int, List[Tuple[int, int]]] = {}
+        # Task ID -> (sealed segment, block) pairs holding its entries, oldest first
+        self._sealed_index: Dict[int, List[Tuple[int, int]]] = {}
+        # Task ID -> offsets of its entries in the active segment
+        self._active_index: Dict[int, List[int]] = {}
+        self._next_seq = 1
+        os.makedirs(directory, exist_ok=True)
+        self._segment = self._load()
+        self._active: Optional[BinaryIO] = None  # Opened by the first entry
+
+    def _path(self, segment: int, kind: str) -> str:
+        return os.path.join(self.directory, f"{segment:08d}.{kind}")
+
+    def _load(self) -> int:
+        """
+        Load the index files of the sealed segments and scan the active one.
+
+        Returns:
+            The number of the active segment
+        """
+        segments: Dict[int, List[str]] = {}
+        for name in os.listdir(self.directory):
+            number, _, kind = name.partition(".")
+            if not number.isdigit():
+                continue
+            if kind.endswith(".tmp"):  # Left over from an interrupted seal
+                os.remove(os.path.join(self.directory, name))
+            elif kind in ("log", "seg", "idx"):
+                segments.setdefault(int(number), []).append(kind)
+
+        active = max(segments, default=0) + 1
+        for segment in sorted(segments):
+            kinds = segments[segment]
+            if "idx" in kinds:
+                if "log" in kinds:  # Interrupted after sealing; the log is redundant
+                    os.remove(self._path(segment, "log"))
+                with open(self._path(segment, "idx"), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                self._blocks[segment] = [tuple(block) for block in meta["blocks"]]
+                for task_id, blocks in meta["tasks"].items():
+                    self._sealed_index.setdefault(int(task_id), []).extend(
+                        (segment, block) for block in blocks)
+                self._next_seq = meta["last_seq"] + 1
+            elif "log" in kinds:
+                if segment != max(segments):
+                    self._seal(segment)  # Interrupted while sealing
+                else:
+                    active = segment
+                    self._scan_active(segment)
+            else:  # Interrupted while dropping
+                os.remove(self._path(segment, "seg"))
+        return active
+
+    def _scan_active(self, segment: int):
+        path = self._path(segment, "log")
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn write at the end of the log
+                entry = json.loads(line)
+                self._index_active(entry, offset)
+                self._next_seq = entry["seq"] + 1
+                offset += len(line)
+        if offset != os.path.getsize(path):
+            os.truncate(path, offset)
+
+    def _index_active(self, entry: Dict[str, Any], offset: int):
+        if entry["task_id"] is not None:
+            self._active_index.setdefault(entry["task_id"], []).append(offset)
+
+    def on_change(self, event: str, task: Optional[Task], changes: Dict[str, Any]):
+        """
+        Store change listener; see TaskStorage.add_listener.
+        """
+        if event == "reset":
+            self.record("reset", None, {})
+            return
+        current = vars(task)
+        if event == "add" or event == "delete":
+            # Empty fields are left out of a task's first and last entry
+            diff = {field: [None, value] if event == "add" else [value, None]
+                    for field, value in current.items()
+                    if field not in _IGNORED_FIELDS and value is not None and value != []}
+        else:
+            diff = {field: [old, current[field]] for field, old in changes.items()
+                    if field not in _IGNORED_FIELDS and old != current[field]}
+            if not diff:
+                return
+        self.record(event, task.id, diff)
+
+    def record(self, action: str, task_id: Optional[int], changes: Dict[str, List[Any]],
+               actor: Optional[str] = None):
+        """
+        Append an entry to the log.
+
+        Args:
+            action: What happened: "add", "delete", "update" or "reset"
+            task_id: The task it happened to (None for the whole store)
+            changes: Field -> [old value, new value]
+            actor: Who did it (optional; see acting_as)
+        """
+        with self._lock:
+            if self._active is None:
+                self._active = open(self._path(self._segment, "log"), "ab")
+            entry = {"seq": self._next_seq, "at": time.time(),
+                     "actor": actor or _actor.get() or self.actor,
+                     "action": action, "task_id": task_id, "changes": changes}
+            line = (_ENCODER.encode(entry) + "\n").encode("utf-8")
+            offset = self._active.tell()
+            self._active.write(line)
+            self._active.flush()
+            self._next_seq += 1
+            self._index_active(entry, offset)
+            if offset + len(line) >= self.segment_bytes:
+                self._rotate()
+
+    def _rotate(self):
+        self._active.close()
+        self._seal(self._segment)
+        self._active_index.clear()
+        self._active = None
+        self._segment += 1
+        if self.max_segments is not None:
+            for segment in sorted(self._blocks)[:-self.max_segments or None]:
+                self._drop(segment)
+
+    def _seal(self, segment: int):
+        """
+        Compress a full segment into blocks and write its index file.
+        """
+        blocks: List[Tuple[int, int]] = []
+        tasks: Dict[int, List[int]] = {}
+        last_seq = self._next_seq - 1
+        seg_path = self._path(segment, "seg")
+        with open(self._path(segment, "log"), "rb") as source, open(seg_path + ".tmp", "wb") as target:
+            pending: List[bytes] = []
+            size = 0
+
+            def write_block():
+                data = zlib.compress(b"".join(pending))
+                blocks.append((target.tell(), len(data)))
+                target.write(data)
+                pending.clear()
+
+            for line in source:
+                if not line.endswith(b"\n"):
+                    break
+                entry = json.loads(line)
+                last_seq = entry["seq"]
+                if entry["task_id"] is not None:
+                    block_list = tasks.setdefault(entry["task_id"], [])
+                    if not block_list or block_list[-1] != len(blocks):
+                        block_list.append(len(blocks))
+                pending.append(line)
+                size += len(line)
+                if size >= self.block_bytes:
+                    write_block()
+                    size = 0
+            if pending:
+                write_block()
+
+        idx_path = self._path(segment, "idx")
+        with open(idx_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"blocks": blocks, "last_seq": last_seq,
+                       "tasks": {str(task_id): block_list for task_id, block_list in tasks.items()}}, f)
+        os.replace(seg_path + ".tmp", seg_path)
+        os.replace(idx_path + ".tmp", idx_path)  # The segment counts as sealed from here
+        os.remove(self._path(segment, "log"))
+
+        self._next_seq = max(self._next_seq, last_seq + 1)
+        self._blocks[segment] = blocks
+        for task_id, block_list in tasks.items():
+            self._sealed_index.setdefault(task_id, []).extend((segment, block) for block in block_list)
+
+    def _drop(self, segment: int):
+        os.remove(self._path(segment, "idx"))  # Unsealed first, so a crash leaves no half segment
+        os.remove(self._path(segment, "seg"))
+        del self._blocks[segment]
+        for task_id in list(self._sealed_index):
+            kept = [location for location in self._sealed_index[task_id] if location[0] != segment]
+            if kept:
+                self._sealed_index[task_id] = kept
+            else:
+                del self._sealed_index[task_id]
+
+    def history(self, task_id: int) -> List[Dict[str, Any]]:
+        """
+        Get every recorded change to a task, oldest first.
+
+        Only the compressed blocks that mention the task are read and
+        decompressed, plus the task's lines in the active segment.
+
+        Args:
+            task_id: The ID of the task
+
+        Returns:
+            Entries with 'seq', 'at' (a Unix timestamp), 'actor', 'action',
+            'task_id' and 'changes' (field -> [old value, new value])
+        """
+        # Entries are encoded with a fixed key order, so a task's lines can
+        # be picked out of a block without parsing the others
+        marker = f'"task_id": {task_id}, '.encode()
+        with self._lock:
+            entries = []
+            handles: Dict[int, Any] = {}
+            try:
+                for segment, block in self._sealed_index.get(task_id, ()):
+                    f = handles.get(segment)
+                    if f is None:
+                        f = handles[segment] = open(self._path(segment, "seg"), "rb")
+                    offset, length = self._blocks[segment][block]
+                    f.seek(offset)
+                    for line in zlib.decompress(f.read(length)).splitlines():
+                        if marker in line:
+                            entries.append(json.loads(line))
+            finally:
+                for f in handles.values():
+                    f.close()
+
+            offsets = self._active_index.get(task_id)
+            if offsets:
+                with open(self._path(self._segment, "log"), "rb") as f:
+                    for offset in offsets:
+                        f.seek(offset)
+                        entries.append(json.loads(f.readline()))
+            return entries
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every entry in the log, oldest first, by reading it end to end.
+        """
+        with self._lock:
+            segments = sorted(self._blocks)
+            active = self._segment
+        for segment in segments:
+            with open(self._path(segment, "seg"), "rb") as f:
+                for offset, length in self._blocks[segment]:
+                    f.seek(offset)
+                    for line in zlib.decompress(f.read(length)).splitlines():
+                        yield json.loads(line)
+        if os.path.exists(self._path(active, "log")):
+            with open(self._path(active, "log"), "rb") as f:
+                for line in f:
+                    if line.endswith(b"\n"):
+                        yield json.loads(line)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the size of the log.
+
+        Returns:
+            Dictionary with the number of 'entries' recorded so far, of
+            'sealed_segments', and the 'sealed_bytes' and 'active_bytes' on disk
+        """
+        with self._lock:
+            sealed_bytes = sum(os.path.getsize(self._path(segment, kind))
+                               for segment in self._blocks for kind in ("seg", "idx"))
+            active = self._path(self._segment, "log")
+            return {"entries": self._next_seq - 1, "sealed_segments": len(self._blocks),
+                    "sealed_bytes": sealed_bytes,
+                    "active_bytes": os.path.getsize(active) if os.path.exists(active) else 0}
+
+    def close(self):
+        """
+        Close the active segment file. Recording afterwards reopens it.
+        """
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._active = None
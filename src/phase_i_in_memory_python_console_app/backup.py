@@ -0,0 +1,253 @@
+"""
+Incremental, deduplicated backups of a task store.
+
+Tasks are serialized one record per line and cut into content-defined
+chunks: a chunk ends after any record whose hash matches a boundary mask,
+so boundaries move with the data instead of with byte offsets. Adding or
+editing a task therefore only changes the chunk around it, and every
+unchanged run of tasks maps to a chunk that is already in the backup
+directory. Each backup is a small manifest listing its chunk hashes.
+
+Layout of a backup directory:
+    chunks/<ab>/<sha256>    zlib-compressed chunk contents
+    manifests/<id>.json     one manifest per backup
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+from .schema import SCHEMA_VERSION, migrate_records
+from .storage import TaskStorage
+
+
+@dataclass
+class BackupReport:
+    """
+    Summary of one backup run, compared with a plain full copy of the store.
+    """
+    backup_id: str
+    task_count: int
+    chunk_count: int
+    new_chunk_count: int
+    logical_bytes: int  # Size of the serialized store, i.e. a full copy
+    stored_bytes: int  # Bytes actually written for this backup
+    elapsed: float  # Seconds
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fraction of the logical size that did not need to be written."""
+        if not self.logical_bytes:
+            return 0.0
+        return 1 - self.stored_bytes / self.logical_bytes
+
+    @property
+    def throughput(self) -> float:
+        """Logical bytes backed up per second."""
+        return self.logical_bytes / self.elapsed if self.elapsed else 0.0
+
+
+class BackupStore:
+    """
+    A directory of deduplicated chunks and backup manifests.
+    """
+
+    def __init__(self, directory: str = "backups", boundary_bits: int = 6,
+                 min_chunk_records: int = 16, max_chunk_records: int = 1024):
+        """
+        Args:
+            directory: The backup directory
+            boundary_bits: A record ends a chunk when this many low hash bits
+                are zero, giving chunks of about 2**boundary_bits records
+            min_chunk_records: Smallest chunk size, in records
+            max_chunk_records: Largest chunk size, in records
+        """
+        self.directory = directory
+        self._boundary_mask = (1 << boundary_bits) - 1
+        self._min_chunk_records = min_chunk_records
+        self._max_chunk_records = max_chunk_records
+        self._chunk_dir = os.path.join(directory, "chunks")
+        self._manifest_dir = os.path.join(directory, "manifests")
+
+    def backup(self, storage: TaskStorage) -> BackupReport:
+        """
+        Back up the current contents of a store.
+
+        Args:
+            storage: The store to back up
+
+        Returns:
+            A report of what was written
+        """
+        start = time.perf_counter()
+        os.makedirs(self._chunk_dir, exist_ok=True)
+        os.makedirs(self._manifest_dir, exist_ok=True)
+
+        chunk_hashes: List[str] = []
+        task_count = new_chunks = logical_bytes = stored_bytes = 0
+        for chunk, records in self._chunk_records(storage.iter_records()):
+            task_count += records
+            logical_bytes += len(chunk)
+            chunk_hash = hashlib.sha256(chunk).hexdigest()
+            chunk_hashes.append(chunk_hash)
+            written = self._write_chunk(chunk_hash, chunk)
+            if written:
+                new_chunks += 1
+                stored_bytes += written
+
+        created_at = time.time()
+        backup_id = datetime.fromtimestamp(created_at, timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        manifest = {
+            "id": backup_id,
+            "created_at": created_at,
+            "schema_version": SCHEMA_VERSION,
+            "next_id": storage.get_next_id(),
+            "task_count": task_count,
+            "logical_bytes": logical_bytes,
+            "chunks": chunk_hashes,
+        }
+        manifest_bytes = json.dumps(manifest).encode("utf-8")
+        with open(os.path.join(self._manifest_dir, f"{backup_id}.json"), "wb") as f:
+            f.write(manifest_bytes)
+        stored_bytes += len(manifest_bytes)
+
+        return BackupReport(
+            backup_id=backup_id,
+            task_count=task_count,
+            chunk_count=len(chunk_hashes),
+            new_chunk_count=new_chunks,
+            logical_bytes=logical_bytes,
+            stored_bytes=stored_bytes,
+            elapsed=time.perf_counter() - start,
+        )
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """
+        List all backups, oldest first.
+
+        Returns:
+            Manifest summaries with 'id', 'created_at' and 'task_count'
+        """
+        if not os.path.isdir(self._manifest_dir):
+            return []
+
+        backups = []
+        for name in os.listdir(self._manifest_dir):
+            if name.endswith(".json"):
+                manifest = self._read_manifest(name[:-len(".json")])
+                backups.append({
+                    "id": manifest["id"],
+                    "created_at": manifest["created_at"],
+                    "task_count": manifest["task_count"],
+                })
+        backups.sort(key=lambda backup: backup["created_at"])
+        return backups
+
+    def find_backup(self, at: Optional[float] = None) -> Optional[str]:
+        """
+        Find the backup that represents the store at a point in time.
+
+        Args:
+            at: Unix timestamp (optional, defaults to the latest backup)
+
+        Returns:
+            The ID of the newest backup taken at or before the given time,
+            or None if there is no such backup
+        """
+        candidates = [backup for backup in self.list_backups()
+                      if at is None or backup["created_at"] <= at]
+        return candidates[-1]["id"] if candidates else None
+
+    def restore(self, storage: TaskStorage, backup_id: Optional[str] = None,
+                at: Optional[float] = None) -> str:
+        """
+        Replace the contents of a store with a backup.
+
+        Args:
+            storage: The store to restore into
+            backup_id: The backup to restore (optional)
+            at: Restore the newest backup taken at or before this Unix
+                timestamp when no backup_id is given (optional)
+
+        Returns:
+            The ID of the restored backup
+
+        Raises:
+            ValueError: If no matching backup exists, a chunk is corrupt, or
+                the backup was taken with a newer schema
+        """
+        if backup_id is None:
+            backup_id = self.find_backup(at)
+            if backup_id is None:
+                raise ValueError("No backup found for the requested point in time")
+
+        try:
+            manifest = self._read_manifest(backup_id)
+        except FileNotFoundError:
+            raise ValueError(f"Backup {backup_id} not found")
+
+        # Backups taken before schema versioning hold version 1 records
+        records = migrate_records(self._iter_manifest_records(manifest),
+                                  manifest.get("schema_version", 1))
+        storage.replace_tasks(records, manifest["next_id"], trusted=True)
+        return backup_id
+
+    def _chunk_records(self, records: Iterator[Dict[str, Any]]) -> Iterator[tuple]:
+        """
+        Group serialized records into content-defined chunks.
+
+        Yields:
+            (chunk bytes, number of records in the chunk) tuples
+        """
+        lines: List[bytes] = []
+        for record in records:
+            line = json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8") + b"\n"
+            lines.append(line)
+            at_boundary = (zlib.crc32(line) & self._boundary_mask) == 0
+            if (at_boundary and len(lines) >= self._min_chunk_records) or len(lines) >= self._max_chunk_records:
+                yield b"".join(lines), len(lines)
+                lines = []
+        if lines:
+            yield b"".join(lines), len(lines)
+
+    def _chunk_path(self, chunk_hash: str) -> str:
+        return os.path.join(self._chunk_dir, chunk_hash[:2], chunk_hash)
+
+    def _write_chunk(self, chunk_hash: str, chunk: bytes) -> int:
+        """
+        Store a chunk unless an identical one is already stored.
+
+        Returns:
+            The number of bytes written, 0 for a deduplicated chunk
+        """
+        path = self._chunk_path(chunk_hash)
+        if os.path.exists(path):
+            return 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = zlib.compress(chunk)
+        # Write to a temporary name first so a crash never leaves a partial chunk
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    def _read_manifest(self, backup_id: str) -> Dict[str, Any]:
+        with open(os.path.join(self._manifest_dir, f"{backup_id}.json"), "rb") as f:
+            return json.loads(f.read())
+
+    def _iter_manifest_records(self, manifest: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        for chunk_hash in manifest["chunks"]:
+            try:
+                with open(self._chunk_path(chunk_hash), "rb") as f:
+                    chunk = zlib.decompress(f.read())
+            except (OSError, zlib.error):
+                raise ValueError(f"Backup chunk {chunk_hash} is missing or unreadable")
+            if hashlib.sha256(chunk).hexdigest() != chunk_hash:
+                raise ValueError(f"Backup chunk {chunk_hash} is corrupt")
+            for line in chunk.splitlines():
+                yield json.loads(line)
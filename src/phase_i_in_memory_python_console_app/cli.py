@@ -1,13 +1,26 @@
+import asyncio
+import io
 import re
-from typing import List, Tuple, Dict, Any
+import time
+from datetime import datetime
+from collections import deque
+from typing import List, Tuple, Dict, Any, Deque, Optional
 from .storage import TaskStorage
 from .models import Task
+from .render_cache import RenderCache
+from .scheduler import SCHEDULE_SUFFIX, ScheduledEvent, TaskScheduler
+from .search import FuzzyIndex
 from rich.console import Console
+from rich.panel import Panel
 from rich.table import Table
 from rich import print as rprint
 from prompt_toolkit import Application
+from prompt_toolkit.data_structures import Point
+from prompt_toolkit.filters import Condition
+from prompt_toolkit.formatted_text import ANSI, to_formatted_text
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.layout.containers import (
+    ConditionalContainer,
     HSplit,
     Window,
     HorizontalAlign,
@@ -16,10 +29,13 @@ from prompt_toolkit.layout.containers import (
     Float,
     VSplit
 )
+from prompt_toolkit.buffer import Buffer
 from prompt_toolkit.layout.controls import (
+    BufferControl,
     FormattedTextControl
 )
 from prompt_toolkit.layout import Layout
+from prompt_toolkit.layout.processors import BeforeInput
 from prompt_toolkit.widgets import Frame, Box, Label
 from prompt_toolkit.layout.menus import CompletionsMenu
 from prompt_toolkit.styles import Style
@@ -29,16 +45,70 @@ from prompt_toolkit.shortcuts import (
 )
 
 
+# BLOCK ASCII art header specifically for "TODO CONSOLE APP" using block characters
+ASCII_HEADER = [
+    "  ████████╗ ██████╗ ██████╗  ██████╗ ",
+    "  ╚══██╔══╝██╔═══██╗██╔══██╗██╔═══██╗",
+    "     ██║   ██║   ██║██║  ██║██║   ██║",
+    "     ██║   ╚██████╔╝██████╔╝╚██████╔╝",
+    "     ╚═╝    ╚═════╝ ╚═════╝  ╚═════╝ ",
+    "",
+    "   ██████╗ ██████╗ ███╗   ██╗███████╗ ██████╗ ██╗     ███████╗",
+    "  ██╔════╝██╔═══██╗████╗  ██║██╔════╝██╔═══██╗██║     ██╔════╝",
+    "  ██║     ██║   ██║██╔██╗ ██║███████╗██║   ██║██║     █████╗  ",
+    "  ██║     ██║   ██║██║╚██╗██║╚════██║██║   ██║██║     ██╔══╝  ",
+    "  ╚██████╗╚██████╔╝██║ ╚████║███████║╚██████╔╝███████╗███████╗",
+    "   ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝ ╚═════╝ ╚══════╝╚══════╝",
+    "",
+    "          █████╗ ██████╗ ██████╗ ",
+    "         ██╔══██╗██╔══██╗██╔══██╗",
+    "         ███████║██████╔╝██████╔╝",
+    "         ██╔══██║██╔═══╝ ██╔═══╝ ",
+    "         ██║  ██║██║     ██║     ",
+    "         ╚═╝  ╚═╝╚═╝     ╚═╝     "
+]
+
+# Style for the menu application
+MENU_STYLE = Style([
+    ('header', 'bold blue'),
+    ('ascii_header', 'bold yellow'),
+    ('welcome', 'bold green'),
+    ('tip', 'italic cyan'),
+    ('menu-title', 'bold'),
+    ('menu_arrow', 'bold red'),
+    ('menu_space', ''),
+    ('selected', 'bold reverse'),
+    ('unselected', 'fg:gray'),
+    ('info', 'cyan'),
+    ('success', 'bold green'),
+    ('error', 'bold red'),
+    ('prompt', 'bold'),
+])
+
+SCROLL_LINES = 10  # Lines the output view scrolls per PageUp/PageDown
+
+
 class TodoCLI:
     """
     Command Line Interface for the Todo application.
     Handles user input, command parsing, and output formatting with rich styling and true key navigation.
     """
 
-    def __init__(self, filename: str = "tasks.json"):
-        self.storage = TaskStorage(filename)
+    def __init__(self, filename: str = "tasks.json", flush_interval_ms: Optional[int] = 200,
+                 compression: Optional[str] = None, compression_level: Optional[int] = None,
+                 audit_dir: Optional[str] = None):
+        # Saves happen on a background thread so actions never wait on the disk
+        self.storage = TaskStorage(filename, flush_interval_ms=flush_interval_ms,
+                                   compression=compression, compression_level=compression_level,
+                                   audit_dir=audit_dir)
         self.running = True
-        self.console = Console()
+        # Handlers print into the current screen's text, which the output view
+        # shows, instead of writing to the terminal behind the application
+        self._screen = io.StringIO()
+        self.console = Console(file=self._screen, force_terminal=True, color_system="truecolor")
+        self.render_cache = RenderCache(self.console, self.storage)
+        self.scheduler = TaskScheduler(self.storage, filename + SCHEDULE_SUFFIX)
+        self.search_index = FuzzyIndex(self.storage)
         self.setup_styling()
         self.commands = {
             'add': {'alias': ['a'], 'description': 'Add a new task'},
@@ -46,6 +116,12 @@ class TodoCLI:
             'update': {'alias': ['u'], 'description': 'Update a task'},
             'delete': {'alias': ['d'], 'description': 'Delete a task'},
             'complete': {'alias': ['mark', 'c'], 'description': 'Mark task as complete/incomplete'},
+            'undo': {'alias': ['z'], 'description': 'Undo the last change'},
+            'redo': {'alias': ['y'], 'description': 'Redo the last undone change'},
+            'next': {'alias': ['n'], 'description': 'Show tasks ready to work on'},
+            'history': {'alias': ['h'], 'description': "Show who changed a task and when"},
+            'stats': {'alias': ['s'], 'description': 'Show task statistics'},
+            'schedule': {'alias': ['r'], 'description': 'Manage reminders and repeating tasks'},
             'help': {'alias': [], 'description': 'Show this help'},
             'quit': {'alias': ['exit', 'q'], 'description': 'Exit application'}
         }
@@ -55,10 +131,35 @@ class TodoCLI:
             ("update", "3. Update Task"),
             ("delete", "4. Delete Task"),
             ("complete", "5. Mark Task Complete"),
-            ("help", "6. Help"),
-            ("quit", "7. Quit")
+            ("undo", "6. Undo"),
+            ("redo", "7. Redo"),
+            ("next", "8. What's Next"),
+            ("history", "9. Task History"),
+            ("stats", "10. Statistics"),
+            ("schedule", "11. Reminders & Repeats"),
+            ("help", "12. Help"),
+            ("quit", "13. Quit")
         ]
         self.current_menu_index = 0
+        self.view_order = "id"
+        self.page_size = 10
+        self._menu_header = self.build_menu_header()
+        self._menu_notices: List[Tuple[str, str]] = []
+        self._app = None
+        self._view = "menu"  # View shown by the application: menu, screen or picker
+        self._pending: Optional[asyncio.Future] = None  # Resolved by the view's key bindings
+        self._frame_started = 0.0
+        self.frame_times_ms: Deque[float] = deque(maxlen=100)
+        self._screen_key = (0, 0)  # (screen number, length) of the text last converted
+        self._screen_count = 0
+        self._screen_fragments: List[Tuple[str, str]] = []
+        self._screen_lines = 0
+        self._screen_scroll = 0  # Lines scrolled up from the end of the output
+        self._prompt_text = ""
+        self._picker_title = ""
+        self.picker_matches: List[int] = []
+        self.picker_index = 0
+        self.picker_limit = 10
 
     def setup_styling(self):
         """Setup color themes and styling options."""
@@ -74,381 +175,835 @@ class TodoCLI:
             'description': 'dim'
         }
 
-    def show_menu_with_navigation(self):
+    def build_menu_header(self) -> List[Tuple[str, str]]:
         """
-        Show menu with actual arrow key navigation.
+        Build the static part of the menu screen once, as formatted text fragments.
         """
-        def get_text():
-            result = []
-            # BLOCK ASCII art header specifically for "TODO CONSOLE APP" using block characters
-            ascii_art = [
-             "  ████████╗ ██████╗ ██████╗  ██████╗ ",
-             "  ╚══██╔══╝██╔═══██╗██╔══██╗██╔═══██╗",
-             "     ██║   ██║   ██║██║  ██║██║   ██║",
-             "     ██║   ╚██████╔╝██████╔╝╚██████╔╝",
-             "     ╚═╝    ╚═════╝ ╚═════╝  ╚═════╝ ",
-    "",
-    "   ██████╗ ██████╗ ███╗   ██╗███████╗ ██████╗ ██╗     ███████╗",
-    "  ██╔════╝██╔═══██╗████╗  ██║██╔════╝██╔═══██╗██║     ██╔════╝",
-    "  ██║     ██║   ██║██╔██╗ ██║███████╗██║   ██║██║     █████╗  ",
-    "  ██║     ██║   ██║██║╚██╗██║╚════██║██║   ██║██║     ██╔══╝  ",
-    "  ╚██████╗╚██████╔╝██║ ╚████║███████║╚██████╔╝███████╗███████╗",
-    "   ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝ ╚═════╝ ╚══════╝╚══════╝",
-    "",
-              "          █████╗ ██████╗ ██████╗ ",
-              "         ██╔══██╗██╔══██╗██╔══██╗",
-              "         ███████║██████╔╝██████╔╝",
-              "         ██╔══██║██╔═══╝ ██╔═══╝ ",
-              "         ██║  ██║██║     ██║     ",
-              "         ╚═╝  ╚═╝╚═╝     ╚═╝     "
-]
+        result = []
+        for line in ASCII_HEADER:
+            result.append(('class:ascii_header', line))
+            result.append(('', '\n'))
+
+        # Welcome message
+        result.append(('class:welcome', "Welcome to the Enhanced Todo Console App!"))
+        result.append(('', '\n\n'))
+        # Navigation tip
+        result.append(('class:tip', "💡 Tip: Use UP/DOWN arrow keys to navigate, ENTER to select"))
+        result.append(('', '\n\n'))
+
+        # Menu options formatted to the side
+        result.append(('class:menu-title', 'Select an option:\n\n'))
+        return result
+
+    def get_menu_text(self) -> List[Tuple[str, str]]:
+        """
+        Formatted text for the menu view: scheduler notices, the cached header
+        and the menu options.
+        """
+        result = self._menu_notices + self._menu_header
+        for i, (cmd, text) in enumerate(self.menu_options):
+            if i == self.current_menu_index:
+                # Keeps the selected option in sight on short terminals
+                result.append(('[SetCursorPosition]', ''))
+                result.append(('class:menu_arrow', '> '))
+                result.append(('class:selected', f'{text}'))
+            else:
+                result.append(('class:menu_space', '  '))
+                result.append(('class:unselected', f'{text}'))
+            result.append(('', '\n'))
+
+        return result
+
+    def build_app(self) -> Application:
+        """
+        Build the long-lived full-screen application, once.
 
-            for line in ascii_art:
-                result.append(('class:ascii_header', line))
-                result.append(('', '\n'))
+        The menu, the output of a screen with its prompt line, and the task
+        picker are views in one persistent layout; switching views only
+        changes which one is shown and focused, and prompt_toolkit redraws
+        just the regions of the terminal that changed.
+        """
+        # Menu view
+        menu_bindings = KeyBindings()
 
-            # Welcome message
-            result.append(('class:welcome', "Welcome to the Enhanced Todo Console App!"))
-            result.append(('', '\n\n'))
-            # Navigation tip
-            result.append(('class:tip', "💡 Tip: Use UP/DOWN arrow keys to navigate, ENTER to select"))
-            result.append(('', '\n\n'))
+        @menu_bindings.add('up')
+        def _(event):
+            self.current_menu_index = max(0, self.current_menu_index - 1)
 
-            # Menu options formatted to the side
-            result.append(('class:menu-title', 'Select an option:\n\n'))
+        @menu_bindings.add('down')
+        def _(event):
+            self.current_menu_index = min(len(self.menu_options) - 1, self.current_menu_index + 1)
 
-            for i, (cmd, text) in enumerate(self.menu_options):
-                if i == self.current_menu_index:
-                    result.append(('class:menu_arrow', '> '))
-                    result.append(('class:selected', f'{text}'))
-                else:
-                    result.append(('class:menu_space', '  '))
-                    result.append(('class:unselected', f'{text}'))
-                result.append(('', '\n'))
-
-            return result
-
-        # Style for the app
-        app_style = Style([
-            ('header', 'bold blue'),
-            ('ascii_header', 'bold yellow'),
-            ('welcome', 'bold green'),
-            ('tip', 'italic cyan'),
-            ('menu-title', 'bold'),
-            ('menu_arrow', 'bold red'),
-            ('menu_space', ''),
-            ('selected', 'bold reverse'),
-            ('unselected', 'fg:gray'),
-            ('info', 'cyan'),
-            ('success', 'bold green'),
-            ('error', 'bold red'),
+        @menu_bindings.add('enter')
+        def _(event):
+            self._resolve(self.menu_options[self.current_menu_index][0])
+
+        self._menu_window = Window(FormattedTextControl(self.get_menu_text, focusable=True,
+                                                        show_cursor=False,
+                                                        key_bindings=menu_bindings),
+                                   wrap_lines=True)
+
+        # Screen view: the output of a handler above the line it reads input from
+        prompt_bindings = KeyBindings()
+
+        @prompt_bindings.add('enter')
+        def _(event):
+            self._resolve(self._prompt_buffer.text)
+
+        @prompt_bindings.add('pageup')
+        def _(event):
+            self._screen_scroll = min(self._screen_lines, self._screen_scroll + SCROLL_LINES)
+
+        @prompt_bindings.add('pagedown')
+        def _(event):
+            self._screen_scroll = max(0, self._screen_scroll - SCROLL_LINES)
+
+        self._prompt_buffer = Buffer(multiline=False)
+        screen_container = HSplit([
+            Window(FormattedTextControl(self.get_screen_text, show_cursor=False,
+                                        get_cursor_position=self._get_screen_cursor)),
+            Window(BufferControl(self._prompt_buffer,
+                                 input_processors=[BeforeInput(lambda: self._prompt_text,
+                                                               style='class:prompt')],
+                                 key_bindings=prompt_bindings),
+                   wrap_lines=True, dont_extend_height=True)
         ])
 
-        # Create key bindings
-        bindings = KeyBindings()
+        # Picker view
+        picker_bindings = KeyBindings()
 
-        @bindings.add('up')
+        @picker_bindings.add('up')
         def _(event):
-            self.current_menu_index = max(0, self.current_menu_index - 1)
+            self.picker_index = max(0, self.picker_index - 1)
 
-        @bindings.add('down')
+        @picker_bindings.add('down')
         def _(event):
-            self.current_menu_index = min(len(self.menu_options) - 1, self.current_menu_index + 1)
+            if not self.picker_matches:
+                return  # Keep the index at 0 rather than -1
+            self.picker_index = min(len(self.picker_matches) - 1, self.picker_index + 1)
 
-        @bindings.add('enter')
+        @picker_bindings.add('enter')
         def _(event):
-            event.app.exit(result=self.menu_options[self.current_menu_index][0])
+            self._resolve(self.picker_matches[self.picker_index] if self.picker_matches else None)
+
+        @picker_bindings.add('escape', eager=True)
+        def _(event):
+            self._resolve(None)
+
+        self._picker_buffer = Buffer(multiline=False, on_text_changed=self._on_picker_query)
+        picker_container = HSplit([
+            Window(FormattedTextControl(lambda: [('class:menu-title', self._picker_title)]), height=1),
+            Window(FormattedTextControl([('class:tip', "💡 Type to filter, UP/DOWN to move, ENTER to select, ESC to cancel")]), height=1),
+            VSplit([
+                Window(FormattedTextControl([('class:menu_arrow', 'Search: ')]), width=8),
+                Window(BufferControl(self._picker_buffer, key_bindings=picker_bindings), height=1)
+            ]),
+            Window(height=1, char='─'),
+            Window(FormattedTextControl(self.get_picker_text))
+        ])
+
+        bindings = KeyBindings()
 
         @bindings.add('c-c')
         def _(event):
-            event.app.exit(result='quit')
+            if self._pending is not None and not self._pending.done():
+                self._pending.set_exception(KeyboardInterrupt())
 
-        # Create the application
-        text_control = FormattedTextControl(get_text)
-        root_container = Box(Window(text_control,
-                                    always_hide_cursor=False,
-                                    wrap_lines=True))
+        root_container = HSplit([
+            ConditionalContainer(Box(self._menu_window), filter=Condition(lambda: self._view == "menu")),
+            ConditionalContainer(screen_container, filter=Condition(lambda: self._view == "screen")),
+            ConditionalContainer(Box(picker_container), filter=Condition(lambda: self._view == "picker"))
+        ])
 
         app = Application(
-            layout=Layout(root_container),
+            layout=Layout(root_container, focused_element=self._menu_window),
             key_bindings=bindings,
-            style=app_style,
-            full_screen=False
+            style=MENU_STYLE,
+            full_screen=True
         )
+        app.before_render += self._start_frame
+        app.after_render += self._end_frame
+        return app
 
-        try:
-            result = app.run()
-            return result
-        except:
-            return 'quit'  # Default to quit if there's an issue
+    def _start_frame(self, app: Application):
+        self._frame_started = time.perf_counter()
+
+    def _end_frame(self, app: Application):
+        self.frame_times_ms.append((time.perf_counter() - self._frame_started) * 1000)
 
-    def show_simple_input(self, prompt_text: str):
+    def get_render_stats(self) -> Dict[str, float]:
         """
-        Show a simple input using the main app interface instead of dialog
+        Frame render times of the application, in milliseconds.
         """
-        try:
-            from prompt_toolkit import prompt
-            user_input = prompt(f"{prompt_text}: ")
-            return user_input or ""
-        except:
-            return "quit"
+        frames = len(self.frame_times_ms)
+        return {
+            "frames": frames,
+            "last_ms": self.frame_times_ms[-1] if frames else 0.0,
+            "average_ms": sum(self.frame_times_ms) / frames if frames else 0.0,
+            "max_ms": max(self.frame_times_ms) if frames else 0.0
+        }
+
+    def _show(self, view: str, focused) -> asyncio.Future:
+        """
+        Switch the application to a view and wait for its key bindings to resolve it.
+
+        Args:
+            view: The view to show: "menu", "screen" or "picker"
+            focused: The window or buffer that receives the keys
+
+        Returns:
+            A future set to the view's result, or to KeyboardInterrupt on Ctrl-C
+        """
+        self._view = view
+        self._screen_scroll = 0
+        self._app.layout.focus(focused)
+        self._pending = asyncio.get_running_loop().create_future()
+        self._app.invalidate()
+        return self._pending
+
+    def _resolve(self, result: Any):
+        if self._pending is not None and not self._pending.done():
+            self._pending.set_result(result)
+
+    async def show_menu_with_navigation(self) -> str:
+        """
+        Show the menu view with arrow key navigation.
+
+        Returns:
+            The command of the selected menu option
+        """
+        return await self._show("menu", self._menu_window)
+
+    def print_header(self, title: str):
+        """
+        Start a new screen in the output view and print its header.
+
+        The terminal is not cleared: the previous screen's text is dropped
+        and the next frame only redraws the lines that differ.
+        """
+        self._screen.seek(0)
+        self._screen.truncate()
+        self._screen_count += 1
+        if self._app is not None:
+            self.console.width = self._app.output.get_size().columns
+        self.console.print(f"[{self.styles['header']}]Todo Console App - {title}[/]\n"
+                           f"[{self.styles['header']}]{'='*50}[/]\n")
+
+    def get_screen_text(self) -> List[Tuple[str, str]]:
+        """
+        Formatted text for the output view, converted from the screen's ANSI
+        text only when something was printed since the last frame.
+        """
+        key = (self._screen_count, self._screen.tell())
+        if key != self._screen_key:
+            text = self._screen.getvalue()
+            self._screen_key = key
+            self._screen_fragments = to_formatted_text(ANSI(text))
+            self._screen_lines = text.count("\n")
+        return self._screen_fragments
+
+    def _get_screen_cursor(self) -> Point:
+        # The window scrolls to keep this line visible, so the end of the
+        # output is shown unless the user scrolled up
+        return Point(x=0, y=max(0, self._screen_lines - self._screen_scroll))
+
+    async def ask(self, prompt_text: str) -> str:
+        """
+        Read a line of input on the prompt line below the screen's output.
 
-    def show_message(self, title: str, text: str, pause=True):
+        Leading newlines of the prompt are added to the output, and the
+        answered prompt is added after them, so a screen reads like the
+        console transcript it replaces.
+
+        Args:
+            prompt_text: Text shown before the input
+
+        Returns:
+            The line entered, with surrounding whitespace removed
+        """
+        label = prompt_text.lstrip("\n")
+        self._screen.write(prompt_text[:len(prompt_text) - len(label)])
+        self._prompt_text = label
+        self._prompt_buffer.reset()
+        answer = await self._show("screen", self._prompt_buffer)
+        self._prompt_text = ""
+        self._screen.write(f"{label}{answer}\n")
+        return answer.strip()
+
+    def _on_picker_query(self, buffer: Buffer):
+        self.picker_matches = self.search_index.search(buffer.text, self.picker_limit)
+        self.picker_index = 0
+
+    def get_picker_text(self) -> List[Tuple[str, str]]:
+        """
+        Formatted text for the picker's list of matching tasks.
+        """
+        if not self.picker_matches:
+            return [('class:unselected', 'No matching tasks')]
+
+        result = []
+        for i, task_id in enumerate(self.picker_matches):
+            task = self.storage.get_task(task_id)
+            status = "✓" if task.completed else "○"
+            line = f"{status} {task.id}: {task.title}"
+            if i == self.picker_index:
+                result.append(('class:menu_arrow', '> '))
+                result.append(('class:selected', line))
+            else:
+                result.append(('class:menu_space', '  '))
+                result.append(('class:unselected', line))
+            result.append(('', '\n'))
+        return result
+
+    async def pick_task(self, title: str) -> Optional[int]:
+        """
+        Let the user pick a task with an incrementally filtered fuzzy search.
+
+        Args:
+            title: Text shown above the search field
+
+        Returns:
+            The selected task ID, or None if the user cancelled
+        """
+        self._picker_title = title
+        self._picker_buffer.reset()
+        self._on_picker_query(self._picker_buffer)
+        return await self._show("picker", self._picker_buffer)
+
+    async def select_task(self, action: str) -> Optional[int]:
+        """
+        Ask the user for a task to act on with the fuzzy picker.
+
+        Args:
+            action: The verb shown to the user, e.g. "update"
+
+        Returns:
+            The chosen task ID, or None if the user cancelled
+        """
+        return await self.pick_task(f"Select task to {action}")
+
+    async def show_simple_input(self, prompt_text: str) -> str:
         """
-        Show a message using the console instead of a separate dialog
+        Read a line of input on the current screen's prompt line.
         """
-        self.console.clear()
-        rprint(f"[{self.styles['header']}]Todo Console App - {title}[/]")
-        rprint(f"[{self.styles['header']}]{'='*50}[/]\n")
-        rprint(text)
+        return await self.ask(f"{prompt_text}: ")
+
+    async def show_message(self, title: str, text: str, pause=True):
+        """
+        Show a message on a screen of its own.
+        """
+        self.print_header(title)
+        self.console.print(text)
         if pause:
-            input(f"\nPress Enter to return to menu...")
+            await self.ask(f"\nPress Enter to return to menu...")
 
-    def display_help(self):
+    async def display_help(self):
         """
         Display help information with available commands in a styled format using console.
         """
-        self.console.clear()
-        rprint(f"[{self.styles['header']}]Todo Console App - Help[/]")
-        rprint(f"[{self.styles['header']}]{'='*50}[/]\n")
+        self.print_header("Help")
 
         for cmd, info in self.commands.items():
             aliases = ', '.join(info['alias']) if info['alias'] else 'none'
-            rprint(f"[bold]{cmd}[/] - {info['description']}")
-            rprint(f"  [dim]aliases: {aliases}[/]\n")
+            self.console.print(f"[bold]{cmd}[/] - {info['description']}")
+            self.console.print(f"  [dim]aliases: {aliases}[/]\n")
 
-        input(f"\nPress Enter to return to menu...")
+        await self.ask(f"\nPress Enter to return to menu...")
 
-    def handle_add(self):
+    async def handle_add(self):
         """
         Handle the add command with console interface.
         """
-        self.console.clear()
-        rprint(f"[{self.styles['header']}]Todo Console App - Add Task[/]")
-        rprint(f"[{self.styles['header']}]{'='*50}[/]\n")
+        self.print_header("Add Task")
 
-        title = input("Enter task title: ").strip()
+        title = await self.ask("Enter task title: ")
         if not title:
-            rprint(f"\n[{self.styles['error']}]Error: Title is required[/]")
-            input(f"\nPress Enter to return to menu...")
+            self.console.print(f"\n[{self.styles['error']}]Error: Title is required[/]")
+            await self.ask(f"\nPress Enter to return to menu...")
             return
 
-        description = input("Enter task description (optional): ").strip()
+        description = await self.ask("Enter task description (optional): ")
         description = description if description else None
+        tags = await self.ask("Enter tags, comma-separated (optional): ")
+        project = await self.ask("Enter project (optional): ")
+        priority = (await self.ask("Enter priority - low/medium/high (default: medium): ")).lower()
+        due_date = await self.ask("Enter due date YYYY-MM-DD (optional): ")
+        blocked_by = await self.ask("Blocked by task IDs, comma-separated (optional): ")
 
         try:
-            task_id = self.storage.add_task(title, description)
-            rprint(f"\n[{self.styles['success']}]Task added successfully with ID: {task_id}[/]")
+            task_id = self.storage.add_task(title, description, tags, project or None,
+                                            priority or "medium", due_date or None, blocked_by)
+            self.console.print(f"\n[{self.styles['success']}]Task added successfully with ID: {task_id}[/]")
         except ValueError as e:
-            rprint(f"\n[{self.styles['error']}]Error: {e}[/]")
+            self.console.print(f"\n[{self.styles['error']}]Error: {e}[/]")
 
-        input(f"\nPress Enter to return to menu...")
+        await self.ask(f"\nPress Enter to return to menu...")
 
-    def handle_view(self):
+    async def handle_view(self):
         """
-        Handle the view/list command with a styled display showing full descriptions.
+        Handle the view/list command with a styled, paged display showing full descriptions.
         """
-        self.console.clear()
-        rprint(f"[{self.styles['header']}]Todo Console App - Your Tasks[/]")
-        rprint(f"[{self.styles['header']}]{'='*50}[/]\n")
+        if not self.storage.get_task_count():
+            self.print_header("Your Tasks")
+            self.console.print(f"[{self.styles['info']}]No tasks found[/]")
+            await self.ask(f"\nPress Enter to return to menu...")
+            return
 
-        tasks = self.storage.get_all_tasks()
+        cursor = None
+        while True:
+            self.print_header("Your Tasks")
+            self.console.print(f"[{self.styles['info']}]Ordered by: {self.view_order}[/]\n")
+
+            # Only the visible page is read from the ordering index
+            tasks, next_cursor = self.storage.get_tasks_page(self.page_size, cursor,
+                                                             order_by=self.view_order)
+            for i, task in enumerate(tasks):
+                # Add space between tasks
+                if i > 0:
+                    self.console.print()  # Empty line for spacing
+
+                self.render_cache.print(task, "panel", self.render_task_panel)
+
+            options = "[n] next page, " if next_cursor is not None else ""
+            choice = (await self.ask(f"\n{options}[o] change order, [f] filter, Enter to return to menu: ")).lower()
+            if choice == 'n' and next_cursor is not None:
+                cursor = next_cursor
+            elif choice == 'o':
+                self.view_order = await self.choose_ordering()
+                cursor = None
+            elif choice == 'f':
+                await self.handle_filter()
+            else:
+                return
+
+    async def handle_filter(self):
+        """
+        Ask for filter criteria and show the matching tasks.
+        """
+        self.print_header("Filter Tasks")
+        projects = ', '.join(self.storage.get_projects()) or 'none'
+        tags = ', '.join(self.storage.get_tags()) or 'none'
+        self.console.print(f"[{self.styles['info']}]Projects: {projects}[/]")
+        self.console.print(f"[{self.styles['info']}]Tags: {tags}[/]\n")
+
+        project = await self.ask("Project (optional): ")
+        tags = await self.ask("Tags, all required, comma-separated (optional): ")
+        priority = (await self.ask("Priority - low/medium/high (optional): ")).lower()
+        due_before = await self.ask("Due on or before YYYY-MM-DD (optional): ")
+        overdue = (await self.ask("Only overdue tasks? (y/N): ")).lower() == 'y'
 
-        if not tasks:
-            rprint(f"[{self.styles['info']}]No tasks found[/]")
-            input(f"\nPress Enter to return to menu...")
+        try:
+            tasks = self.storage.query_tasks(project=project or None, tags=tags or None,
+                                             priority=priority or None,
+                                             due_before=due_before or None, overdue=overdue)
+        except ValueError as e:
+            self.console.print(f"\n[{self.styles['error']}]Error: {e}[/]")
+            await self.ask(f"\nPress Enter to continue...")
             return
 
-        from rich.panel import Panel
-        from rich.columns import Columns
-
+        self.print_header(f"Matching Tasks ({len(tasks)})")
+        if not tasks:
+            self.console.print(f"[{self.styles['info']}]No tasks found[/]")
         for i, task in enumerate(tasks):
-            status = "✓" if task.completed else "○"
-            status_style = self.styles['completed'] if task.completed else self.styles['pending']
-            title_style = 'white' if task.completed else 'cyan'
-
-            # Create a panel for each task to better organize the information
-            task_info = f"[bold]ID: {task.id}[/]\n"
-            task_info += f"[{status_style}]{status}[/] {task.title}\n"
-            task_info += f"[dim]{task.description or 'No description'}[/]" if task.description else f"[dim]No description[/]"
-
-            panel = Panel(
-                task_info,
-                title=f"Task {task.id}",
-                border_style="blue" if not task.completed else "green",
-                expand=False
-            )
-
-            self.console.print(panel)
-            # Add space between tasks
-            if i < len(tasks) - 1:
+            if i > 0:
                 self.console.print()  # Empty line for spacing
+            self.render_cache.print(task, "panel", self.render_task_panel)
+        await self.ask(f"\nPress Enter to continue...")
+
+    def render_task_panel(self, task: Task) -> Panel:
+        """
+        Build the panel shown for a task in the task list.
+        """
+        status = "✓" if task.completed else "○"
+        status_style = self.styles['completed'] if task.completed else self.styles['pending']
+
+        # Create a panel for each task to better organize the information
+        task_info = f"[bold]ID: {task.id}[/]\n"
+        task_info += f"[{status_style}]{status}[/] {task.title}\n"
+        task_info += f"[dim]{task.description or 'No description'}[/]" if task.description else f"[dim]No description[/]"
+        task_info += f"\nPriority: {task.priority}"
+        if task.project:
+            task_info += f"  Project: {task.project}"
+        if task.tags:
+            task_info += f"  Tags: {', '.join(task.tags)}"
+        if task.due_date:
+            due_style = self.styles['error'] if task.is_overdue() else self.styles['info']
+            task_info += f"\n[{due_style}]Due: {task.due_date.isoformat()}[/]"
+        if task.blocked_by:
+            task_info += f"\nBlocked by: {', '.join(map(str, task.blocked_by))}"
+
+        return Panel(
+            task_info,
+            title=f"Task {task.id}",
+            border_style="blue" if not task.completed else "green",
+            expand=False
+        )
+
+    async def choose_ordering(self) -> str:
+        """
+        Ask the user which ordering the task list should use.
+        """
+        orderings = self.storage.get_orderings()
+        self.console.print("\nAvailable orderings:\n")
+        for i, name in enumerate(orderings):
+            self.console.print(f"[{i+1}] {name}")
 
-        input(f"\nPress Enter to return to menu...")
+        choice = await self.ask("\nSelect ordering: ")
+        try:
+            return orderings[int(choice) - 1]
+        except (ValueError, IndexError):
+            return self.view_order
 
-    def handle_update(self):
+    async def handle_update(self):
         """
         Handle the update command with console interface.
         """
-        self.console.clear()
-        rprint(f"[{self.styles['header']}]Todo Console App - Update Task[/]")
-        rprint(f"[{self.styles['header']}]{'='*50}[/]\n")
+        self.print_header("Update Task")
 
         # Show available tasks to update
-        tasks = self.storage.get_all_tasks()
-        if not tasks:
-            rprint(f"[{self.styles['info']}]No tasks available[/]")
-            input(f"\nPress Enter to return to menu...")
+        if not self.storage.get_task_count():
+            self.console.print(f"[{self.styles['info']}]No tasks available[/]")
+            await self.ask(f"\nPress Enter to return to menu...")
             return
 
-        rprint("Available tasks:\n")
-        for i, task in enumerate(tasks):
-            status = "✓" if task.completed else "○"
-            status_style = self.styles['completed'] if task.completed else self.styles['pending']
-            rprint(f"[{i+1}] [{status_style}]{status}[/] {task.id}: {task.title}")
-
-        print()  # Add a blank line
-        task_id_str = input("Enter task ID to update: ").strip()
-        try:
-            task_id = int(task_id_str)
-        except ValueError:
-            rprint(f"\n[{self.styles['error']}]Error: Task ID must be a number[/]")
-            input(f"\nPress Enter to return to menu...")
+        task_id = await self.select_task("update")
+        if task_id is None:
             return
 
         # Get the current task
         current_task = self.storage.get_task(task_id)
         if not current_task:
-            rprint(f"\n[{self.styles['error']}]Error: Task with ID {task_id} not found[/]")
-            input(f"\nPress Enter to return to menu...")
+            self.console.print(f"\n[{self.styles['error']}]Error: Task with ID {task_id} not found[/]")
+            await self.ask(f"\nPress Enter to return to menu...")
             return
 
         # Get new values
-        new_title = input(f"Enter new title (current: '{current_task.title}'): ").strip()
-        new_description = input(f"Enter new description (current: '{current_task.description or 'None'}'): ").strip()
+        new_title = await self.ask(f"Enter new title (current: '{current_task.title}'): ")
+        new_description = await self.ask(f"Enter new description (current: '{current_task.description or 'None'}'): ")
+        new_tags = await self.ask(f"Enter new tags (current: '{', '.join(current_task.tags) or 'None'}'): ")
+        new_project = await self.ask(f"Enter new project, '-' to clear (current: '{current_task.project or 'None'}'): ")
+        new_priority = (await self.ask(f"Enter new priority (current: '{current_task.priority}'): ")).lower()
+        current_due = current_task.due_date.isoformat() if current_task.due_date else 'None'
+        new_due_date = await self.ask(f"Enter new due date, '-' to clear (current: '{current_due}'): ")
+        current_blockers = ', '.join(map(str, current_task.blocked_by)) or 'None'
+        new_blocked_by = await self.ask(f"Enter blocked by task IDs, '-' to clear (current: '{current_blockers}'): ")
 
         # Update the task
-        success = self.storage.update_task(task_id,
-                                          new_title if new_title else None,
-                                          new_description if new_description else None)
-        if success:
-            rprint(f"\n[{self.styles['success']}]Task with ID {task_id} updated successfully[/]")
-        else:
-            rprint(f"\n[{self.styles['error']}]Could not update task with ID {task_id}[/]")
+        try:
+            success = self.storage.update_task(task_id,
+                                              new_title if new_title else None,
+                                              new_description if new_description else None,
+                                              new_tags if new_tags else None,
+                                              ("" if new_project == '-' else new_project) if new_project else None,
+                                              new_priority if new_priority else None,
+                                              ("" if new_due_date == '-' else new_due_date) if new_due_date else None,
+                                              ("" if new_blocked_by == '-' else new_blocked_by) if new_blocked_by else None)
+            if success:
+                self.console.print(f"\n[{self.styles['success']}]Task with ID {task_id} updated successfully[/]")
+            else:
+                self.console.print(f"\n[{self.styles['error']}]Could not update task with ID {task_id}[/]")
+        except ValueError as e:
+            self.console.print(f"\n[{self.styles['error']}]Error: {e}[/]")
 
-        input(f"\nPress Enter to return to menu...")
+        await self.ask(f"\nPress Enter to return to menu...")
 
-    def handle_delete(self):
+    async def handle_delete(self):
         """
         Handle the delete command with console interface.
         """
-        self.console.clear()
-        rprint(f"[{self.styles['header']}]Todo Console App - Delete Task[/]")
-        rprint(f"[{self.styles['header']}]{'='*50}[/]\n")
+        self.print_header("Delete Task")
 
         # Show available tasks to delete
-        tasks = self.storage.get_all_tasks()
-        if not tasks:
-            rprint(f"[{self.styles['info']}]No tasks available[/]")
-            input(f"\nPress Enter to return to menu...")
+        if not self.storage.get_task_count():
+            self.console.print(f"[{self.styles['info']}]No tasks available[/]")
+            await self.ask(f"\nPress Enter to return to menu...")
             return
 
-        rprint("Available tasks:\n")
-        for i, task in enumerate(tasks):
-            status = "✓" if task.completed else "○"
-            status_style = self.styles['completed'] if task.completed else self.styles['pending']
-            rprint(f"[{i+1}] [{status_style}]{status}[/] {task.id}: {task.title}")
-
-        print()  # Add a blank line
-        task_id_str = input("Enter task ID to delete: ").strip()
-        try:
-            task_id = int(task_id_str)
-        except ValueError:
-            rprint(f"\n[{self.styles['error']}]Error: Task ID must be a number[/]")
-            input(f"\nPress Enter to return to menu...")
+        task_id = await self.select_task("delete")
+        if task_id is None:
             return
 
         success = self.storage.delete_task(task_id)
         if success:
-            rprint(f"\n[{self.styles['success']}]Task with ID {task_id} has been deleted[/]")
+            self.console.print(f"\n[{self.styles['success']}]Task with ID {task_id} has been deleted[/]")
         else:
-            rprint(f"\n[{self.styles['error']}]Task with ID {task_id} not found[/]")
+            self.console.print(f"\n[{self.styles['error']}]Task with ID {task_id} not found[/]")
 
-        input(f"\nPress Enter to return to menu...")
+        await self.ask(f"\nPress Enter to return to menu...")
 
-    def handle_complete(self):
+    async def handle_complete(self):
         """
         Handle the complete/mark command with console interface.
         """
-        self.console.clear()
-        rprint(f"[{self.styles['header']}]Todo Console App - Mark Task Complete[/]")
-        rprint(f"[{self.styles['header']}]{'='*50}[/]\n")
+        self.print_header("Mark Task Complete")
 
         # Show available tasks to mark
-        tasks = self.storage.get_all_tasks()
-        if not tasks:
-            rprint(f"[{self.styles['info']}]No tasks available[/]")
-            input(f"\nPress Enter to return to menu...")
+        if not self.storage.get_task_count():
+            self.console.print(f"[{self.styles['info']}]No tasks available[/]")
+            await self.ask(f"\nPress Enter to return to menu...")
             return
 
-        rprint("Available tasks:\n")
-        for i, task in enumerate(tasks):
-            status = "✓" if task.completed else "○"
-            status_style = self.styles['completed'] if task.completed else self.styles['pending']
-            rprint(f"[{i+1}] [{status_style}]{status}[/] {task.id}: {task.title}")
-
-        print()  # Add a blank line
-        task_id_str = input("Enter task ID to mark: ").strip()
-        try:
-            task_id = int(task_id_str)
-        except ValueError:
-            rprint(f"\n[{self.styles['error']}]Error: Task ID must be a number[/]")
-            input(f"\nPress Enter to return to menu...")
+        task_id = await self.select_task("mark")
+        if task_id is None:
             return
 
         task = self.storage.get_task(task_id)
         if not task:
-            rprint(f"\n[{self.styles['error']}]Error: Task with ID {task_id} not found[/]")
-            input(f"\nPress Enter to return to menu...")
+            self.console.print(f"\n[{self.styles['error']}]Error: Task with ID {task_id} not found[/]")
+            await self.ask(f"\nPress Enter to return to menu...")
             return
 
         success = self.storage.toggle_task_status(task_id)
         if success:
             new_status = "complete" if task.completed else "pending"
             status_style = self.styles['completed'] if task.completed else self.styles['pending']
-            rprint(f"\n[{self.styles['success']}]Task with ID {task_id} marked as [{status_style}]{new_status}[/]")
+            self.console.print(f"\n[{self.styles['success']}]Task with ID {task_id} marked as [{status_style}]{new_status}[/]")
         else:
-            rprint(f"\n[{self.styles['error']}]Could not toggle status for task with ID {task_id}[/]")
+            self.console.print(f"\n[{self.styles['error']}]Could not toggle status for task with ID {task_id}[/]")
 
-        input(f"\nPress Enter to return to menu...")
+        await self.ask(f"\nPress Enter to return to menu...")
 
-    def run(self):
+    async def handle_undo(self):
+        """
+        Handle the undo command by reversing the most recent change.
+        """
+        if self.storage.undo():
+            await self.show_message("Undo", f"[{self.styles['success']}]Last change undone[/]")
+        else:
+            await self.show_message("Undo", f"[{self.styles['info']}]Nothing to undo[/]")
+
+    async def handle_redo(self):
+        """
+        Handle the redo command by re-applying the most recently undone change.
         """
-        Main loop for the CLI application with true arrow key navigation.
+        if self.storage.redo():
+            await self.show_message("Redo", f"[{self.styles['success']}]Last undone change redone[/]")
+        else:
+            await self.show_message("Redo", f"[{self.styles['info']}]Nothing to redo[/]")
+
+    async def handle_next(self):
+        """
+        Handle the next command by listing the pending tasks that are not
+        waiting on any other task, most urgent first.
+        """
+        self.print_header("What's Next")
+        tasks = self.storage.next_actionable(self.page_size)
+        if not tasks:
+            self.console.print(f"[{self.styles['info']}]Nothing is ready to work on[/]")
+        for i, task in enumerate(tasks):
+            if i > 0:
+                self.console.print()  # Empty line for spacing
+            self.render_cache.print(task, "panel", self.render_task_panel)
+        await self.ask(f"\nPress Enter to return to menu...")
+
+    async def handle_history(self):
+        """
+        Handle the history command by listing the audit log entries of a task.
+        Only the log blocks that mention the task are read.
+        """
+        self.print_header("Task History")
+        task_id = await self.select_task("show the history of")
+        if task_id is None:
+            return
+
+        try:
+            entries = self.storage.history(task_id)
+        except ValueError as e:
+            await self.show_message("Task History", f"[{self.styles['error']}]Error: {e}[/]")
+            return
+
+        self.print_header(f"History of Task {task_id}")
+        if not entries:
+            self.console.print(f"[{self.styles['info']}]No recorded changes[/]")
+        else:
+            table = Table()
+            table.add_column("When")
+            table.add_column("Who")
+            table.add_column("Action")
+            table.add_column("Changes")
+            for entry in entries:
+                changes = "\n".join(f"{field}: {old!r} → {new!r}"
+                                    for field, (old, new) in entry['changes'].items())
+                table.add_row(datetime.fromtimestamp(entry['at']).isoformat(sep=" ", timespec="seconds"),
+                              entry['actor'], entry['action'], changes)
+            self.console.print(table)
+        await self.ask(f"\nPress Enter to return to menu...")
+
+    async def handle_stats(self):
+        """
+        Handle the statistics command. The numbers come from counters kept
+        by the store, so the screen is instant regardless of store size.
+        """
+        self.print_header("Statistics")
+        stats = self.storage.stats()
+
+        self.console.print(f"[bold]Total:[/] {stats['total']}   "
+               f"[{self.styles['completed']}]Completed: {stats['completed']}[/]   "
+               f"[{self.styles['pending']}]Pending: {stats['pending']}[/]   "
+               f"Completion rate: {stats['completion_rate']:.0%}\n")
+
+        if stats['by_project']:
+            table = Table(title="Projects", title_justify="left")
+            table.add_column("Project")
+            table.add_column("Total", justify="right")
+            table.add_column("Completed", justify="right")
+            table.add_column("Pending", justify="right")
+            table.add_column("Rate", justify="right")
+            for project, counts in sorted(stats['by_project'].items()):
+                table.add_row(project, str(counts['total']), str(counts['completed']),
+                              str(counts['pending']), f"{counts['completion_rate']:.0%}")
+            self.console.print(table)
+
+        priorities = "   ".join(f"{priority}: {count}" for priority, count in stats['by_priority'].items())
+        self.console.print(f"\n[bold]By priority:[/] {priorities}")
+
+        throughput = stats['throughput']
+        hours = throughput['bucket_seconds'] * len(throughput['completions']) // 3600
+        bars = "▁▂▃▄▅▆▇█"
+        peak = max(throughput['completions']) or 1
+        sparkline = "".join(bars[count * (len(bars) - 1) // peak] for count in throughput['completions'])
+        self.console.print(f"\n[bold]Completed in the last {hours}h:[/] {throughput['window_total']}  "
+               f"[{self.styles['info']}]{sparkline}[/]")
+
+        await self.ask(f"\nPress Enter to return to menu...")
+
+    async def handle_schedule(self):
+        """
+        Handle the schedule command: list, add and cancel reminders and repeating tasks.
+        """
+        self.print_header("Reminders & Repeats")
+
+        schedules = self.scheduler.get_schedules()
+        if schedules:
+            table = Table()
+            table.add_column("ID", justify="right")
+            table.add_column("Next")
+            table.add_column("What")
+            for schedule in schedules:
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(schedule.fire_at))
+                if schedule.kind == "reminder":
+                    what = f"Remind about task {schedule.task_id}"
+                    if schedule.message:
+                        what += f": {schedule.message}"
+                else:
+                    what = f"{schedule.template['title']} ({schedule.rule} at {schedule.at})"
+                table.add_row(str(schedule.id), when, what)
+            self.console.print(table)
+        else:
+            self.console.print(f"[{self.styles['info']}]Nothing scheduled[/]")
+
+        action = (await self.ask("\n[r]emind about a task, [e]very: repeat a task, [c]ancel, "
+                                 "or Enter to go back: ")).lower()
+        try:
+            if action == 'r':
+                task_id = await self.select_task("remind about")
+                if task_id is None:
+                    return
+                when = await self.ask("Remind at (YYYY-MM-DD HH:MM): ")
+                message = await self.ask("Message (optional): ")
+                schedule_id = self.scheduler.add_reminder(task_id, when, message or None)
+                self.console.print(f"\n[{self.styles['success']}]Reminder {schedule_id} set[/]")
+            elif action == 'e':
+                title = await self.ask("Enter task title: ")
+                rule = await self.ask("Repeat (daily, weekdays, weekly, every 2 days, every monday...): ")
+                at = await self.ask("At time HH:MM (default: 09:00): ")
+                project = await self.ask("Enter project (optional): ")
+                schedule_id = self.scheduler.add_recurring(title, rule, project=project or None,
+                                                           at=at or "09:00")
+                self.console.print(f"\n[{self.styles['success']}]Repeating task {schedule_id} scheduled[/]")
+            elif action == 'c':
+                schedule_id = await self.ask("Enter schedule ID to cancel: ")
+                if not schedule_id.isdigit():
+                    raise ValueError("Schedule ID must be a number")
+                schedule_id = int(schedule_id)
+                if self.scheduler.cancel(schedule_id):
+                    self.console.print(f"\n[{self.styles['success']}]Schedule {schedule_id} cancelled[/]")
+                else:
+                    self.console.print(f"\n[{self.styles['error']}]Error: Schedule {schedule_id} not found[/]")
+            else:
+                return
+        except ValueError as e:
+            self.console.print(f"\n[{self.styles['error']}]Error: {e}[/]")
+
+        await self.ask(f"\nPress Enter to return to menu...")
+
+    def show_due_events(self):
+        """
+        Fire due reminders and repeating tasks, and show what happened above the menu.
+        """
+        self.scheduler.tick()
+        with self.console.capture() as capture:
+            for event in self.scheduler.drain_events():
+                self.console.print(self.format_event(event))
+        self._menu_notices = list(to_formatted_text(ANSI(capture.get())))
+
+    def format_event(self, event: ScheduledEvent) -> str:
+        """
+        Describe a scheduler event as rich markup.
         """
-        while self.running:
-            try:
+        if event.kind == "recurring":
+            return f"[{self.styles['info']}]🔁 Added task {event.task_id}: {event.message}[/]"
+        task = self.storage.get_task(event.task_id)
+        title = task.title if task else f"task {event.task_id}"
+        message = f" - {event.message}" if event.message else ""
+        return f"[{self.styles['pending']}]🔔 Reminder: {title}{message}[/]"
+
+    async def main_loop(self):
+        """
+        Show the menu and run the chosen command until the user quits.
+
+        Runs as a task of the application, which it exits when done; an
+        unexpected error is re-raised from the application's run().
+        """
+        try:
+            while self.running:
+                self.show_due_events()
                 # Show menu with arrow key navigation
-                choice = self.show_menu_with_navigation()
+                choice = await self.show_menu_with_navigation()
 
                 if choice == 'add':
-                    self.handle_add()
+                    await self.handle_add()
                 elif choice == 'view':
-                    self.handle_view()
+                    await self.handle_view()
                 elif choice == 'update':
-                    self.handle_update()
+                    await self.handle_update()
                 elif choice == 'delete':
-                    self.handle_delete()
+                    await self.handle_delete()
                 elif choice == 'complete':
-                    self.handle_complete()
+                    await self.handle_complete()
+                elif choice == 'undo':
+                    await self.handle_undo()
+                elif choice == 'redo':
+                    await self.handle_redo()
+                elif choice == 'next':
+                    await self.handle_next()
+                elif choice == 'history':
+                    await self.handle_history()
+                elif choice == 'stats':
+                    await self.handle_stats()
+                elif choice == 'schedule':
+                    await self.handle_schedule()
                 elif choice == 'help':
-                    self.display_help()
+                    await self.display_help()
                 elif choice == 'quit':
                     self.running = False
-                    rprint(f"[{self.styles['success']}]Goodbye![/]")
-                else:
-                    # If user enters an invalid choice
-                    continue
-            except KeyboardInterrupt:
-                rprint(f"\n[{self.styles['success']}]Goodbye![/]")
-                self.running = False
\ No newline at end of file
+        except KeyboardInterrupt:
+            self.running = False
+        except Exception as e:
+            self._app.exit(exception=e)
+            return
+        self._app.exit()
+
+    def run(self):
+        """
+        Main loop for the CLI application, inside one full-screen application.
+        """
+        if self._app is None:
+            self._app = self.build_app()
+        try:
+            self._app.run(pre_run=lambda: self._app.create_background_task(self.main_loop()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.storage.close()  # Save anything the flusher has not written yet
+        rprint(f"[{self.styles['success']}]Goodbye![/]")
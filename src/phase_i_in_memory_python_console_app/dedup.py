@@ -0,0 +1,269 @@
+import hashlib
+import re
+import struct
+import threading
+from functools import reduce
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from .models import Task
+from .storage import TaskStorage
+
+SIGNATURE_SIZE = 64  # MinHash values per signature
+BANDS = 16  # LSH bands of ROWS values each
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.6
+ROWS = SIGNATURE_SIZE // BANDS
+LANE_BITS = 17  # A 16-bit hash value plus a guard bit
+LANES_CACHE_SIZE = 1 << 16  # Shingles whose packed hash values are kept
+
+_HASHES = struct.Struct(f"<{SIGNATURE_SIZE}H")
+_GUARDS = sum(1 << (LANE_BITS * lane + 16) for lane in range(SIGNATURE_SIZE))
+_BAND_MASK = (1 << (LANE_BITS * ROWS)) - 1
+_LANES_CACHE: Dict[str, int] = {}
+_NON_WORD = re.compile(r"\W+")
+
+
+def task_text(title: str, description: Optional[str] = None) -> str:
+    """
+    The text compared for duplicates: title and description, casefolded,
+    with punctuation and repeated spaces collapsed.
+    """
+    text = f"{title} {description}" if description else title
+    return " ".join(_NON_WORD.sub(" ", text.casefold()).split())
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """
+    Get the overlapping character n-grams of a normalized text.
+    """
+    if len(text) <= SHINGLE_SIZE:
+        return frozenset((text,))
+    return frozenset(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """
+    Jaccard similarity of two shingle sets.
+    """
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _shingle_lanes(shingle: str) -> int:
+    lanes = _LANES_CACHE.get(shingle)
+    if lanes is None:
+        if len(_LANES_CACHE) >= LANES_CACHE_SIZE:
+            _LANES_CACHE.clear()
+        values = _HASHES.unpack(hashlib.shake_128(shingle.encode('utf-8')).digest(_HASHES.size))
+        lanes = _LANES_CACHE[shingle] = sum(value << (LANE_BITS * lane)
+                                            for lane, value in enumerate(values))
+    return lanes
+
+
+def _lane_min(a: int, b: int) -> int:
+    # Setting every guard bit of a before subtracting b leaves a lane's guard
+    # set exactly when a >= b in that lane, with no borrow between lanes
+    a_not_less = (((a | _GUARDS) - b) & _GUARDS) >> 16
+    take_b = (a_not_less << 16) - a_not_less
+    return a ^ ((a ^ b) & take_b)
+
+
+def minhash(shingle_set: FrozenSet[str]) -> int:
+    """
+    Compute the MinHash signature of a shingle set.
+
+    One extendable-output hash per shingle yields all SIGNATURE_SIZE 16-bit
+    hash values at once. They are packed into one integer, a value per
+    LANE_BITS-wide lane, so the per-position minimum over all shingles is a
+    handful of big-integer operations per shingle instead of a Python loop
+    over positions. Packed shingle hashes are cached, since task texts draw
+    on a limited set of trigrams.
+
+    Returns:
+        The signature, packed the same way
+    """
+    return reduce(_lane_min, map(_shingle_lanes, shingle_set))
+
+
+def signature_values(signature: int) -> Tuple[int, ...]:
+    """
+    Unpack a signature from minhash() into its SIGNATURE_SIZE values.
+    """
+    return tuple((signature >> (LANE_BITS * lane)) & 0xFFFF for lane in range(SIGNATURE_SIZE))
+
+
+class DuplicateIndex:
+    """
+    Locality-sensitive hash index for finding near-duplicate tasks.
+
+    Every task's title and description are reduced to a MinHash signature,
+    which is cut into bands; tasks that agree on all bins of any band land
+    in the same bucket. Looking up a new text only checks the tasks sharing
+    one of its buckets, so checking an insert does not depend on the store
+    size, and find_duplicates() only compares tasks that share a bucket
+    instead of every pair. Candidates are confirmed with the exact Jaccard
+    similarity of their character trigrams.
+    """
+
+    def __init__(self, storage: Optional[TaskStorage] = None, threshold: float = DEFAULT_THRESHOLD):
+        """
+        Args:
+            storage: Store to index and keep up to date with (optional)
+            threshold: Minimum similarity, from 0 to 1, for two tasks to count as duplicates
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("Duplicate threshold must be between 0 and 1")
+        self.threshold = threshold
+        self._lock = threading.RLock()
+        self._texts: Dict[int, str] = {}
+        self._bands: Dict[int, List[int]] = {}
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(BANDS)]
+        self.storage = storage
+        if storage is not None:
+            self._load(storage)
+            storage.add_listener(self._on_change)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @staticmethod
+    def _band_keys(text: str) -> List[int]:
+        signature = minhash(shingles(text))
+        return [(signature >> (LANE_BITS * ROWS * band)) & _BAND_MASK for band in range(BANDS)]
+
+    def add(self, task_id: int, title: str, description: Optional[str] = None):
+        """
+        Index (or re-index) a task's text.
+        """
+        text = task_text(title, description)
+        with self._lock:
+            self.remove(task_id)
+            self._texts[task_id] = text
+            keys = self._band_keys(text)
+            self._bands[task_id] = keys
+            for buckets, key in zip(self._buckets, keys):
+                buckets.setdefault(key, set()).add(task_id)
+
+    def remove(self, task_id: int):
+        """
+        Remove a task from the index if it is present.
+        """
+        with self._lock:
+            keys = self._bands.pop(task_id, None)
+            if keys is None:
+                return
+            del self._texts[task_id]
+            for buckets, key in zip(self._buckets, keys):
+                bucket = buckets[key]
+                bucket.discard(task_id)
+                if not bucket:
+                    del buckets[key]
+
+    def find_similar(self, title: str, description: Optional[str] = None,
+                     threshold: Optional[float] = None,
+                     exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Find indexed tasks whose text is similar to the given title and description.
+
+        Args:
+            title: The title to check
+            description: The description to check (optional)
+            threshold: Minimum similarity (optional, the index's threshold if omitted)
+            exclude: A task ID to leave out, e.g. the task being checked (optional)
+
+        Returns:
+            (task ID, similarity) pairs, most similar first
+        """
+        threshold = self.threshold if threshold is None else threshold
+        text = task_text(title, description)
+        query = shingles(text)
+        with self._lock:
+            candidates = set()
+            for buckets, key in zip(self._buckets, self._band_keys(text)):
+                candidates.update(buckets.get(key, ()))
+            candidates.discard(exclude)
+            matches = []
+            for task_id in candidates:
+                similarity = jaccard(query, shingles(self._texts[task_id]))
+                if similarity >= threshold:
+                    matches.append((task_id, similarity))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+    def find_duplicates(self, threshold: Optional[float] = None) -> List[List[int]]:
+        """
+        Group all indexed tasks into clusters of near-duplicates.
+
+        Only tasks that share an LSH bucket are compared, and within a
+        bucket each task is only compared with one member of each cluster
+        found there so far, so the work grows roughly linearly with the
+        number of tasks.
+
+        Args:
+            threshold: Minimum similarity (optional, the index's threshold if omitted)
+
+        Returns:
+            Clusters of two or more task IDs, each sorted, ordered by their smallest ID
+        """
+        threshold = self.threshold if threshold is None else threshold
+        parents: Dict[int, int] = {}
+
+        def find(task_id: int) -> int:
+            root = task_id
+            while parents.get(root, root) != root:
+                root = parents[root]
+            while task_id != root:  # Path compression
+                parents[task_id], task_id = root, parents.get(task_id, task_id)
+            return root
+
+        cache: Dict[int, FrozenSet[str]] = {}
+
+        def shingles_of(task_id: int) -> FrozenSet[str]:
+            result = cache.get(task_id)
+            if result is None:
+                result = cache[task_id] = shingles(self._texts[task_id])
+            return result
+
+        with self._lock:
+            for buckets in self._buckets:
+                for bucket in buckets.values():
+                    if len(bucket) < 2:
+                        continue
+                    # Compare each member with one representative of every
+                    # cluster met in this bucket so far, not with every member
+                    representatives: List[int] = []
+                    for task_id in sorted(bucket):
+                        for other in representatives:
+                            root, other_root = find(task_id), find(other)
+                            if root == other_root:
+                                break
+                            if jaccard(shingles_of(task_id), shingles_of(other)) >= threshold:
+                                parents.setdefault(root, root)
+                                parents.setdefault(other_root, other_root)
+                                parents[max(root, other_root)] = min(root, other_root)
+                                break
+                        else:
+                            representatives.append(task_id)
+
+        clusters: Dict[int, List[int]] = {}
+        for task_id in parents:
+            clusters.setdefault(find(task_id), []).append(task_id)
+        return sorted((sorted(members) for members in clusters.values() if len(members) > 1),
+                      key=lambda members: members[0])
+
+    def _load(self, storage: TaskStorage):
+        with self._lock:
+            self._texts.clear()
+            self._bands.clear()
+            for buckets in self._buckets:
+                buckets.clear()
+            for task in storage.iter_tasks():
+                self.add(task.id, task.title, task.description)
+
+    def _on_change(self, event: str, task: Optional[Task], changes: Dict[str, Any]):
+        if event == "reset":
+            self._load(self.storage)
+        elif event == "add" or (event == "update" and ("title" in changes or "description" in changes)):
+            self.add(task.id, task.title, task.description)
+        elif event == "delete":
+            self.remove(task.id)
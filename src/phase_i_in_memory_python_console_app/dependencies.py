@@ -0,0 +1,239 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+from .models import Task
+
+
+class DependencyGraph:
+    """
+    "Blocked by" relations between tasks, maintained incrementally from
+    store changes.
+
+    Each pending task keeps a counter of its blockers that exist and are
+    still pending; the tasks whose counter is zero form the ready set.
+    Completing, reopening, adding or deleting a task only adjusts the
+    counters of the tasks it blocks, so the ready set stays current in
+    O(degree) per change and reading it never walks the graph.
+
+    Tasks are also kept in a topological order, maintained with the
+    Pearce-Kelly algorithm: a new edge that already agrees with the order
+    costs O(1), and otherwise only the tasks ordered between its two ends
+    are searched and reordered. The same search detects edges that would
+    close a cycle.
+
+    A blocker that was deleted no longer blocks. Undoing the deletion
+    restores its edges; should that close a cycle, the tasks on it simply
+    never become ready.
+    """
+
+    def __init__(self):
+        self._blockers: Dict[int, List[int]] = {}  # Present task -> its blocked_by IDs
+        self._dependents: Dict[int, Set[int]] = {}  # Task ID -> present tasks it blocks
+        self._completed: Dict[int, bool] = {}  # Present task -> completion status
+        self._open_blockers: Dict[int, int] = {}  # Pending task -> pending blockers
+        self._ready: Set[int] = set()
+        self._order: Dict[int, int] = {}  # Present task -> position in topological order
+        self._next_position = 0
+
+    def rebuild(self, tasks: Iterable[Task]):
+        """
+        Rebuild the graph from scratch.
+
+        Args:
+            tasks: All tasks in the store
+        """
+        self.__init__()
+        self.add_many(tasks)
+
+    def add_many(self, tasks: Iterable[Task]):
+        """
+        Add a batch of tasks that are not in the graph yet. Blockers may
+        arrive in a later batch than the tasks they block.
+        """
+        completed = self._completed
+        order = self._order
+        blockers = self._blockers
+        dependents = self._dependents
+        for task in tasks:
+            task_id = task.id
+            if task.blocked_by or task_id in dependents:
+                self._add(task)
+                continue
+            # Most tasks have no edges; they only need registering
+            completed[task_id] = task.completed
+            order[task_id] = self._next_position
+            self._next_position += 1
+            blockers[task_id] = []
+            if not task.completed:
+                self._open_blockers[task_id] = 0
+                self._ready.add(task_id)
+
+    def on_change(self, event: str, task: Optional[Task], changes: Dict[str, Any]):
+        """
+        Store change listener; see TaskStorage.add_listener.
+        """
+        if event == "add":
+            self._add(task)
+        elif event == "delete":
+            self._delete(task.id)
+        elif event == "update":
+            if "blocked_by" in changes:
+                self._set_blockers(task.id, list(task.blocked_by))
+            if "completed" in changes and changes["completed"] != task.completed:
+                self._set_completed(task.id, task.completed)
+
+    def _is_pending(self, task_id: int) -> bool:
+        return self._completed.get(task_id) is False
+
+    def _add(self, task: Task):
+        task_id = task.id
+        self._completed[task_id] = task.completed
+        self._order[task_id] = self._next_position
+        self._next_position += 1
+        self._blockers[task_id] = []
+        self._set_blockers(task_id, list(task.blocked_by))
+        # Tasks added earlier that this one blocks
+        for dependent in self._dependents.get(task_id, ()):
+            self._add_edge(task_id, dependent)
+            if not task.completed:
+                self._adjust(dependent, 1)
+
+    def _delete(self, task_id: int):
+        if task_id not in self._completed:
+            return
+        for blocker in self._blockers.pop(task_id):
+            self._unlink(blocker, task_id)
+        if not self._completed.pop(task_id):
+            for dependent in self._dependents.get(task_id, ()):
+                self._adjust(dependent, -1)
+        self._open_blockers.pop(task_id, None)
+        self._ready.discard(task_id)
+        del self._order[task_id]
+
+    def _set_blockers(self, task_id: int, blockers: List[int]):
+        for blocker in self._blockers[task_id]:
+            self._unlink(blocker, task_id)
+        self._blockers[task_id] = blockers
+        for blocker in blockers:
+            self._dependents.setdefault(blocker, set()).add(task_id)
+            if blocker in self._order:
+                self._add_edge(blocker, task_id)
+        if self._is_pending(task_id):
+            self._open_blockers[task_id] = sum(map(self._is_pending, blockers))
+            self._update_ready(task_id)
+
+    def _unlink(self, blocker: int, task_id: int):
+        dependents = self._dependents.get(blocker)
+        if dependents is not None:
+            dependents.discard(task_id)
+            if not dependents:
+                del self._dependents[blocker]
+
+    def _set_completed(self, task_id: int, completed: bool):
+        self._completed[task_id] = completed
+        if completed:
+            self._open_blockers.pop(task_id, None)
+            self._ready.discard(task_id)
+        else:
+            self._open_blockers[task_id] = sum(map(self._is_pending, self._blockers[task_id]))
+            self._update_ready(task_id)
+        for dependent in self._dependents.get(task_id, ()):
+            self._adjust(dependent, -1 if completed else 1)
+
+    def _adjust(self, task_id: int, delta: int):
+        if task_id in self._open_blockers:
+            self._open_blockers[task_id] += delta
+            self._update_ready(task_id)
+
+    def _update_ready(self, task_id: int):
+        if self._open_blockers[task_id]:
+            self._ready.discard(task_id)
+        else:
+            self._ready.add(task_id)
+
+    def _reaches(self, start: int, target: int, upper: int, visited: Set[int]) -> bool:
+        """
+        Depth-first search from start along "blocks" edges, only through
+        tasks positioned at or before upper, collecting them in visited.
+        """
+        stack = [start]
+        visited.add(start)
+        while stack:
+            for dependent in self._dependents.get(stack.pop(), ()):
+                if dependent == target:
+                    return True
+                position = self._order.get(dependent)
+                if position is not None and position <= upper and dependent not in visited:
+                    visited.add(dependent)
+                    stack.append(dependent)
+        return False
+
+    def _add_edge(self, blocker: int, task_id: int) -> bool:
+        """
+        Keep the topological order valid after blocker -> task_id was added.
+
+        Returns:
+            False if the edge closes a cycle (the order is then left as it was)
+        """
+        lower, upper = self._order[task_id], self._order[blocker]
+        if upper < lower:
+            return True
+        if blocker == task_id:
+            return False
+        forward: Set[int] = set()
+        if self._reaches(task_id, blocker, upper, forward):
+            return False
+        backward = {blocker}
+        stack = [blocker]
+        while stack:
+            for other in self._blockers.get(stack.pop(), ()):
+                position = self._order.get(other)
+                if position is not None and position >= lower and other not in backward:
+                    backward.add(other)
+                    stack.append(other)
+        # Everything that must come before the blocker moves ahead of
+        # everything that must come after the task, reusing their positions
+        moved = sorted(backward, key=self._order.__getitem__) + sorted(forward, key=self._order.__getitem__)
+        for task, position in zip(moved, sorted(self._order[task] for task in moved)):
+            self._order[task] = position
+        return True
+
+    def check_blockers(self, task_id: Optional[int], blockers: Iterable[int]):
+        """
+        Check that a task can be blocked by the given tasks.
+
+        Raises:
+            ValueError: If a blocker does not exist, is the task itself, or
+                already depends on the task, which would create a cycle
+        """
+        for blocker in blockers:
+            if blocker == task_id:
+                raise ValueError("A task cannot be blocked by itself")
+            if blocker not in self._order:
+                raise ValueError(f"Task with ID {blocker} not found")
+            if task_id in self._order and self._order[blocker] > self._order[task_id]:
+                if self._reaches(task_id, blocker, self._order[blocker], set()):
+                    raise ValueError(f"Task {task_id} cannot be blocked by task {blocker}: "
+                                     f"that would create a cycle")
+
+    def get_ready(self) -> Set[int]:
+        """
+        Get the IDs of pending tasks whose blockers are all completed or deleted.
+        """
+        return set(self._ready)
+
+    def get_open_blockers(self, task_id: int) -> List[int]:
+        """
+        Get the blockers of a task that exist and are still pending.
+        """
+        return [blocker for blocker in self._blockers.get(task_id, ()) if self._is_pending(blocker)]
+
+    def get_dependents(self, task_id: int) -> List[int]:
+        """
+        Get the IDs of the tasks a task blocks.
+        """
+        return sorted(self._dependents.get(task_id, ()))
+
+    def topological_order(self) -> List[int]:
+        """
+        Get every task ID ordered so that each task comes after its blockers.
+        """
+        return sorted(self._order, key=self._order.__getitem__)
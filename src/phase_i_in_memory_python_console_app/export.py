@@ -0,0 +1,141 @@
+import csv
+import html
+import io
+import json
+from itertools import batched
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO
+from .models import Task
+from .storage import TaskStorage
+
+EXPORT_FORMATS = ("csv", "md", "html", "jsonl")
+EXPORT_BATCH_SIZE = 1024  # Tasks rendered into each chunk written to the output
+COLUMNS = ("id", "title", "description", "completed", "priority", "project", "tags",
+           "due_date", "updated_at", "blocked_by")
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def _csv_chunks(tasks: Iterable[Task], batch_size: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(COLUMNS)
+    for batch in batched(tasks, batch_size):
+        writer.writerows((task.id, task.title, task.description or "", task.completed,
+                          task.priority, task.project or "", ",".join(task.tags),
+                          task.due_date.isoformat() if task.due_date else "",
+                          task.updated_at if task.updated_at is not None else "",
+                          ",".join(map(str, task.blocked_by)))
+                         for task in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _markdown_cell(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    return value.replace("\\", "\\\\").replace("|", "\\|").replace("\r", " ").replace("\n", " ")
+
+
+def _markdown_chunks(tasks: Iterable[Task], batch_size: int) -> Iterator[str]:
+    yield ("| ID | Status | Title | Description | Priority | Project | Tags | Due |\n"
+           "|---:|:---:|---|---|---|---|---|---|\n")
+    for batch in batched(tasks, batch_size):
+        yield "".join(
+            f"| {task.id} | {'✓' if task.completed else '○'} | {_markdown_cell(task.title)} "
+            f"| {_markdown_cell(task.description)} | {task.priority} | {_markdown_cell(task.project)} "
+            f"| {_markdown_cell(', '.join(task.tags))} "
+            f"| {task.due_date.isoformat() if task.due_date else ''} |\n"
+            for task in batch)
+
+
+def _html_chunks(tasks: Iterable[Task], batch_size: int) -> Iterator[str]:
+    escape = html.escape
+    yield ("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>Tasks</title>\n"
+           "</head>\n<body>\n<table>\n<thead>\n<tr><th>ID</th><th>Status</th><th>Title</th>"
+           "<th>Description</th><th>Priority</th><th>Project</th><th>Tags</th><th>Due</th></tr>\n"
+           "</thead>\n<tbody>\n")
+    for batch in batched(tasks, batch_size):
+        yield "".join(
+            f"<tr><td>{task.id}</td><td>{'done' if task.completed else 'pending'}</td>"
+            f"<td>{escape(task.title)}</td><td>{escape(task.description or '')}</td>"
+            f"<td>{task.priority}</td><td>{escape(task.project or '')}</td>"
+            f"<td>{escape(', '.join(task.tags))}</td>"
+            f"<td>{task.due_date.isoformat() if task.due_date else ''}</td></tr>\n"
+            for task in batch)
+    yield "</tbody>\n</table>\n</body>\n</html>\n"
+
+
+def _jsonl_chunks(tasks: Iterable[Task], batch_size: int) -> Iterator[str]:
+    encode = _ENCODER.encode
+    to_record = TaskStorage._task_to_record
+    for batch in batched(tasks, batch_size):
+        yield "".join(encode(to_record(task)) + "\n" for task in batch)
+
+
+_RENDERERS: Dict[str, Callable[[Iterable[Task], int], Iterator[str]]] = {
+    "csv": _csv_chunks,
+    "md": _markdown_chunks,
+    "html": _html_chunks,
+    "jsonl": _jsonl_chunks,
+}
+
+
+def iter_export_chunks(tasks: Iterable[Task], format: str,
+                       batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """
+    Render a stream of tasks as text chunks in an export format.
+
+    Tasks are pulled from the iterable one batch at a time, so memory use
+    depends on the batch size, not on the number of tasks.
+
+    Args:
+        tasks: The tasks to render, in output order
+        format: "csv", "md" (a Markdown table), "html" or "jsonl"
+        batch_size: Number of tasks rendered into each chunk
+
+    Returns:
+        An iterator of text chunks, including any header and footer
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    renderer = _RENDERERS.get(format)
+    if renderer is None:
+        raise ValueError(f"Unknown export format: {format} (choose from {', '.join(EXPORT_FORMATS)})")
+    return renderer(tasks, batch_size)
+
+
+def export_tasks(storage: TaskStorage, output: TextIO, format: str, order_by: str = "id",
+                 filter: Optional[Callable[[Task], bool]] = None,
+                 batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """
+    Stream the tasks of a store to an open text file.
+
+    Args:
+        storage: The store to export
+        output: Text file (or stream) to write to
+        format: "csv", "md", "html" or "jsonl"
+        order_by: Ordering to export tasks in (default "id")
+        filter: Predicate selecting the tasks to export, e.g. from
+            task_filter (optional, all tasks if omitted)
+        batch_size: Number of tasks written per chunk
+
+    Returns:
+        The number of tasks exported
+
+    Raises:
+        ValueError: If the format or ordering is unknown
+    """
+    count = 0
+
+    def counted(tasks: Iterator[Task]) -> Iterator[Task]:
+        nonlocal count
+        for count, task in enumerate(tasks, 1):
+            yield task
+
+    tasks = storage.iter_tasks(filter=filter, order_by=order_by)
+    for chunk in iter_export_chunks(counted(tasks), format, batch_size):
+        output.write(chunk)
+    return count
@@ -0,0 +1,118 @@
+import gzip
+import lzma
+from typing import BinaryIO, Dict, List, Optional
+
+try:  # Python 3.14+
+    from compression import zstd as _zstd
+except ImportError:
+    _zstd = None
+
+try:
+    import zstandard as _zstandard
+except ImportError:
+    _zstandard = None
+
+# Leading bytes of each compressed format, used to detect how a file was written
+MAGIC_NUMBERS: Dict[str, bytes] = {
+    "gzip": b"\x1f\x8b",
+    "lzma": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+DEFAULT_LEVELS: Dict[str, int] = {"gzip": 6, "lzma": 6, "zstd": 3}
+
+# Errors raised while reading a truncated or corrupt compressed stream
+DECODE_ERRORS = (gzip.BadGzipFile, EOFError, lzma.LZMAError) + tuple(
+    module.ZstdError for module in (_zstd, _zstandard) if module is not None)
+
+
+def available_codecs() -> List[str]:
+    """
+    Get the compression formats usable in this interpreter.
+
+    Returns:
+        Format names; "zstd" is only included when Python 3.14's
+        compression.zstd or the zstandard package is available
+    """
+    codecs = ["gzip", "lzma"]
+    if _zstd is not None or _zstandard is not None:
+        codecs.append("zstd")
+    return codecs
+
+
+def check_codec(codec: Optional[str]):
+    """
+    Check that a compression format can be used.
+
+    Args:
+        codec: The format name, or None for uncompressed files
+
+    Raises:
+        ValueError: If the format is unknown or not available
+    """
+    if codec is None:
+        return
+    if codec not in DEFAULT_LEVELS:
+        raise ValueError(f"Unknown compression: {codec} (choose from {', '.join(DEFAULT_LEVELS)})")
+    if codec not in available_codecs():
+        raise ValueError("zstd compression needs Python 3.14 or the zstandard package")
+
+
+def open_write(path: str, codec: Optional[str] = None, level: Optional[int] = None) -> BinaryIO:
+    """
+    Open a file for writing, compressing everything written to it.
+
+    Args:
+        path: The file to create
+        codec: "gzip", "lzma", "zstd", or None for no compression
+        level: Compression level (optional, the format's default if omitted)
+
+    Returns:
+        A binary file object; close it to finish the compressed stream
+
+    Raises:
+        ValueError: If the format is unknown or not available
+    """
+    check_codec(codec)
+    if codec is None:
+        return open(path, 'wb')
+    if level is None:
+        level = DEFAULT_LEVELS[codec]
+    if codec == "gzip":
+        return gzip.open(path, 'wb', compresslevel=level)
+    if codec == "lzma":
+        return lzma.open(path, 'wb', preset=level)
+    if _zstd is not None:
+        return _zstd.open(path, 'wb', level=level)
+    return _zstandard.ZstdCompressor(level=level).stream_writer(open(path, 'wb'), closefd=True)
+
+
+def open_read(path: str) -> BinaryIO:
+    """
+    Open a file for reading, decompressing it if it was written compressed.
+
+    The format is detected from the file's leading bytes, so files written
+    with any codec (or none) can be read back.
+
+    Args:
+        path: The file to read
+
+    Returns:
+        A binary file object yielding the uncompressed contents
+
+    Raises:
+        ValueError: If the file is zstd-compressed but zstd is not available
+    """
+    with open(path, 'rb') as f:
+        head = f.read(8)
+    codec = next((name for name, magic in MAGIC_NUMBERS.items() if head.startswith(magic)), None)
+    check_codec(codec)
+    if codec is None:
+        return open(path, 'rb')
+    if codec == "gzip":
+        return gzip.open(path, 'rb')
+    if codec == "lzma":
+        return lzma.open(path, 'rb')
+    if _zstd is not None:
+        return _zstd.open(path, 'rb')
+    return _zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
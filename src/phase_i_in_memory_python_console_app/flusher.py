@@ -0,0 +1,105 @@
+import atexit
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class BackgroundFlusher:
+    """
+    Worker thread that coalesces many store changes into one save.
+
+    Each change only marks the store dirty. The worker saves once the
+    oldest unsaved change is interval_ms old, or as soon as max_pending
+    changes are waiting, whichever comes first, so at most that much work
+    can be lost on a crash. Pending changes are also saved by flush(),
+    close() and at interpreter exit.
+    """
+
+    def __init__(self, save: Callable[[], None], interval_ms: int = 200, max_pending: int = 100):
+        self._save = save
+        self.interval = interval_ms / 1000
+        self.max_pending = max_pending
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._first_pending_at = 0.0
+        self._closed = False
+        self.flush_count = 0
+        self.last_error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="task-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def mark_dirty(self):
+        """
+        Record one unsaved change.
+        """
+        with self._condition:
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            self._pending += 1
+            if self._pending == 1 or self._pending >= self.max_pending:
+                self._condition.notify()
+
+    def has_pending(self) -> bool:
+        """
+        Check whether there are changes that have not been saved yet.
+        """
+        with self._condition:
+            return self._pending > 0
+
+    def flush(self):
+        """
+        Save pending changes now, on the calling thread.
+        """
+        with self._condition:
+            if not self._pending:
+                return
+            self._pending = 0
+        self._run_save()
+
+    def close(self):
+        """
+        Save pending changes and stop the worker thread. Safe to call more than once.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Number of saves made and changes waiting to be saved.
+        """
+        with self._condition:
+            return {"flushes": self.flush_count, "pending": self._pending}
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                while not self._pending and not self._closed:
+                    condition.wait()
+                if self._closed:
+                    return
+                # Let more changes pile up until the deadline or the batch limit
+                deadline = self._first_pending_at + self.interval
+                while self._pending < self.max_pending and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    condition.wait(remaining)
+                if self._closed:
+                    return
+                self._pending = 0
+            self._run_save()
+
+    def _run_save(self):
+        try:
+            self._save()
+            self.flush_count += 1
+        except Exception as e:  # Keep the worker alive; the next change retries
+            self.last_error = e
@@ -0,0 +1,139 @@
+import sys
+from collections import deque
+from typing import Any, Deque, Optional, Tuple
+
+# An operation is a small tuple describing one change to the store:
+#   ("remove", task_id)                     delete a task (reverses an add)
+#   ("insert", task)                        re-insert a removed Task (reverses a delete)
+#   ("set", task_id, {field: value, ...})   assign fields (reverses an update/toggle)
+#   ("batch", (operation, ...))             apply several operations in order
+Operation = Tuple[Any, ...]
+
+
+def operation_size(operation: Operation) -> int:
+    """
+    Estimate the memory held by an operation, in bytes.
+
+    Args:
+        operation: The operation tuple
+
+    Returns:
+        The approximate size of the tuple and everything it references
+    """
+    size = sys.getsizeof(operation)
+    for item in operation:
+        if isinstance(item, dict):
+            size += sys.getsizeof(item) + sum(sys.getsizeof(value) for value in item.values())
+        elif isinstance(item, tuple):
+            size += sum(operation_size(child) for child in item)
+        elif hasattr(item, "__dict__"):
+            size += sys.getsizeof(item) + sum(sys.getsizeof(value) for value in vars(item).values())
+        else:
+            size += sys.getsizeof(item)
+    return size
+
+
+class OperationHistory:
+    """
+    Undo and redo stacks of compact inverse operations.
+
+    Each stack entry is the operation that reverses one user-visible change,
+    so history costs memory proportional to the changed fields rather than
+    to the size of the store. Both stacks share one memory budget; when it
+    is exceeded the oldest entries are discarded first.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._undo: Deque[Tuple[Operation, int]] = deque()
+        self._redo: Deque[Tuple[Operation, int]] = deque()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._undo) + len(self._redo)
+
+    @property
+    def bytes_used(self) -> int:
+        """Approximate memory held by both stacks, in bytes."""
+        return self._bytes
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def record(self, inverse: Operation):
+        """
+        Record the inverse of a new change. Any redo history is discarded.
+
+        Args:
+            inverse: The operation that reverses the change
+        """
+        while self._redo:
+            self._bytes -= self._redo.pop()[1]
+        self.push_undo(inverse)
+
+    def push_undo(self, inverse: Operation):
+        """
+        Push an entry onto the undo stack without touching redo history.
+
+        Args:
+            inverse: The operation that reverses the change
+        """
+        self._push(self._undo, inverse)
+
+    def push_redo(self, inverse: Operation):
+        """
+        Push an entry onto the redo stack.
+
+        Args:
+            inverse: The operation that re-applies an undone change
+        """
+        self._push(self._redo, inverse)
+
+    def pop_undo(self) -> Optional[Operation]:
+        """
+        Pop the most recent undo entry.
+
+        Returns:
+            The operation to apply, or None if there is nothing to undo
+        """
+        return self._pop(self._undo)
+
+    def pop_redo(self) -> Optional[Operation]:
+        """
+        Pop the most recent redo entry.
+
+        Returns:
+            The operation to apply, or None if there is nothing to redo
+        """
+        return self._pop(self._redo)
+
+    def clear(self):
+        """Discard all history."""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    def _push(self, stack: Deque[Tuple[Operation, int]], operation: Operation):
+        size = operation_size(operation)
+        stack.append((operation, size))
+        self._bytes += size
+        self._enforce_budget()
+
+    def _pop(self, stack: Deque[Tuple[Operation, int]]) -> Optional[Operation]:
+        if not stack:
+            return None
+        operation, size = stack.pop()
+        self._bytes -= size
+        return operation
+
+    def _enforce_budget(self):
+        while self._undo or self._redo:
+            if len(self) <= self.max_entries and self._bytes <= self.max_bytes:
+                return
+            # Drop the oldest undo entry first, then the most distant redo entry
+            stack = self._undo if self._undo else self._redo
+            self._bytes -= stack.popleft()[1]
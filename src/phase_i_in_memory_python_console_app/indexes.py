@@ -0,0 +1,263 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+from .models import Task
+
+
+class SortedIndex:
+    """
+    Secondary index that keeps task IDs ordered by a key function.
+
+    Entries are (key, task_id) tuples held in a bisect-maintained list, so
+    each mutation costs O(log N) to locate plus a memmove, and ordered
+    iteration never needs to sort the whole store. Tasks whose key is None
+    are left out, which makes partial indexes (e.g. over due dates) cheap.
+    """
+
+    def __init__(self, key: Callable[[Task], Any]):
+        self._key = key
+        self._entries: List[Tuple[Any, int]] = []
+        self._keys: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._keys
+
+    def rebuild(self, tasks: Iterable[Task]):
+        """
+        Rebuild the index from scratch.
+
+        Args:
+            tasks: All tasks that should be indexed
+        """
+        self._keys = {}
+        self._entries = []
+        self.add_many(tasks)
+
+    def add_many(self, tasks: Iterable[Task], sort: bool = True):
+        """
+        Index a batch of tasks that are not yet in the index, sorting once.
+
+        Args:
+            tasks: The tasks to index
+            sort: Restore the order afterwards (default True). Pass False
+                when more batches follow, and call sort() after the last
+                one, so a bulk load is sorted once rather than per batch
+        """
+        tasks = list(tasks)
+        task_keys = list(map(self._key, tasks))
+        added = zip(task_keys, [task.id for task in tasks])
+        if None in task_keys:
+            added = [(key, task_id) for key, task_id in added if key is not None]
+        else:
+            added = list(added)
+        self._entries.extend(added)
+        self._keys.update((task_id, key) for key, task_id in added)
+        if sort:
+            self._entries.sort()
+
+    def sort(self):
+        """
+        Restore the order after batches were added with sort=False.
+        """
+        self._entries.sort()
+
+    def add(self, task: Task):
+        """
+        Index a task that is not yet in the index.
+
+        Args:
+            task: The task to index
+        """
+        key = self._key(task)
+        if key is None:
+            return
+        self._keys[task.id] = key
+        insort(self._entries, (key, task.id))
+
+    def remove(self, task_id: int):
+        """
+        Remove a task from the index if it is present.
+
+        Args:
+            task_id: The ID of the task to remove
+        """
+        if task_id not in self._keys:
+            return
+        entry = (self._keys.pop(task_id), task_id)
+        del self._entries[bisect_left(self._entries, entry)]
+
+    def update(self, task: Task):
+        """
+        Reposition a task whose fields have changed.
+
+        Args:
+            task: The mutated task
+        """
+        key = self._key(task)
+        if key is not None and self._keys.get(task.id) == key:
+            return
+        self.remove(task.id)
+        self.add(task)
+
+    def iter_ids(self, start_after_id: Optional[int] = None) -> Iterator[int]:
+        """
+        Stream task IDs in index order.
+
+        Like TaskStorage.iter_tasks, the position is re-resolved from the
+        last visited entry on every step so the index may change while a
+        caller is iterating.
+
+        Args:
+            start_after_id: Only yield IDs positioned after this task (optional)
+
+        Returns:
+            An iterator of task IDs in index order
+
+        Raises:
+            ValueError: If start_after_id is not in the index
+        """
+        if start_after_id is None:
+            return self._iter_from(0)
+        if start_after_id not in self._keys:
+            raise ValueError(f"Unknown cursor: task {start_after_id} is not in the index")
+        return self._iter_from(bisect_right(self._entries, (self._keys[start_after_id], start_after_id)))
+
+    def _iter_from(self, index: int) -> Iterator[int]:
+        entries = self._entries
+        while index < len(entries):
+            entry = entries[index]
+            yield entry[1]
+            index = bisect_right(entries, entry)
+
+    def range_ids(self, low: Any = None, high: Any = None) -> Iterator[int]:
+        """
+        Stream the IDs of tasks whose key lies in [low, high), in key order.
+
+        Args:
+            low: Inclusive lower bound (optional, unbounded if omitted)
+            high: Exclusive upper bound (optional, unbounded if omitted)
+
+        Returns:
+            An iterator of task IDs
+        """
+        entries = self._entries
+        start = 0 if low is None else bisect_left(entries, (low,))
+        end = len(entries) if high is None else bisect_left(entries, (high,))
+        return (entries[i][1] for i in range(start, end))
+
+
+_EMPTY: FrozenSet[int] = frozenset()
+
+
+class HashIndex:
+    """
+    Secondary index from values to the set of task IDs that have them.
+
+    The key function returns all values of a task (e.g. its tags, or a
+    one-element tuple with its project), so lookups and set intersections
+    never need to scan the store.
+    """
+
+    def __init__(self, values: Callable[[Task], Iterable[Hashable]]):
+        self._values = values
+        self._ids_by_value: Dict[Hashable, Set[int]] = {}
+        self._task_values: Dict[int, Tuple[Hashable, ...]] = {}
+
+    def rebuild(self, tasks: Iterable[Task]):
+        """
+        Rebuild the index from scratch.
+
+        Args:
+            tasks: All tasks that should be indexed
+        """
+        self._ids_by_value = {}
+        self._task_values = {}
+        self.add_many(tasks)
+
+    def add_many(self, tasks: Iterable[Task]):
+        """
+        Index a batch of tasks that are not yet in the index.
+
+        Args:
+            tasks: The tasks to index
+        """
+        values_of = self._values
+        ids_by_value = self._ids_by_value
+        task_values = self._task_values
+        for task in tasks:
+            values = tuple(values_of(task))
+            if None in values:
+                values = tuple(value for value in values if value is not None)
+            if not values:
+                continue
+            task_values[task.id] = values
+            for value in values:
+                ids = ids_by_value.get(value)
+                if ids is None:
+                    ids_by_value[value] = {task.id}
+                else:
+                    ids.add(task.id)
+
+    def add(self, task: Task):
+        """
+        Index a task that is not yet in the index.
+
+        Args:
+            task: The task to index
+        """
+        values = tuple(value for value in self._values(task) if value is not None)
+        if not values:
+            return
+        self._task_values[task.id] = values
+        for value in values:
+            self._ids_by_value.setdefault(value, set()).add(task.id)
+
+    def remove(self, task_id: int):
+        """
+        Remove a task from the index if it is present.
+
+        Args:
+            task_id: The ID of the task to remove
+        """
+        for value in self._task_values.pop(task_id, ()):
+            ids = self._ids_by_value[value]
+            ids.discard(task_id)
+            if not ids:
+                del self._ids_by_value[value]
+
+    def update(self, task: Task):
+        """
+        Re-index a task whose fields have changed.
+
+        Args:
+            task: The mutated task
+        """
+        values = tuple(value for value in self._values(task) if value is not None)
+        if self._task_values.get(task.id, ()) == values:
+            return
+        self.remove(task.id)
+        self.add(task)
+
+    def get(self, value: Hashable) -> Set[int]:
+        """
+        Get the IDs of tasks that have a value.
+
+        Args:
+            value: The value to look up
+
+        Returns:
+            The set of matching task IDs; it must not be modified by the caller
+        """
+        return self._ids_by_value.get(value, _EMPTY)
+
+    def values(self) -> List[Hashable]:
+        """
+        Get every distinct indexed value.
+
+        Returns:
+            A list of values
+        """
+        return list(self._ids_by_value)
+
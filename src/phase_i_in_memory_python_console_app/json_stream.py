@@ -0,0 +1,175 @@
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+CHUNK_BYTES = 1 << 20  # Bytes read from the file at a time
+_BOUNDARY_SEARCH_CHARS = 1 << 16  # Tail of the window searched for the last member boundary
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# A comma followed by a member with a numeric key and an object value. A
+# quote after a comma and whitespace cannot be escaped, so outside of
+# strings this is always a boundary between two members; a match inside a
+# string is caught because the text before it then fails to decode
+_MEMBER_BOUNDARY = re.compile(r',[ \t\n\r]*"\d+"[ \t\n\r]*:[ \t\n\r]*\{')
+
+
+class _TextStream:
+    """
+    A window of decoded text over a binary file, refilled as it is consumed.
+    """
+
+    def __init__(self, f: BinaryIO, digest: Any = None, chunk_bytes: int = CHUNK_BYTES):
+        self._f = f
+        self._digest = digest
+        self._chunk_bytes = chunk_bytes
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Append the next chunk of the file, dropping the text already consumed.
+
+        Returns:
+            False if the end of the file was already reached
+        """
+        if self.eof:
+            return False
+        raw = self._f.read(self._chunk_bytes)
+        if self._digest is not None:
+            self._digest.update(raw)
+        self.eof = not raw
+        self.text = self.text[self.pos:] + self._decoder.decode(raw, final=self.eof)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character, or "" at the end of the file.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, *chars: str) -> str:
+        """
+        Consume the next character, which must be one of chars.
+        """
+        char = self.peek()
+        if char not in chars or not char:
+            found = repr(char) if char else "the end of the file"
+            raise json.JSONDecodeError(f"Expecting {' or '.join(map(repr, chars))}, found {found}",
+                                       self.text, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """
+        Decode the next JSON value, reading more of the file until it is complete.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+                # A number at the very end of the window may continue in the next chunk
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    def members(self) -> Optional[Dict[str, Any]]:
+        """
+        Decode every complete member left in the window with one decoder call.
+
+        The window is cut at its last member boundary and the text before
+        it is decoded as one object, which is much cheaper than decoding
+        its keys and values one at a time. The stream is left at the comma
+        that follows the decoded members.
+
+        Returns:
+            The decoded members, or None if the window holds no boundary or
+            the text before it does not decode; decode one member with
+            value() instead then
+        """
+        text = self.text
+        start = max(self.pos, len(text) - _BOUNDARY_SEARCH_CHARS)
+        cut = -1
+        for match in _MEMBER_BOUNDARY.finditer(text, start):
+            cut = match.start()
+        if cut < 0:
+            return None
+        try:
+            members = json.loads("{" + text[self.pos:cut] + "}")
+        except json.JSONDecodeError:
+            return None
+        self.pos = cut
+        return members
+
+
+def iter_members(f: BinaryIO, nested: str, digest: Any = None,
+                 chunk_bytes: int = CHUNK_BYTES) -> Iterator[Tuple[Optional[str], str, Any]]:
+    """
+    Decode a JSON object from a binary file without reading it whole.
+
+    The members of the top-level object are yielded as they are decoded,
+    and the members of its nested object are decoded a window of the file
+    at a time and yielded one by one, so only the members of one window
+    are held in memory at a time.
+
+    Args:
+        f: The file, positioned at the start of the document
+        nested: Key of the top-level member whose object is streamed
+        digest: hashlib object updated with every byte read (optional)
+        chunk_bytes: Bytes read from the file at a time
+
+    Yields:
+        (None, key, value) for top-level members, and (nested, key, value)
+        for the members of the nested object; nothing for a blank file
+
+    Raises:
+        json.JSONDecodeError: If the file is not a JSON object, or the
+            nested member is not an object
+    """
+    stream = _TextStream(f, digest, chunk_bytes)
+    if not stream.peek():
+        return
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.pos += 1
+    else:
+        while True:
+            key = stream.value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting a property name", stream.text, stream.pos)
+            stream.expect(":")
+            if key == nested:
+                stream.expect("{")
+                if stream.peek() == "}":
+                    stream.pos += 1
+                else:
+                    while True:
+                        members = stream.members()
+                        if members is not None:
+                            for member, value in members.items():
+                                yield nested, member, value
+                        else:
+                            member = stream.value()
+                            stream.expect(":")
+                            yield nested, member, stream.value()
+                        if stream.expect(",", "}") == "}":
+                            break
+            else:
+                yield None, key, stream.value()
+            if stream.expect(",", "}") == "}":
+                break
+    if stream.peek():
+        raise json.JSONDecodeError("Extra data", stream.text, stream.pos)
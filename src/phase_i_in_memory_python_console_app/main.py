@@ -3,16 +3,209 @@
 Main entry point for the Todo Console Application.
 """
 
-from .cli import TodoCLI
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Optional
 
+READ_ONLY_COMMANDS = ("backup", "export")  # Commands that never change the store
 
-def main():
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser. Without a subcommand the interactive app starts.
+    """
+    from .validation import PRIORITIES
+    from .export import EXPORT_FORMATS
+    from .storage import ORDERINGS
+
+    parser = argparse.ArgumentParser(prog="phase1-app", description="Todo Console App")
+    parser.add_argument("--file", default="tasks.json", help="Task store file (default: tasks.json)")
+    parser.add_argument("--compression", choices=["gzip", "lzma", "zstd"],
+                        help="Write the task store compressed (reading detects the format)")
+    parser.add_argument("--compression-level", type=int, help="Compression level (default: the format's default)")
+    parser.add_argument("--flush-ms", type=int, default=200,
+                        help="Save changes in the background at most this often; 0 saves after every change (default: 200)")
+    parser.add_argument("--audit-dir", help="Audit log directory (default: the store file name + .audit)")
+    parser.add_argument("--no-audit", action="store_true", help="Do not record changes in the audit log")
+    parser.add_argument("--tenant", help="Use this tenant's task list instead of --file")
+    parser.add_argument("--tenant-dir", default="tenants", help="Tenant shard directory (default: tenants)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    backup_parser = subparsers.add_parser("backup", help="Take an incremental, deduplicated backup")
+    backup_parser.add_argument("--backup-dir", default="backups", help="Backup directory (default: backups)")
+
+    restore_parser = subparsers.add_parser("restore", help="Restore the store from a backup")
+    restore_parser.add_argument("--backup-dir", default="backups", help="Backup directory (default: backups)")
+    restore_parser.add_argument("--id", dest="backup_id", help="ID of the backup to restore")
+    restore_parser.add_argument("--at", help="Restore the store as it was at this ISO time, e.g. 2026-01-31T09:00")
+    restore_parser.add_argument("--list", action="store_true", help="List available backups instead of restoring")
+
+    export_parser = subparsers.add_parser("export", help="Export tasks as CSV, Markdown, HTML or JSON lines")
+    export_parser.add_argument("--format", required=True, choices=EXPORT_FORMATS,
+                               help="Output format")
+    export_parser.add_argument("--output", "-o", default="-", help="File to write (default: standard output)")
+    export_parser.add_argument("--order-by", default="id",
+                               choices=["id"] + sorted(ORDERINGS),
+                               help="Order to export tasks in (default: id)")
+    export_parser.add_argument("--project", help="Only tasks in this project")
+    export_parser.add_argument("--tag", action="append", dest="tags", help="Only tasks with this tag (repeatable)")
+    export_parser.add_argument("--priority", choices=PRIORITIES, help="Only tasks with this priority")
+    export_parser.add_argument("--due-before", help="Only tasks due on or before this YYYY-MM-DD date")
+    export_parser.add_argument("--due-after", help="Only tasks due on or after this YYYY-MM-DD date")
+    export_parser.add_argument("--overdue", action="store_true", help="Only pending tasks past their due date")
+    status = export_parser.add_mutually_exclusive_group()
+    status.add_argument("--completed", action="store_const", const=True, dest="completed",
+                        help="Only completed tasks")
+    status.add_argument("--pending", action="store_const", const=False, dest="completed",
+                        help="Only pending tasks")
+
+    return parser
+
+
+def audit_dir(args: argparse.Namespace) -> Optional[str]:
+    """
+    The audit log directory selected by the command line options, or None.
+
+    Read-only commands get None, so they do not create a log directory.
+    """
+    from .audit import AUDIT_SUFFIX
+
+    if args.no_audit or args.command in READ_ONLY_COMMANDS:
+        return None
+    return args.audit_dir or args.file + AUDIT_SUFFIX
+
+
+def open_storage(args: argparse.Namespace, load: bool = True):
+    """
+    Open the task store selected by the command line options.
+
+    Args:
+        args: The parsed command line
+        load: Whether to load the file; see TaskStorage (default True)
+    """
+    from .storage import TaskStorage
+
+    try:
+        return TaskStorage(args.file, compression=args.compression,
+                           compression_level=args.compression_level, audit_dir=audit_dir(args),
+                           load=load)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+
+
+def run_backup(args: argparse.Namespace):
+    """
+    Back up the store and compare the cost with a plain full copy of the file.
+    """
+    from .backup import BackupStore
+
+    report = BackupStore(args.backup_dir).backup(open_storage(args))
+
+    full_copy_bytes = os.path.getsize(args.file) if os.path.exists(args.file) else 0
+    full_copy_elapsed = 0.0
+    if full_copy_bytes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            start = time.perf_counter()
+            shutil.copyfile(args.file, os.path.join(tmp_dir, "copy"))
+            full_copy_elapsed = time.perf_counter() - start
+
+    print(f"Backup {report.backup_id}: {report.task_count} tasks in {report.chunk_count} chunks "
+          f"({report.new_chunk_count} new)")
+    print(f"  Written:   {report.stored_bytes:,} bytes in {report.elapsed * 1000:.1f} ms "
+          f"({report.throughput / 1e6:.1f} MB/s logical)")
+    print(f"  Full copy: {full_copy_bytes:,} bytes in {full_copy_elapsed * 1000:.1f} ms")
+    if full_copy_bytes:
+        print(f"  Saved:     {(1 - report.stored_bytes / full_copy_bytes) * 100:.1f}% of a full copy")
+
+
+def run_restore(args: argparse.Namespace):
+    """
+    List backups, or restore the store from the chosen backup.
+    """
+    from .backup import BackupStore
+
+    backups = BackupStore(args.backup_dir)
+    if args.list:
+        for backup in backups.list_backups():
+            created = datetime.fromtimestamp(backup["created_at"]).isoformat(timespec="seconds")
+            print(f"{backup['id']}  {created}  {backup['task_count']} tasks")
+        return
+
+    try:
+        at = datetime.fromisoformat(args.at).timestamp() if args.at else None
+    except ValueError:
+        raise SystemExit(f"Error: Invalid time '{args.at}', expected ISO format, e.g. 2026-01-31T09:00")
+    try:
+        # The file is not loaded, so a corrupt or newer-schema store can be replaced
+        backup_id = backups.restore(open_storage(args, load=False), backup_id=args.backup_id, at=at)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+    print(f"Restored {args.file} from backup {backup_id}")
+
+
+def run_export(args: argparse.Namespace):
+    """
+    Stream the selected tasks to a file or standard output, reporting throughput on stderr.
+    """
+    from .export import export_tasks
+    from .storage import task_filter
+
+    storage = open_storage(args)
+    try:
+        matches = task_filter(args.project, args.tags, args.priority, args.due_before,
+                              args.due_after, args.overdue, args.completed)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+
+    start = time.perf_counter()
+    if args.output == "-":
+        count = export_tasks(storage, sys.stdout, args.format, args.order_by, matches)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            count = export_tasks(storage, f, args.format, args.order_by, matches)
+    elapsed = time.perf_counter() - start
+
+    destination = "standard output" if args.output == "-" else args.output
+    rate = f" ({count / elapsed:,.0f} tasks/s)" if elapsed > 0 else ""
+    print(f"Exported {count} tasks to {destination} in {elapsed * 1000:.1f} ms{rate}", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
     """
     Main function to start the Todo Console Application.
     """
-    app = TodoCLI("tasks.json")
-    app.run()
+    args = build_parser().parse_args(argv)
+    if args.tenant:
+        from .tenants import TenantStore
+
+        try:
+            args.file = TenantStore(args.tenant_dir).get_filename(args.tenant)
+        except ValueError as e:
+            raise SystemExit(f"Error: {e}")
+        os.makedirs(args.tenant_dir, exist_ok=True)
+
+    if args.command == "backup":
+        run_backup(args)
+    elif args.command == "restore":
+        run_restore(args)
+    elif args.command == "export":
+        run_export(args)
+    else:
+        from .cli import TodoCLI
+
+        try:
+            app = TodoCLI(args.file, flush_interval_ms=args.flush_ms or None,
+                          compression=args.compression, compression_level=args.compression_level,
+                          audit_dir=audit_dir(args))
+        except ValueError as e:
+            raise SystemExit(f"Error: {e}")
+        app.run()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
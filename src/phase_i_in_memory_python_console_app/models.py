@@ -1,28 +1,66 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, List, Optional
+from .validation import FIELD_VALIDATORS
 
 
 @dataclass
 class Task:
     """
-    Represents a todo task with id, title, description, and completion status.
+    Represents a todo task with id, title, description, and completion status,
+    plus optional tags, project, priority, due date and the IDs of the tasks
+    that must be completed before it (blocked_by).
+
+    Fields are validated whenever they are assigned, both at construction
+    and on later updates. Tag lists should be replaced, not mutated in place.
     """
     id: int
     title: str
     description: Optional[str] = None
     completed: bool = False
+    updated_at: Optional[float] = None  # Unix timestamp of the last change
+    tags: List[str] = field(default_factory=list)
+    project: Optional[str] = None
+    priority: str = "medium"
+    due_date: Optional[date] = None
+    blocked_by: List[int] = field(default_factory=list)
 
-    def __post_init__(self):
+    def is_overdue(self, today: Optional[date] = None) -> bool:
         """
-        Validate the task attributes after initialization.
+        Check whether the task is pending and past its due date.
         """
-        # Validate title length (1-200 characters)
-        if not (1 <= len(self.title) <= 200):
-            raise ValueError("Title must be between 1 and 200 characters")
-        
-        # Validate description length (max 1000 characters)
-        if self.description and len(self.description) > 1000:
-            raise ValueError("Description must be at most 1000 characters")
+        if self.completed or self.due_date is None:
+            return False
+        return self.due_date < (today or date.today())
+
+    def __setattr__(self, name: str, value: Any):
+        """
+        Validate constrained fields before they are assigned.
+        """
+        validator = FIELD_VALIDATORS.get(name)
+        if validator is not None:
+            validator(value)
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_trusted(cls, id: int, title: str, description: Optional[str] = None,
+                     completed: bool = False, updated_at: Optional[float] = None,
+                     tags: Optional[List[str]] = None, project: Optional[str] = None,
+                     priority: str = "medium", due_date: Optional[date] = None,
+                     blocked_by: Optional[List[int]] = None) -> "Task":
+        """
+        Build a task from data that has already been validated.
+
+        Skips all field validation, so it must only be used for records read
+        back from a checksummed snapshot or checked with validate_columns.
+        """
+        task = object.__new__(cls)
+        task.__dict__.update(id=id, title=title, description=description,
+                             completed=completed, updated_at=updated_at,
+                             tags=tags if tags is not None else [], project=project,
+                             priority=priority, due_date=due_date,
+                             blocked_by=blocked_by if blocked_by is not None else [])
+        return task
 
     def __str__(self) -> str:
         """
@@ -30,4 +68,29 @@ class Task:
         """
         status = "✓" if self.completed else "○"
         desc = f" - {self.description}" if self.description else ""
-        return f"[{status}] {self.id}: {self.title}{desc}"
\ No newline at end of file
+        return f"[{status}] {self.id}: {self.title}{desc}"
+
+
+class FrozenTask(Task):
+    """
+    Read-only copy of a task, as held by storage snapshots. Its tags and
+    blockers are tuples, and assigning any field raises AttributeError.
+    """
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"Cannot set {name}: snapshot tasks are read-only")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"Cannot delete {name}: snapshot tasks are read-only")
+
+    @classmethod
+    def freeze(cls, task: Task) -> "FrozenTask":
+        """
+        Copy a task's current field values into a read-only task.
+        """
+        frozen = object.__new__(cls)
+        fields = frozen.__dict__
+        fields.update(task.__dict__)
+        fields["tags"] = tuple(task.tags)
+        fields["blocked_by"] = tuple(task.blocked_by)
+        return frozen
@@ -0,0 +1,152 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+BITS = 5  # Key bits consumed per trie level
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+Node = Tuple[Any, ...]
+_EMPTY: Node = (None,) * WIDTH
+
+
+def _replace(node: Node, index: int, value: Any) -> Node:
+    return node[:index] + (value,) + node[index + 1:]
+
+
+class PersistentMap:
+    """
+    Immutable map from non-negative integer keys to values, as a 32-way
+    radix trie over the key bits.
+
+    set() and remove() return a new map and leave this one unchanged. They
+    copy only the nodes on the path to the key (one node per five key bits:
+    four for a million keys) and share every other node with the old map,
+    so keeping any number of versions costs only the changed paths. Since
+    nothing is ever modified in place, a version can be read from any
+    thread without locking. Keys iterate in ascending order.
+
+    Values must not be None.
+    """
+
+    __slots__ = ("_root", "_shift", "_count")
+
+    def __init__(self, root: Node = _EMPTY, shift: int = 0, count: int = 0):
+        self._root = root
+        self._shift = shift  # Key bits below the root level
+        self._count = count
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[int, Any]]) -> "PersistentMap":
+        """
+        Build a map from (key, value) pairs bottom-up, in one pass and
+        without copying any path more than once.
+        """
+        leaves: Dict[int, List[Any]] = {}
+        count = 0
+        for key, value in items:
+            leaf = leaves.get(key >> BITS)
+            if leaf is None:
+                leaf = leaves[key >> BITS] = [None] * WIDTH
+            if leaf[key & MASK] is None:
+                count += 1
+            leaf[key & MASK] = value
+
+        nodes = {index: tuple(leaf) for index, leaf in leaves.items()}
+        shift = 0
+        while len(nodes) > 1 or any(nodes):  # Until a single node sits at index 0
+            parents: Dict[int, List[Any]] = {}
+            for index, node in nodes.items():
+                parent = parents.get(index >> BITS)
+                if parent is None:
+                    parent = parents[index >> BITS] = [None] * WIDTH
+                parent[index & MASK] = node
+            nodes = {index: tuple(parent) for index, parent in parents.items()}
+            shift += BITS
+        return cls(nodes.get(0, _EMPTY), shift, count)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: int) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return (key for key, _ in self.items())
+
+    def get(self, key: int, default: Any = None) -> Any:
+        """
+        Get the value for a key, or the default if the key is absent.
+        """
+        if key < 0 or key >> (self._shift + BITS):
+            return default
+        node = self._root
+        shift = self._shift
+        while shift:
+            node = node[(key >> shift) & MASK]
+            if node is None:
+                return default
+            shift -= BITS
+        value = node[key & MASK]
+        return default if value is None else value
+
+    def set(self, key: int, value: Any) -> "PersistentMap":
+        """
+        Return a map with the key set to the value.
+
+        Raises:
+            ValueError: If the key is negative or the value is None
+        """
+        if key < 0 or value is None:
+            raise ValueError("Keys must not be negative and values must not be None")
+        root, shift = self._root, self._shift
+        while key >> (shift + BITS):  # Add levels on top until the key fits
+            root = _replace(_EMPTY, 0, root if self._count else None)
+            shift += BITS
+        root, added = self._set(root, shift, key, value)
+        return PersistentMap(root, shift, self._count + added)
+
+    @staticmethod
+    def _set(node: Optional[Node], shift: int, key: int, value: Any) -> Tuple[Node, bool]:
+        node = node or _EMPTY
+        index = (key >> shift) & MASK
+        if not shift:
+            return _replace(node, index, value), node[index] is None
+        child, added = PersistentMap._set(node[index], shift - BITS, key, value)
+        return _replace(node, index, child), added
+
+    def remove(self, key: int) -> "PersistentMap":
+        """
+        Return a map without the key (this map itself if the key is absent).
+        """
+        if self.get(key) is None:
+            return self
+        root = self._remove(self._root, self._shift, key)
+        return PersistentMap(root or _EMPTY, self._shift, self._count - 1)
+
+    @staticmethod
+    def _remove(node: Node, shift: int, key: int) -> Optional[Node]:
+        index = (key >> shift) & MASK
+        child = PersistentMap._remove(node[index], shift - BITS, key) if shift else None
+        node = _replace(node, index, child)
+        return None if node == _EMPTY else node  # Drop emptied nodes
+
+    def items(self) -> Iterator[Tuple[int, Any]]:
+        """
+        Iterate over (key, value) pairs in ascending key order.
+        """
+        return self._walk(self._root, self._shift, 0)
+
+    def values(self) -> Iterator[Any]:
+        """
+        Iterate over the values in ascending key order.
+        """
+        return (value for _, value in self.items())
+
+    def _walk(self, node: Node, shift: int, base: int) -> Iterator[Tuple[int, Any]]:
+        if not shift:
+            for index, value in enumerate(node):
+                if value is not None:
+                    yield base | index, value
+            return
+        for index, child in enumerate(node):
+            if child is not None:
+                yield from self._walk(child, shift - BITS, base | (index << shift))
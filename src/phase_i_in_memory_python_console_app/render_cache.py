@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+from rich.console import Console, RenderableType
+from .models import Task
+from .storage import TaskStorage
+
+
+class RenderCache:
+    """
+    Pre-rendered ANSI output for tasks, keyed by task ID and version.
+
+    Rendering a task through rich parses markup and lays out segments every
+    time. The cache keeps the final ANSI string instead, so revisiting a
+    list re-emits it directly. Entries are dropped when the store reports a
+    change to their task, and a (task ID, version) mismatch is treated as a
+    miss as well, so stale output is never shown. Renderings depend on the
+    date too, since overdue tasks are styled differently, so the whole
+    cache is dropped when the date changes.
+    """
+
+    def __init__(self, console: Console, storage: TaskStorage, max_tasks: int = 10000):
+        self._console = console
+        self._storage = storage
+        self.max_tasks = max_tasks
+        # Task ID -> {kind: (version, console width, ANSI text)}, least recently used first
+        self._entries: "OrderedDict[int, Dict[str, Tuple[int, int, str]]]" = OrderedDict()
+        self._day = date.today()  # Date the cached renderings were made on
+        self.hits = 0
+        self.misses = 0
+        storage.add_listener(self._on_change)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(self, task: Task, kind: str, renderer: Callable[[Task], RenderableType]) -> str:
+        """
+        Get the rendered output of a task, rendering it only on a cache miss.
+
+        Args:
+            task: The task to render
+            kind: Name of the rendering, e.g. "panel" or "row", so one task
+                can have several cached renderings
+            renderer: Builds the rich renderable for the task
+
+        Returns:
+            The rendered text, including ANSI styling and a trailing newline
+        """
+        today = date.today()
+        if today != self._day:
+            self._entries.clear()
+            self._day = today
+        version = self._storage.get_task_version(task.id)
+        width = self._console.width
+        renderings = self._entries.get(task.id)
+        if renderings is None:
+            renderings = self._entries[task.id] = {}
+            if len(self._entries) > self.max_tasks:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(task.id)
+
+        entry = renderings.get(kind)
+        if entry is not None and entry[0] == version and entry[1] == width:
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        with self._console.capture() as capture:
+            self._console.print(renderer(task))
+        text = capture.get()
+        renderings[kind] = (version, width, text)
+        return text
+
+    def print(self, task: Task, kind: str, renderer: Callable[[Task], RenderableType]):
+        """
+        Write the rendered output of a task straight to the console's file.
+
+        Args:
+            task: The task to render
+            kind: Name of the rendering
+            renderer: Builds the rich renderable for the task
+        """
+        self._console.file.write(self.render(task, kind, renderer))
+
+    def invalidate(self, task_id: Optional[int] = None):
+        """
+        Drop cached output for one task, or for all tasks.
+
+        Args:
+            task_id: The task to drop (optional, all tasks if omitted)
+        """
+        if task_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(task_id, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Cache size and hit/miss counters.
+        """
+        return {"tasks": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _on_change(self, event: str, task: Optional[Task], changes: Dict[str, Any]):
+        self.invalidate(None if task is None else task.id)
@@ -0,0 +1,295 @@
+import atexit
+import json
+import struct
+import time
+from bisect import bisect_left
+from datetime import date
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, List, Optional, Union
+from .models import Task
+from .storage import TaskStorage, task_filter
+
+# Snapshot segment: header, sorted task IDs, record offsets, then one JSON record per task
+SNAPSHOT_HEADER = struct.Struct("<8sQQQ")  # magic, version, task count, next ID
+SNAPSHOT_MAGIC = b"TODOSNAP"
+# Control segment: a seqlock sequence (odd while the writer is switching) and the live version
+CONTROL = struct.Struct("<QQ")
+SEQUENCE = struct.Struct("<Q")  # At offset 0 of the control segment
+VERSION = struct.Struct("<Q")  # At offset SEQUENCE.size
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _snapshot_name(name: str, version: int) -> str:
+    return f"{name}-v{version}"
+
+
+class ReplicaPublisher:
+    """
+    Publishes immutable, versioned snapshots of a store into shared memory.
+
+    Each publish() writes the whole task table into a new shared memory
+    segment: a sorted ID array, an offset array and compact JSON records.
+    The live version is then switched in a small control segment guarded
+    by a seqlock, and the previous segment is unlinked. Processes that
+    still map an old segment keep reading it until they switch over.
+    """
+
+    def __init__(self, storage: TaskStorage, name: str = "todo-replica"):
+        self.storage = storage
+        self.name = name
+        try:
+            self._control = shared_memory.SharedMemory(name=f"{name}-control", create=True,
+                                                       size=CONTROL.size, track=False)
+            CONTROL.pack_into(self._control.buf, 0, 0, 0)
+        except FileExistsError:
+            # Left over from an earlier writer; carry on from its last version
+            self._control = shared_memory.SharedMemory(name=f"{name}-control", track=False)
+        self.version = CONTROL.unpack_from(self._control.buf, 0)[1]
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        atexit.register(self.close)
+
+    def publish(self) -> int:
+        """
+        Publish the current contents of the store as a new version.
+
+        Returns:
+            The version number readers will switch to
+        """
+        ids = []
+        offsets = [0]
+        records = []
+        snapshot, next_id = self.storage.get_records()
+        for record in snapshot:
+            encoded = _ENCODER.encode(record).encode('utf-8')
+            ids.append(record["id"])
+            records.append(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+
+        version = self.version + 1
+        count = len(ids)
+        index_bytes = SNAPSHOT_HEADER.size + 8 * count + 8 * (count + 1)
+        segment = shared_memory.SharedMemory(name=_snapshot_name(self.name, version), create=True,
+                                             size=max(1, index_bytes + offsets[-1]), track=False)
+        buf = segment.buf
+        SNAPSHOT_HEADER.pack_into(buf, 0, SNAPSHOT_MAGIC, version, count, next_id)
+        struct.pack_into(f"<{count}q", buf, SNAPSHOT_HEADER.size, *ids)
+        struct.pack_into(f"<{count + 1}q", buf, SNAPSHOT_HEADER.size + 8 * count, *offsets)
+        buf[index_bytes:index_bytes + offsets[-1]] = b"".join(records)
+
+        # Seqlock: the sequence is odd while the version is being written and
+        # is bumped again once it is complete, so a reader that saw the same
+        # even sequence before and after reading the version read it whole
+        control = self._control.buf
+        sequence = SEQUENCE.unpack_from(control, 0)[0]
+        SEQUENCE.pack_into(control, 0, sequence + 1)
+        VERSION.pack_into(control, SEQUENCE.size, version)
+        SEQUENCE.pack_into(control, 0, sequence + 2)
+
+        self._release_segment()
+        self._segment = segment
+        self.version = version
+        return version
+
+    def _release_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+
+    def close(self):
+        """
+        Withdraw the published snapshot and remove the shared memory segments.
+        """
+        if self._control is None:
+            return
+        self._release_segment()
+        self._control.close()
+        self._control.unlink()
+        self._control = None
+        atexit.unregister(self.close)
+
+
+class _Snapshot:
+    """
+    One mapped snapshot segment, read in place. Unmapped when closed or
+    no longer referenced.
+    """
+
+    def __init__(self, segment: shared_memory.SharedMemory):
+        self.segment = segment
+        self.ids = self.offsets = None
+        magic, self.version, self.count, self.next_id = SNAPSHOT_HEADER.unpack_from(segment.buf, 0)
+        if magic != SNAPSHOT_MAGIC:
+            segment.close()
+            raise ValueError(f"Shared memory segment {segment.name} is not a task snapshot")
+        ids_start = SNAPSHOT_HEADER.size
+        offsets_start = ids_start + 8 * self.count
+        self.records_start = offsets_start + 8 * (self.count + 1)
+        self.ids = segment.buf[ids_start:offsets_start].cast('q')
+        self.offsets = segment.buf[offsets_start:self.records_start].cast('q')
+
+    def read(self, index: int) -> Task:
+        start = self.records_start + self.offsets[index]
+        end = self.records_start + self.offsets[index + 1]
+        return TaskStorage._task_from_record(json.loads(bytes(self.segment.buf[start:end])),
+                                             trusted=True)
+
+    def find(self, task_id: int) -> Optional[int]:
+        index = bisect_left(self.ids, task_id)
+        if index < self.count and self.ids[index] == task_id:
+            return index
+        return None
+
+    def close(self):
+        if self.ids is None:
+            return
+        self.ids.release()
+        self.offsets.release()
+        self.ids = self.offsets = None
+        self.segment.close()
+
+    __del__ = close
+
+
+class ReplicaReader:
+    """
+    Read-only view of the snapshot published by a ReplicaPublisher.
+
+    The snapshot is mapped rather than copied, so any number of reader
+    processes share one copy of the task table. Lookups binary-search the
+    ID array and decode only the records they return. Every read first
+    checks the control segment and, if a newer version was published,
+    switches to it before answering, so a read never mixes two versions.
+    """
+
+    def __init__(self, name: str = "todo-replica", timeout: float = 5.0):
+        self.name = name
+        self.timeout = timeout
+        self._control = shared_memory.SharedMemory(name=f"{name}-control", track=False)
+        self._snapshot: Optional[_Snapshot] = None
+        self.refresh()
+
+    def refresh(self) -> int:
+        """
+        Switch to the latest published version if it is newer than the mapped one.
+
+        Returns:
+            The version now being served (0 if nothing was published yet)
+
+        Raises:
+            TimeoutError: If no consistent version could be mapped within the timeout
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            version = self._read_version()
+            if version is not None:
+                if version == 0 or (self._snapshot is not None and self._snapshot.version == version):
+                    return version
+                try:
+                    segment = shared_memory.SharedMemory(name=_snapshot_name(self.name, version),
+                                                         track=False)
+                except FileNotFoundError:
+                    segment = None  # Already replaced by a newer version; read the control again
+                if segment is not None:
+                    # The previous snapshot is unmapped once no iterator still reads it
+                    self._snapshot = _Snapshot(segment)
+                    return version
+            if time.monotonic() > deadline:
+                raise TimeoutError("Could not map a consistent snapshot version")
+            time.sleep(0.001)
+
+    def _read_version(self) -> Optional[int]:
+        control = self._control.buf
+        before = SEQUENCE.unpack_from(control, 0)[0]
+        if before % 2:
+            return None  # The writer is switching versions
+        version = VERSION.unpack_from(control, SEQUENCE.size)[0]
+        if SEQUENCE.unpack_from(control, 0)[0] != before:
+            return None  # Switched while the version was read
+        return version
+
+    def _current(self) -> Optional[_Snapshot]:
+        self.refresh()
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """
+        The latest published version (0 if nothing was published yet).
+        """
+        return self.refresh()
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Get a task by its ID.
+
+        Args:
+            task_id: The ID of the task to retrieve
+
+        Returns:
+            A copy of the Task if found, None otherwise
+        """
+        snapshot = self._current()
+        if snapshot is None:
+            return None
+        index = snapshot.find(task_id)
+        return None if index is None else snapshot.read(index)
+
+    def get_task_count(self) -> int:
+        """
+        Get the number of tasks in the snapshot.
+        """
+        snapshot = self._current()
+        return 0 if snapshot is None else snapshot.count
+
+    def get_next_id(self) -> int:
+        """
+        Get the next ID the writer will assign, as of the snapshot.
+        """
+        snapshot = self._current()
+        return 1 if snapshot is None else snapshot.next_id
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Stream the snapshot's tasks in ID order.
+
+        The iterator keeps reading the version that was current when it
+        started, even if a newer one is published meanwhile.
+        """
+        snapshot = self._current()
+        if snapshot is None:
+            return iter(())
+        return (snapshot.read(index) for index in range(snapshot.count))
+
+    def get_all_tasks(self) -> List[Task]:
+        """
+        Get all tasks in the snapshot, in ID order.
+        """
+        return list(self.iter_tasks())
+
+    def query_tasks(self, project: Optional[str] = None, tags: Union[str, Iterable[str], None] = None,
+                    priority: Optional[str] = None, due_before: Union[str, date, None] = None,
+                    due_after: Union[str, date, None] = None, overdue: bool = False,
+                    completed: Optional[bool] = None) -> List[Task]:
+        """
+        Find tasks matching all the given criteria; see TaskStorage.query_tasks.
+
+        Returns:
+            The matching tasks in ID order
+
+        Raises:
+            ValueError: If a date is not in YYYY-MM-DD format
+        """
+        matches = task_filter(project, tags, priority, due_before, due_after, overdue, completed)
+        if matches is None:
+            return self.get_all_tasks()
+        return [task for task in self.iter_tasks() if matches(task)]
+
+    def close(self):
+        """
+        Unmap the snapshot and control segments.
+        """
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+        self._control.close()
@@ -0,0 +1,412 @@
+import heapq
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, time as time_of_day, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+from .storage import TaskStorage
+from .validation import (
+    normalize_tags,
+    parse_due_date,
+    validate_description,
+    validate_priority,
+    validate_project,
+    validate_tags,
+    validate_title
+)
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+RECURRENCE_ERROR = ("Repeat must be 'daily', 'weekdays', 'weekly', 'every N days' "
+                    "or 'every <weekday>[, <weekday>...]'")
+DEFAULT_TIME = "09:00"
+SCHEDULE_SUFFIX = ".schedule.json"  # Schedules are kept next to the task store file
+MAX_EVENTS = 1000  # Undrained events kept for drain_events(); older ones are dropped
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """
+    A parsed repeat rule: either every interval_days days, or on the given weekdays.
+    """
+    rule: str
+    interval_days: Optional[int] = None
+    weekdays: Tuple[int, ...] = ()
+
+    def first_on_or_after(self, day: date) -> date:
+        """
+        Get the first occurrence on or after a day.
+        """
+        if self.interval_days is not None or day.weekday() in self.weekdays:
+            return day
+        return self.next_after(day)
+
+    def next_after(self, day: date) -> date:
+        """
+        Get the occurrence following the occurrence on day.
+        """
+        if self.interval_days is not None:
+            return day + timedelta(days=self.interval_days)
+        gap = min((weekday - day.weekday() - 1) % 7 + 1 for weekday in self.weekdays)
+        return day + timedelta(days=gap)
+
+
+def _parse_weekday(name: str) -> int:
+    matches = [index for index, weekday in enumerate(WEEKDAYS)
+               if len(name) >= 3 and weekday.startswith(name)]
+    if len(matches) != 1:
+        raise ValueError(RECURRENCE_ERROR)
+    return matches[0]
+
+
+def parse_recurrence(rule: str) -> Recurrence:
+    """
+    Parse a repeat rule such as "daily", "every 3 days" or "every mon, thu".
+
+    Args:
+        rule: The rule text (case and extra spaces are ignored)
+
+    Returns:
+        The parsed Recurrence
+
+    Raises:
+        ValueError: If the rule is not understood
+    """
+    text = " ".join(str(rule).lower().split())
+    if text in ("daily", "every day"):
+        return Recurrence(text, interval_days=1)
+    if text in ("weekly", "every week"):
+        return Recurrence(text, interval_days=7)
+    if text in ("weekdays", "every weekday"):
+        return Recurrence(text, weekdays=(0, 1, 2, 3, 4))
+    match = re.fullmatch(r"every (\d+) days?", text)
+    if match and int(match.group(1)) > 0:
+        return Recurrence(text, interval_days=int(match.group(1)))
+    match = re.fullmatch(r"every ([a-z, ]+)", text)
+    if match:
+        names = [name for name in re.split(r"\s*,\s*|\s+and\s+|\s+", match.group(1)) if name]
+        if names:
+            return Recurrence(text, weekdays=tuple(sorted({_parse_weekday(name) for name in names})))
+    raise ValueError(RECURRENCE_ERROR)
+
+
+def parse_time(value: str) -> time_of_day:
+    """
+    Parse a time of day in HH:MM format.
+
+    Raises:
+        ValueError: If the time is not in HH:MM format
+    """
+    try:
+        return time_of_day.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("Time must be in HH:MM format")
+
+
+@dataclass
+class Schedule:
+    """
+    A reminder for an existing task, or a rule that creates a new task on each occurrence.
+    """
+    id: int
+    kind: str  # "reminder" or "recurring"
+    fire_at: float  # Unix timestamp of the next time it is due
+    task_id: Optional[int] = None  # Reminders only
+    message: Optional[str] = None
+    rule: Optional[str] = None  # Recurring only, with the fields below
+    at: str = DEFAULT_TIME
+    template: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ScheduledEvent:
+    """
+    Something the scheduler did when a schedule came due.
+
+    kind is "reminder" for a task that needs attention, or "recurring" when
+    a new occurrence of a repeating task was created as task_id.
+    """
+    kind: str
+    schedule_id: int
+    task_id: int
+    fire_at: float
+    message: Optional[str] = None
+
+
+class TaskScheduler:
+    """
+    Fires reminders and creates recurring task occurrences when they come due.
+
+    Due times live in a min-heap, so tick() only looks at the schedules that
+    are due: each costs O(log N) however many tasks and schedules exist.
+    Cancelled or rescheduled entries are left in the heap and skipped when
+    they surface. Recurring tasks are created with add_task, due on the day
+    of the occurrence. If several occurrences were missed (e.g. the app was
+    not running), only the most recent one is created.
+
+    Fired events go to listeners registered with add_listener and are also
+    queued for drain_events(), so the CLI and agents can poll for them.
+    """
+
+    def __init__(self, storage: TaskStorage, filename: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            storage: The store that reminders refer to and occurrences are added to
+            filename: JSON file the schedules are kept in (optional, in memory only if omitted)
+            clock: Function returning the current Unix time
+        """
+        self.storage = storage
+        self.filename = filename
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._schedules: Dict[int, Schedule] = {}
+        self._heap: List[Tuple[float, int]] = []  # (fire_at, schedule ID)
+        self._next_id = 1
+        self._events: Deque[ScheduledEvent] = deque(maxlen=MAX_EVENTS)
+        self._listeners: List[Callable[[ScheduledEvent], None]] = []
+        self.load_from_file()
+
+    def load_from_file(self):
+        """
+        Load schedules from the schedule file, starting empty if it is missing or unreadable.
+        """
+        with self._lock:
+            self._schedules = {}
+            self._next_id = 1
+            if self.filename is not None and os.path.exists(self.filename):
+                try:
+                    with open(self.filename, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    for record in data.get("schedules", []):
+                        schedule = Schedule(**record)
+                        self._schedules[schedule.id] = schedule
+                    self._next_id = data.get("next_id", max(self._schedules, default=0) + 1)
+                except (json.JSONDecodeError, TypeError, KeyError, ValueError):
+                    self._schedules = {}
+                    self._next_id = 1
+            self._heap = [(schedule.fire_at, schedule.id) for schedule in self._schedules.values()]
+            heapq.heapify(self._heap)
+
+    def save_to_file(self):
+        """
+        Save the schedules, replacing the schedule file atomically.
+        """
+        if self.filename is None:
+            return
+        data = {"next_id": self._next_id,
+                "schedules": [asdict(schedule) for schedule in self._schedules.values()]}
+        temp_filename = self.filename + ".tmp"
+        try:
+            with open(temp_filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_filename, self.filename)
+        except IOError:
+            # If we can't save, we'll continue operating in memory
+            pass
+
+    def _push(self, schedule: Schedule):
+        self._schedules[schedule.id] = schedule
+        heapq.heappush(self._heap, (schedule.fire_at, schedule.id))
+
+    def _new_id(self) -> int:
+        schedule_id = self._next_id
+        self._next_id += 1
+        return schedule_id
+
+    @staticmethod
+    def _fire_time(day: date, at: str) -> float:
+        return datetime.combine(day, parse_time(at)).timestamp()
+
+    def add_reminder(self, task_id: int, when: Union[float, datetime, str],
+                     message: Optional[str] = None) -> int:
+        """
+        Schedule a reminder for a task.
+
+        Args:
+            task_id: The task to be reminded of
+            when: Unix timestamp, datetime, or ISO date/time string (YYYY-MM-DD HH:MM)
+            message: Text to show with the reminder (optional)
+
+        Returns:
+            The ID of the new schedule
+
+        Raises:
+            ValueError: If the task does not exist or the time is invalid
+        """
+        if self.storage.get_task(task_id) is None:
+            raise ValueError(f"Task with ID {task_id} not found")
+        if isinstance(when, str):
+            try:
+                when = datetime.fromisoformat(when)
+            except ValueError:
+                raise ValueError("Reminder time must be in YYYY-MM-DD HH:MM format")
+        fire_at = when.timestamp() if isinstance(when, datetime) else float(when)
+        with self._lock:
+            schedule = Schedule(self._new_id(), "reminder", fire_at, task_id=task_id, message=message)
+            self._push(schedule)
+            self.save_to_file()
+            return schedule.id
+
+    def add_recurring(self, title: str, rule: str, description: Optional[str] = None,
+                      tags: Union[str, List[str], None] = None, project: Optional[str] = None,
+                      priority: str = "medium", start: Union[str, date, None] = None,
+                      at: str = DEFAULT_TIME) -> int:
+        """
+        Schedule a task that is created again on every occurrence of a repeat rule.
+
+        Args:
+            title: Title of each created task
+            rule: Repeat rule, e.g. "daily", "weekdays", "every 2 days", "every monday"
+            description: Description of each created task (optional)
+            tags: Tags of each created task (optional)
+            project: Project of each created task (optional)
+            priority: Priority of each created task (default "medium")
+            start: First day the rule may occur on, as a date or YYYY-MM-DD (default today)
+            at: Time of day occurrences are created, in HH:MM format (default 09:00)
+
+        Returns:
+            The ID of the new schedule
+
+        Raises:
+            ValueError: If the rule, time or any task field is invalid
+        """
+        recurrence = parse_recurrence(rule)
+        parse_time(at)
+        tags = normalize_tags(tags)
+        validate_title(title)
+        validate_description(description)
+        validate_tags(tags)
+        validate_project(project)
+        validate_priority(priority)
+        first = recurrence.first_on_or_after(parse_due_date(start) or date.today())
+        template = {"title": title, "description": description, "tags": tags,
+                    "project": project, "priority": priority}
+        with self._lock:
+            schedule = Schedule(self._new_id(), "recurring", self._fire_time(first, at),
+                                rule=recurrence.rule, at=at, template=template)
+            self._push(schedule)
+            self.save_to_file()
+            return schedule.id
+
+    def cancel(self, schedule_id: int) -> bool:
+        """
+        Cancel a reminder or recurring task. Tasks it already created are kept.
+
+        Returns:
+            True if the schedule existed, False otherwise
+        """
+        with self._lock:
+            if self._schedules.pop(schedule_id, None) is None:
+                return False
+            # Its heap entry is skipped when it surfaces
+            self.save_to_file()
+            return True
+
+    def get_schedules(self) -> List[Schedule]:
+        """
+        Get all active schedules, soonest first.
+        """
+        with self._lock:
+            return sorted(self._schedules.values(), key=lambda schedule: (schedule.fire_at, schedule.id))
+
+    def next_due(self) -> Optional[float]:
+        """
+        Get the Unix time the next schedule comes due, or None if there are none.
+        """
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap:
+            fire_at, schedule_id = heap[0]
+            schedule = self._schedules.get(schedule_id)
+            if schedule is not None and schedule.fire_at == fire_at:
+                return
+            heapq.heappop(heap)
+
+    def tick(self, now: Optional[float] = None) -> List[ScheduledEvent]:
+        """
+        Fire everything that is due.
+
+        Reminders for tasks that were deleted or completed meanwhile are
+        dropped silently.
+
+        Args:
+            now: The current Unix time (default the scheduler's clock)
+
+        Returns:
+            The events fired, in due order
+        """
+        now = self._clock() if now is None else now
+        fired = []
+        with self._lock:
+            heap = self._heap
+            changed = False
+            while True:
+                self._drop_stale()
+                if not heap or heap[0][0] > now:
+                    break
+                _, schedule_id = heapq.heappop(heap)
+                event = self._fire(self._schedules[schedule_id], now)
+                changed = True
+                if event is not None:
+                    fired.append(event)
+            if changed:
+                self.save_to_file()
+            self._events.extend(fired)
+            listeners = list(self._listeners)
+        for event in fired:
+            for listener in listeners:
+                listener(event)
+        return fired
+
+    def _fire(self, schedule: Schedule, now: float) -> Optional[ScheduledEvent]:
+        if schedule.kind == "reminder":
+            del self._schedules[schedule.id]
+            task = self.storage.get_task(schedule.task_id)
+            if task is None or task.completed:
+                return None
+            return ScheduledEvent("reminder", schedule.id, task.id, schedule.fire_at, schedule.message)
+
+        recurrence = parse_recurrence(schedule.rule)
+        occurrence = datetime.fromtimestamp(schedule.fire_at).date()
+        following = recurrence.next_after(occurrence)
+        while self._fire_time(following, schedule.at) <= now:
+            occurrence, following = following, recurrence.next_after(following)
+        template = schedule.template
+        task_id = self.storage.add_task(template["title"], template.get("description"),
+                                        template.get("tags"), template.get("project"),
+                                        template.get("priority", "medium"), occurrence)
+        fire_at = self._fire_time(occurrence, schedule.at)
+        schedule.fire_at = self._fire_time(following, schedule.at)
+        heapq.heappush(self._heap, (schedule.fire_at, schedule.id))
+        return ScheduledEvent("recurring", schedule.id, task_id, fire_at, template["title"])
+
+    def add_listener(self, listener: Callable[[ScheduledEvent], None]):
+        """
+        Register a callback run with each event fired by tick().
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[ScheduledEvent], None]):
+        """
+        Unregister a callback added with add_listener.
+        """
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def drain_events(self) -> List[ScheduledEvent]:
+        """
+        Take the events fired since the last call, oldest first.
+        """
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+            return events
@@ -0,0 +1,99 @@
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+# Version of the task file layout written by this code. Files written
+# before versioning was introduced have no version field and count as 1.
+SCHEMA_VERSION = 3
+
+RecordMigration = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+_MIGRATIONS: Dict[int, RecordMigration] = {}
+
+
+def register_migration(from_version: int) -> Callable[[RecordMigration], RecordMigration]:
+    """
+    Register the step that upgrades one task record from a schema version
+    to the next. Use as a decorator:
+
+        @register_migration(2)
+        def _split_name(record):
+            ...
+            return record
+
+    Steps work on one record at a time, so a store is migrated while it
+    is streamed in rather than in a separate pass over the whole file.
+
+    Raises:
+        ValueError: If a step from that version is already registered
+    """
+    def register(step: RecordMigration) -> RecordMigration:
+        if from_version in _MIGRATIONS:
+            raise ValueError(f"A migration from schema version {from_version} is already registered")
+        _MIGRATIONS[from_version] = step
+        return step
+    return register
+
+
+def check_schema_version(version: Any) -> int:
+    """
+    Check that a file's schema version can be read by this code.
+
+    Returns:
+        The version
+
+    Raises:
+        ValueError: If the version is not a positive integer, is newer than
+            SCHEMA_VERSION, or has no migration path to it
+    """
+    if not isinstance(version, int) or isinstance(version, bool) or version < 1:
+        raise ValueError(f"Invalid schema version: {version!r}")
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Schema version {version} was written by a newer version of the app "
+                         f"(this version reads up to {SCHEMA_VERSION})")
+    missing = [step for step in range(version, SCHEMA_VERSION) if step not in _MIGRATIONS]
+    if missing:
+        raise ValueError(f"No migration registered from schema version {missing[0]}")
+    return version
+
+
+def migrate_record(record: Dict[str, Any], from_version: int) -> Dict[str, Any]:
+    """
+    Upgrade a task record to SCHEMA_VERSION by applying every registered
+    step in turn. Records already at SCHEMA_VERSION are returned as they are.
+    """
+    for version in range(from_version, SCHEMA_VERSION):
+        record = _MIGRATIONS[version](record)
+    return record
+
+
+def migrate_records(records: Iterable[Dict[str, Any]], from_version: int) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily upgrade a stream of task records to SCHEMA_VERSION.
+
+    Raises:
+        ValueError: If the version cannot be migrated (see check_schema_version)
+    """
+    check_schema_version(from_version)
+    if from_version == SCHEMA_VERSION:
+        return iter(records)
+    return (migrate_record(record, from_version) for record in records)
+
+
+@register_migration(1)
+def _add_organization_fields(record: Dict[str, Any]) -> Dict[str, Any]:
+    # Version 1 records may predate tags, projects, priorities, due dates
+    # and change timestamps; version 2 spells every field out
+    record.setdefault("description", None)
+    record.setdefault("completed", False)
+    record.setdefault("updated_at", None)
+    record.setdefault("tags", [])
+    record.setdefault("project", None)
+    record.setdefault("priority", "medium")
+    record.setdefault("due_date", None)
+    return record
+
+
+@register_migration(2)
+def _add_blocked_by(record: Dict[str, Any]) -> Dict[str, Any]:
+    # Version 3 adds task dependencies
+    record.setdefault("blocked_by", [])
+    return record
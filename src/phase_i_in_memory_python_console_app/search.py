@@ -0,0 +1,161 @@
+import heapq
+from itertools import islice
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .models import Task
+from .storage import TaskStorage
+
+
+def match_score(query: str, text: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Score how well a query matches a text, lower being better.
+
+    Contiguous matches rank before subsequence matches; within each group
+    earlier and tighter matches rank first.
+
+    Args:
+        query: The casefolded query
+        text: The casefolded text to match against
+
+    Returns:
+        A sortable score, or None if the query is not a subsequence of the text
+    """
+    position = text.find(query)
+    if position >= 0:
+        return (0, position, len(text))
+
+    index = -1
+    first = None
+    for char in query:
+        index = text.find(char, index + 1)
+        if index < 0:
+            return None
+        if first is None:
+            first = index
+    return (1, index - first, len(text))
+
+
+class FuzzyIndex:
+    """
+    Index over task titles for fuzzy, as-you-type matching.
+
+    For every character the index keeps the set of tasks whose title
+    contains it. A fresh query only verifies tasks in the intersection of
+    its characters' sets. While the user keeps typing, each new query
+    extends the previous one, so only the previous matches need to be
+    re-checked and the work shrinks with every keystroke.
+    """
+
+    def __init__(self, storage: Optional[TaskStorage] = None):
+        self._texts: Dict[int, str] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._last_query: Optional[str] = None
+        self._last_matches: List[int] = []
+        self._storage = storage
+        if storage is not None:
+            self._load(storage)
+            storage.add_listener(self._on_change)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, task_id: int, text: str):
+        """
+        Index (or re-index) the text of a task.
+
+        Args:
+            task_id: The task ID
+            text: The text to match queries against
+        """
+        if task_id in self._texts:
+            self.remove(task_id)
+        text = text.casefold()
+        self._texts[task_id] = text
+        for char in set(text):
+            self._postings.setdefault(char, set()).add(task_id)
+        self._last_query = None
+
+    def remove(self, task_id: int):
+        """
+        Remove a task from the index if it is present.
+
+        Args:
+            task_id: The task ID
+        """
+        text = self._texts.pop(task_id, None)
+        if text is None:
+            return
+        for char in set(text):
+            postings = self._postings[char]
+            postings.discard(task_id)
+            if not postings:
+                del self._postings[char]
+        self._last_query = None
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """
+        Find the tasks that best match a fuzzy query.
+
+        Args:
+            query: The text typed so far
+            limit: Maximum number of task IDs to return
+
+        Returns:
+            Matching task IDs, best match first. A query that is a task ID
+            puts that task first.
+        """
+        query = query.strip().casefold()
+        if not query:
+            self._last_query = None
+            return list(islice(self._texts, limit))
+
+        if self._last_query is not None and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = self._candidates(query)
+
+        texts = self._texts
+        if len(query) == 1:
+            # Every task in the character's postings matches, only rank the best few
+            self._last_matches = list(candidates)
+            results = heapq.nsmallest(limit, self._last_matches,
+                                      key=lambda task_id: (texts[task_id].find(query),
+                                                           len(texts[task_id]), task_id))
+        else:
+            scored = []
+            for task_id in candidates:
+                score = match_score(query, texts[task_id])
+                if score is not None:
+                    scored.append((score, task_id))
+            self._last_matches = [task_id for _, task_id in scored]
+            results = [task_id for _, task_id in heapq.nsmallest(limit, scored)]
+        self._last_query = query
+
+        if query.isdigit() and int(query) in texts:
+            task_id = int(query)
+            results = [task_id] + [other for other in results if other != task_id][:limit - 1]
+        return results
+
+    def _candidates(self, query: str) -> Set[int]:
+        postings = []
+        for char in set(query):
+            char_postings = self._postings.get(char)
+            if not char_postings:
+                return set()
+            postings.append(char_postings)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def _load(self, storage: TaskStorage):
+        self._texts.clear()
+        self._postings.clear()
+        self._last_query = None
+        for task in storage.iter_tasks():
+            self.add(task.id, task.title)
+
+    def _on_change(self, event: str, task: Optional[Task], changes: Dict[str, Any]):
+        if event == "reset":
+            self._load(self._storage)
+        elif event == "add" or (event == "update" and "title" in changes):
+            self.add(task.id, task.title)
+        elif event == "delete":
+            self.remove(task.id)
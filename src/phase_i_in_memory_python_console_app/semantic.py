@@ -0,0 +1,405 @@
+import heapq
+import math
+import random
+import re
+import threading
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from .models import Task
+from .storage import TaskStorage
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+DIMENSIONS = 256  # Length of the default hashing embedding
+BACKENDS = ("numpy", "sparse")
+BANDS = 32  # LSH bands of ROWS hyperplane signs each, for approximate search
+ROWS = 8
+PLANE_DENSITY = 1 / 8  # Share of dimensions each LSH hyperplane has a +1/-1 component on
+WORD_CACHE_SIZE = 1 << 16  # Words whose hashed features are kept
+
+# Feature weights of the hashing embedding: whole words carry the meaning,
+# character trigrams match word forms ("quarter"/"quarterly"), and word
+# pairs reward phrases
+WORD_WEIGHT = 1.0
+PAIR_WEIGHT = 0.5
+TRIGRAM_WEIGHT = 0.25
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by do for from has have i in into is it its me my of on or our "
+    "so that the this to up was we with".split())
+
+_WORD = re.compile(r"\w+")
+
+SparseVector = Dict[int, float]
+Embedder = Callable[[str], Sequence[float]]
+
+
+def numpy_available() -> bool:
+    """
+    Whether vectors are kept in a NumPy matrix (True) or in sparse
+    inverted lists (False, when NumPy is not installed).
+    """
+    return _np is not None
+
+
+def task_text(title: str, description: Optional[str] = None) -> str:
+    """
+    The text embedded for a task: its title and description.
+    """
+    return f"{title}\n{description}" if description else title
+
+
+def _hash_feature(feature: str, dimensions: int) -> Tuple[int, float]:
+    digest = zlib.crc32(feature.encode("utf-8"))
+    return digest % dimensions, 1.0 if digest & 0x80000000 else -1.0
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def _word_features(word: str, dimensions: int) -> Tuple[Tuple[int, float], ...]:
+    """
+    The weighted (dimension, value) features of a word and its trigrams;
+    task texts reuse a small vocabulary, so most words hit the cache.
+    """
+    dimension, sign = _hash_feature(word, dimensions)
+    features = [(dimension, sign * WORD_WEIGHT)]
+    padded = f"<{word}>"
+    for i in range(len(padded) - 2):
+        dimension, sign = _hash_feature("#" + padded[i:i + 3], dimensions)
+        features.append((dimension, sign * TRIGRAM_WEIGHT))
+    return tuple(features)
+
+
+def hashing_embedding(text: str, dimensions: int = DIMENSIONS) -> SparseVector:
+    """
+    Embed a text with signed feature hashing, without any model.
+
+    Casefolded words (minus stop words), adjacent word pairs and the
+    character trigrams of each word are hashed to a dimension and a sign,
+    and the weighted counts are normalized to unit length. Texts sharing
+    words or word forms get a high cosine similarity; the embedding is
+    lexical, so synonyms only match if a model is plugged in instead.
+
+    Returns:
+        The non-zero components as dimension -> value; empty if the text
+        has no words
+    """
+    words = [word for word in _WORD.findall(text.casefold()) if word not in STOP_WORDS]
+    vector: SparseVector = {}
+    for word in words:
+        for dimension, value in _word_features(word, dimensions):
+            vector[dimension] = vector.get(dimension, 0.0) + value
+    for first, second in zip(words, words[1:]):
+        dimension, sign = _hash_feature(f"{first} {second}", dimensions)
+        vector[dimension] = vector.get(dimension, 0.0) + sign * PAIR_WEIGHT
+    return _normalize(vector)
+
+
+def _normalize(vector: SparseVector) -> SparseVector:
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    if not norm:
+        return {}
+    return {dimension: value / norm for dimension, value in vector.items() if value}
+
+
+def _dot(a: SparseVector, b: SparseVector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(dimension, 0.0) for dimension, value in a.items())
+
+
+class SemanticIndex:
+    """
+    Vector index over task titles and descriptions for "find related"
+    queries, kept up to date with every change to the store.
+
+    Each task is embedded (with hashing_embedding unless another embedder
+    is given) and ranked by cosine similarity to the embedded query. With
+    the "numpy" backend (the default when NumPy is installed, see the
+    "semantic" extra) the vectors are rows of one contiguous float32 matrix:
+    a query is a single matrix-vector product plus a partial sort for the
+    top k, and a deleted task's row is filled with the last row, so the
+    matrix never has holes. With the "sparse" backend the vectors are kept
+    in inverted lists per dimension, and a query only visits the lists of
+    its own non-zero dimensions; both give the same results.
+
+    With approximate=True the index also hashes every vector to BANDS
+    buckets by the signs of its projections on very sparse random
+    hyperplanes (SimHash LSH), and a query only scores the tasks sharing
+    a bucket with it. That trades a little recall for speed on large
+    stores: close matches are nearly always found, weak ones may be
+    missed. Bucket keys are computed from the sparse vector the same way
+    on every path, so a task always lands in the bucket its query would.
+    """
+
+    def __init__(self, storage: Optional[TaskStorage] = None, dimensions: int = DIMENSIONS,
+                 embedder: Optional[Embedder] = None, approximate: bool = False, seed: int = 0,
+                 backend: Optional[str] = None):
+        """
+        Args:
+            storage: Store to index and keep up to date with (optional)
+            dimensions: Length of the vectors
+            embedder: Function mapping a text to a vector of that length,
+                e.g. a local sentence embedding model (optional, the hashing
+                embedding if omitted)
+            approximate: Whether to answer queries from the LSH buckets
+                instead of scoring every task (default False)
+            seed: Seed of the random hyperplanes used by approximate search
+            backend: "numpy" or "sparse" (optional; "numpy" if NumPy is
+                installed, "sparse" otherwise)
+
+        Raises:
+            ValueError: If dimensions is not positive, the backend is
+                unknown, or "numpy" is requested without NumPy installed
+        """
+        if dimensions < 1:
+            raise ValueError("Dimensions must be a positive integer")
+        if backend is None:
+            backend = "numpy" if _np is not None else "sparse"
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend must be one of: {', '.join(BACKENDS)}")
+        if backend == "numpy" and _np is None:
+            raise ValueError("The numpy backend needs NumPy; install the 'semantic' extra")
+        self.backend = backend
+        self._use_numpy = backend == "numpy"
+        self.dimensions = dimensions
+        self._embedder = embedder
+        self.approximate = approximate
+        self._lock = threading.RLock()
+        self._vectors: Dict[int, SparseVector] = {}
+        if self._use_numpy:
+            self._matrix = _np.zeros((16, dimensions), dtype=_np.float32)
+            self._row_ids = _np.zeros(16, dtype=_np.int64)  # Task ID of each row
+            self._rows: Dict[int, int] = {}  # Task ID -> row
+        else:
+            self._postings: List[Dict[int, float]] = [{} for _ in range(dimensions)]
+        if approximate:
+            rng = random.Random(seed)
+            # Very sparse random hyperplanes: each dimension lists the
+            # (hyperplane, sign) pairs it contributes to, so projecting a
+            # sparse vector costs only a few additions per non-zero
+            self._planes: List[List[Tuple[int, float]]] = [
+                [(plane, 1.0 if rng.random() < 0.5 else -1.0)
+                 for plane in range(BANDS * ROWS) if rng.random() < PLANE_DENSITY]
+                for _ in range(dimensions)]
+            self._band_keys: Dict[int, List[int]] = {}
+            self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(BANDS)]
+        self.storage = storage
+        if storage is not None:
+            self._load(storage)
+            storage.add_listener(self._on_change)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def embed(self, text: str) -> SparseVector:
+        """
+        Embed a text as a unit-length sparse vector.
+
+        Raises:
+            ValueError: If the embedder returns a vector of the wrong length
+        """
+        if self._embedder is None:
+            return hashing_embedding(text, self.dimensions)
+        values = self._embedder(text)
+        if len(values) != self.dimensions:
+            raise ValueError(f"The embedder returned {len(values)} values, expected {self.dimensions}")
+        return _normalize({dimension: float(value) for dimension, value in enumerate(values) if value})
+
+    def add(self, task_id: int, title: str, description: Optional[str] = None):
+        """
+        Index (or re-index) a task's text.
+        """
+        vector = self.embed(task_text(title, description))
+        with self._lock:
+            self.remove(task_id)
+            if not vector:
+                return  # Nothing to match on
+            self._vectors[task_id] = vector
+            if self._use_numpy:
+                row = len(self._rows)
+                if row == len(self._matrix):  # Grow by doubling, so adds stay O(1) amortized
+                    self._matrix = _np.concatenate((self._matrix, _np.zeros_like(self._matrix)))
+                    self._row_ids = _np.concatenate((self._row_ids, _np.zeros_like(self._row_ids)))
+                self._matrix[row] = 0.0
+                self._matrix[row, list(vector)] = list(vector.values())
+                self._row_ids[row] = task_id
+                self._rows[task_id] = row
+            else:
+                for dimension, value in vector.items():
+                    self._postings[dimension][task_id] = value
+            if self.approximate:
+                keys = self._bucket_keys(vector)
+                self._band_keys[task_id] = keys
+                for buckets, key in zip(self._buckets, keys):
+                    buckets.setdefault(key, set()).add(task_id)
+
+    def remove(self, task_id: int):
+        """
+        Remove a task from the index if it is present.
+        """
+        with self._lock:
+            vector = self._vectors.pop(task_id, None)
+            if vector is None:
+                return
+            if self._use_numpy:
+                row = self._rows.pop(task_id)
+                last = len(self._rows)
+                if row != last:  # Move the last row into the hole
+                    moved = int(self._row_ids[last])
+                    self._matrix[row] = self._matrix[last]
+                    self._row_ids[row] = moved
+                    self._rows[moved] = row
+            else:
+                for dimension in vector:
+                    del self._postings[dimension][task_id]
+            if self.approximate:
+                for buckets, key in zip(self._buckets, self._band_keys.pop(task_id)):
+                    bucket = buckets[key]
+                    bucket.discard(task_id)
+                    if not bucket:
+                        del buckets[key]
+
+    def _bucket_keys(self, vector: SparseVector) -> List[int]:
+        projections = [0.0] * (BANDS * ROWS)
+        for dimension, value in vector.items():
+            for plane, sign in self._planes[dimension]:
+                projections[plane] += sign * value
+        return [sum(1 << bit for bit in range(ROWS) if projections[band * ROWS + bit] > 0)
+                for band in range(BANDS)]
+
+    def find_related(self, query: str, k: int = 5, min_score: float = 0.0,
+                     exclude: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """
+        Find the indexed tasks most similar in meaning to a text.
+
+        Args:
+            query: Free text, e.g. "anything about the quarterly report?"
+            k: Maximum number of results
+            min_score: Minimum cosine similarity, from -1 to 1 (default 0)
+            exclude: Task IDs to leave out (optional)
+
+        Returns:
+            Up to k (task ID, similarity) pairs with a positive similarity
+            of at least min_score, most similar first
+        """
+        if k < 1:
+            raise ValueError("k must be a positive integer")
+        vector = self.embed(query)
+        if not vector:
+            return []
+        excluded = set(exclude)
+        threshold = max(min_score, 1e-6)  # Unrelated texts score about 0
+        with self._lock:
+            candidates = None
+            if self.approximate:
+                candidates = set()
+                for buckets, key in zip(self._buckets, self._bucket_keys(vector)):
+                    candidates.update(buckets.get(key, ()))
+                candidates -= excluded
+            if self._use_numpy:
+                matches = self._matrix_top_k(vector, candidates, excluded, k, threshold)
+            elif candidates is not None:
+                matches = [(task_id, _dot(vector, self._vectors[task_id])) for task_id in candidates]
+            else:
+                matches = self._postings_scores(vector, excluded)
+        matches = [(task_id, score) for task_id, score in matches if score >= threshold]
+        return heapq.nsmallest(k, matches, key=lambda match: (-match[1], match[0]))
+
+    def _matrix_top_k(self, vector: SparseVector, candidates: Optional[Set[int]],
+                      excluded: Set[int], k: int, threshold: float) -> List[Tuple[int, float]]:
+        query = _np.zeros(self.dimensions, dtype=_np.float32)
+        query[list(vector)] = list(vector.values())
+        if candidates is None:
+            rows = _np.arange(len(self._rows))
+            scores = self._matrix[:len(rows)] @ query
+            for task_id in excluded:
+                if task_id in self._rows:
+                    scores[self._rows[task_id]] = -1.0
+        else:
+            rows = _np.fromiter((self._rows[task_id] for task_id in candidates), dtype=_np.int64,
+                                count=len(candidates))
+            scores = self._matrix[rows] @ query
+        # Only the k best rows, plus any tying with the k-th, leave NumPy
+        if len(scores) > k:
+            kth = -_np.partition(-scores, k - 1)[k - 1]
+            keep = _np.flatnonzero(scores >= max(kth, threshold))
+        else:
+            keep = _np.flatnonzero(scores >= threshold)
+        return list(zip(self._row_ids[rows[keep]].tolist(), scores[keep].tolist()))
+
+    def _postings_scores(self, vector: SparseVector, excluded: Set[int]) -> List[Tuple[int, float]]:
+        totals: Dict[int, float] = {}
+        for dimension, value in vector.items():
+            for task_id, component in self._postings[dimension].items():
+                totals[task_id] = totals.get(task_id, 0.0) + value * component
+        return [(task_id, score) for task_id, score in totals.items() if task_id not in excluded]
+
+    def related_to_task(self, task_id: int, k: int = 5) -> List[Tuple[int, float]]:
+        """
+        Find the tasks most similar to an indexed task, leaving the task itself out.
+
+        Returns:
+            (task ID, similarity) pairs, most similar first; empty if the
+            task is not indexed
+        """
+        if self.storage is None:
+            raise ValueError("The index has no store to read the task from")
+        task = self.storage.get_task(task_id)
+        if task is None:
+            return []
+        return self.find_related(task_text(task.title, task.description), k, exclude=(task_id,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the size of the index.
+
+        Returns:
+            Dictionary with the number of indexed 'tasks', the 'dimensions',
+            the 'backend' ("numpy" or "sparse"), whether search is
+            'approximate', and for the NumPy backend the 'matrix_bytes' allocated
+        """
+        with self._lock:
+            stats: Dict[str, Any] = {"tasks": len(self._vectors), "dimensions": self.dimensions,
+                                     "backend": self.backend,
+                                     "approximate": self.approximate}
+            if self._use_numpy:
+                stats["matrix_bytes"] = int(self._matrix.nbytes)
+            return stats
+
+    def _load(self, storage: TaskStorage):
+        with self._lock:
+            for task_id in list(self._vectors):
+                self.remove(task_id)
+            if not self._use_numpy:
+                for task in storage.iter_tasks():
+                    self.add(task.id, task.title, task.description)
+                return
+            # Fill the matrix in one allocation rather than growing it row by row
+            for task in storage.iter_tasks():
+                vector = self.embed(task_text(task.title, task.description))
+                if vector:
+                    self._vectors[task.id] = vector
+            count = len(self._vectors)
+            self._matrix = _np.zeros((max(16, count), self.dimensions), dtype=_np.float32)
+            self._row_ids = _np.zeros(len(self._matrix), dtype=_np.int64)
+            for row, (task_id, vector) in enumerate(self._vectors.items()):
+                self._matrix[row, list(vector)] = list(vector.values())
+                self._row_ids[row] = task_id
+                self._rows[task_id] = row
+            if self.approximate:
+                for task_id, vector in self._vectors.items():
+                    keys = self._band_keys[task_id] = self._bucket_keys(vector)
+                    for buckets, key in zip(self._buckets, keys):
+                        buckets.setdefault(key, set()).add(task_id)
+
+    def _on_change(self, event: str, task: Optional[Task], changes: Dict[str, Any]):
+        if event == "reset":
+            self._load(self.storage)
+        elif event == "add" or (event == "update" and ("title" in changes or "description" in changes)):
+            self.add(task.id, task.title, task.description)
+        elif event == "delete":
+            self.remove(task.id)
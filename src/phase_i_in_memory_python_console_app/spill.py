@@ -0,0 +1,229 @@
+import json
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, MutableMapping, Optional, Set, Tuple
+from .models import Task
+
+# Rewrite the spill file once this many bytes of it are stale and it is at least half stale
+COMPACT_MIN_BYTES = 1024 * 1024
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def task_size(task: Task) -> int:
+    """
+    Estimate the memory held by a task, in bytes.
+
+    Args:
+        task: The task
+
+    Returns:
+        The approximate size of the task object and its field values
+    """
+    return sys.getsizeof(task) + sum(sys.getsizeof(value) for value in vars(task).values())
+
+
+class SpillingTaskMap(MutableMapping[int, Task]):
+    """
+    Task ID -> Task mapping that keeps only a bounded working set in memory.
+
+    Recently used tasks live in an LRU cache limited by entry count and/or
+    estimated bytes. Tasks pushed out of the cache are appended as JSON
+    lines to an anonymous spill file, and an in-memory offset table lets a
+    cold task be read back with one seek. Reading a cold task through
+    __getitem__ moves it back into the cache; values() and items() stream
+    cold tasks without caching them, so full scans don't flush the
+    working set.
+
+    Eviction only writes tasks that changed since they were last spilled.
+    Tasks are changed in place, so after changing one, assign it back
+    (map[task.id] = task) to mark it changed. Lookups, changes and scans
+    may run on different threads, e.g. while a background save streams
+    the store.
+    """
+
+    def __init__(self, encode: Callable[[Task], Dict[str, Any]],
+                 decode: Callable[[Dict[str, Any]], Task],
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        if max_entries is None and max_bytes is None:
+            raise ValueError("A spilling task map needs an entry or byte budget")
+        self._encode = encode
+        self._decode = decode
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._hot: "OrderedDict[int, Task]" = OrderedDict()  # Least recently used first
+        self._sizes: Dict[int, int] = {}
+        self._hot_bytes = 0
+        self._dirty: Set[int] = set()  # Cached tasks whose spilled copy is missing or stale
+        # Task ID -> (offset, length) of its current copy in the spill file
+        self._locations: Dict[int, Tuple[int, int]] = {}
+        self._count = 0
+        self._file = tempfile.TemporaryFile()
+        self._lock = threading.RLock()  # Guards the cache, offset table and file position
+        self._live_bytes = 0
+        self._stale_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._hot or task_id in self._locations
+
+    def __iter__(self) -> Iterator[int]:
+        with self._lock:
+            hot_ids = list(self._hot)
+            cold_ids = [task_id for task_id in self._locations if task_id not in self._hot]
+        yield from hot_ids
+        yield from cold_ids
+
+    def __getitem__(self, task_id: int) -> Task:
+        with self._lock:
+            task = self._hot.get(task_id)
+            if task is not None:
+                self.hits += 1
+                self._hot.move_to_end(task_id)
+                return task
+
+            if task_id not in self._locations:
+                raise KeyError(task_id)
+            self.misses += 1
+            task = self._read(task_id)
+            self._cache(task)
+            return task
+
+    def __setitem__(self, task_id: int, task: Task):
+        with self._lock:
+            if task_id not in self:
+                self._count += 1
+            self._discard_location(task_id)
+            self._discard_hot(task_id)
+            self._dirty.add(task_id)
+            self._cache(task)
+
+    def __delitem__(self, task_id: int):
+        with self._lock:
+            if task_id not in self:
+                raise KeyError(task_id)
+            self._count -= 1
+            self._discard_hot(task_id)
+            self._discard_location(task_id)
+
+    def pop(self, task_id: int, *default: Any) -> Any:
+        """
+        Remove a task and return it, without caching a cold task first.
+        """
+        with self._lock:
+            task = self._hot.get(task_id)
+            if task is None:
+                if task_id not in self._locations:
+                    if default:
+                        return default[0]
+                    raise KeyError(task_id)
+                task = self._read(task_id)
+            del self[task_id]
+            return task
+
+    def values(self) -> Iterator[Task]:  # type: ignore[override]
+        """
+        Stream every task, reading cold tasks without caching them.
+        """
+        return (task for _, task in self.items())
+
+    def items(self) -> Iterator[Tuple[int, Task]]:  # type: ignore[override]
+        """
+        Stream every (task ID, task) pair, reading cold tasks without caching them.
+        """
+        hot = self._hot
+        for task_id in list(self):
+            with self._lock:
+                # The task may have moved in or out of the cache since the IDs were listed
+                task = hot.get(task_id)
+                if task is None:
+                    if task_id not in self._locations:
+                        continue  # Deleted meanwhile
+                    task = self._read(task_id)
+            yield task_id, task
+
+    def close(self):
+        """
+        Release the spill file. The map must not be used afterwards.
+        """
+        with self._lock:
+            self._file.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Working set size and cache hit/miss counters.
+        """
+        return {
+            "cached": len(self._hot),
+            "cached_bytes": self._hot_bytes,
+            "spilled": self._count - len(self._hot),
+            "spill_file_bytes": self._live_bytes + self._stale_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def _cache(self, task: Task):
+        # Sizes are only estimated when there is a byte budget to enforce
+        size = task_size(task) if self.max_bytes is not None else 0
+        self._hot[task.id] = task
+        self._sizes[task.id] = size
+        self._hot_bytes += size
+        self._evict()
+
+    def _evict(self):
+        hot = self._hot
+        while len(hot) > 1 and (
+                (self.max_entries is not None and len(hot) > self.max_entries)
+                or (self.max_bytes is not None and self._hot_bytes > self.max_bytes)):
+            task_id, task = hot.popitem(last=False)
+            self._hot_bytes -= self._sizes.pop(task_id)
+            if task_id in self._dirty:
+                self._dirty.discard(task_id)
+                self._write(task)
+
+    def _discard_hot(self, task_id: int):
+        if self._hot.pop(task_id, None) is not None:
+            self._hot_bytes -= self._sizes.pop(task_id)
+        self._dirty.discard(task_id)
+
+    def _discard_location(self, task_id: int):
+        location = self._locations.pop(task_id, None)
+        if location is not None:
+            self._live_bytes -= location[1]
+            self._stale_bytes += location[1]
+
+    def _write(self, task: Task):
+        line = _ENCODER.encode(self._encode(task)).encode('utf-8') + b"\n"
+        self._file.seek(0, 2)
+        self._locations[task.id] = (self._file.tell(), len(line))
+        self._file.write(line)
+        self._live_bytes += len(line)
+        if self._stale_bytes > COMPACT_MIN_BYTES and self._stale_bytes > self._live_bytes:
+            self._compact()
+
+    def _read(self, task_id: int) -> Task:
+        offset, length = self._locations[task_id]
+        self._file.seek(offset)
+        return self._decode(json.loads(self._file.read(length)))
+
+    def _compact(self):
+        """
+        Copy the live records to a fresh spill file, dropping stale ones.
+        """
+        old_file = self._file
+        new_file = tempfile.TemporaryFile()
+        locations = {}
+        for task_id, (offset, length) in self._locations.items():
+            old_file.seek(offset)
+            locations[task_id] = (new_file.tell(), length)
+            new_file.write(old_file.read(length))
+        old_file.close()
+        self._file = new_file
+        self._locations = locations
+        self._stale_bytes = 0
@@ -0,0 +1,170 @@
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .models import Task
+from .validation import PRIORITIES
+
+
+class TaskStats:
+    """
+    Aggregate task counters maintained incrementally from store changes.
+
+    Totals and per-project and per-priority counts are adjusted in O(1) on
+    every add, update and delete, so reading them never scans the store.
+    Completions are also counted in fixed-width time buckets covering a
+    rolling window, giving recent completion throughput.
+    """
+
+    def __init__(self, bucket_seconds: int = 3600, bucket_count: int = 24,
+                 clock: Callable[[], float] = time.time):
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = bucket_count
+        self._clock = clock
+        self._total = 0
+        self._completed = 0
+        # Project -> [total, completed]; tasks without a project are counted under None
+        self._projects: Dict[Optional[str], List[int]] = {}
+        self._priorities: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        # Bucket number (timestamp // bucket_seconds) -> completions in that bucket
+        self._completions: Dict[int, int] = {}
+
+    def rebuild(self, tasks: Iterable[Task]):
+        """
+        Recount everything from scratch.
+
+        Completion times are not stored, so the throughput window is seeded
+        from the last change time of tasks that are currently completed.
+
+        Args:
+            tasks: All tasks in the store
+        """
+        self._total = 0
+        self._completed = 0
+        self._projects = {}
+        self._priorities = {priority: 0 for priority in PRIORITIES}
+        self._completions = {}
+        self.add_many(tasks)
+
+    def add_many(self, tasks: Iterable[Task]):
+        """
+        Count a batch of tasks that were not counted yet.
+
+        Args:
+            tasks: The tasks to count
+        """
+        # Count into local dicts and fold them in once, rather than once per task
+        projects: Dict[Optional[str], List[int]] = {}
+        priorities: Dict[str, int] = {}
+        for task in tasks:
+            counts = projects.get(task.project)
+            if counts is None:
+                counts = projects[task.project] = [0, 0]
+            counts[0] += 1
+            priorities[task.priority] = priorities.get(task.priority, 0) + 1
+            if task.completed:
+                counts[1] += 1
+                if task.updated_at is not None:
+                    self._record_completion(task.updated_at, 1)
+        for project, (total, completed) in projects.items():
+            counts = self._projects.setdefault(project, [0, 0])
+            counts[0] += total
+            counts[1] += completed
+            self._total += total
+            self._completed += completed
+        for priority, count in priorities.items():
+            self._priorities[priority] = self._priorities.get(priority, 0) + count
+
+    def on_change(self, event: str, task: Optional[Task], changes: Dict[str, Any]):
+        """
+        Store change listener; see TaskStorage.add_listener.
+        """
+        if event == "add":
+            self._count(task.project, task.completed, task.priority, 1)
+        elif event == "delete":
+            self._count(task.project, task.completed, task.priority, -1)
+        elif event == "update" and ("completed" in changes or "project" in changes
+                                    or "priority" in changes):
+            was_completed = changes.get("completed", task.completed)
+            self._count(changes.get("project", task.project), was_completed,
+                        changes.get("priority", task.priority), -1)
+            self._count(task.project, task.completed, task.priority, 1)
+            if task.completed and not was_completed:
+                self._record_completion(task.updated_at or self._clock(), 1)
+            elif was_completed and not task.completed and changes.get("updated_at") is not None:
+                # Reopening a task takes back the completion it recorded
+                self._record_completion(changes["updated_at"], -1)
+
+    def _count(self, project: Optional[str], completed: bool, priority: str, delta: int):
+        self._total += delta
+        counts = self._projects.setdefault(project, [0, 0])
+        counts[0] += delta
+        if completed:
+            self._completed += delta
+            counts[1] += delta
+        if not counts[0]:
+            del self._projects[project]
+        self._priorities[priority] = self._priorities.get(priority, 0) + delta
+
+    def _record_completion(self, timestamp: float, delta: int):
+        bucket = int(timestamp // self.bucket_seconds)
+        if bucket <= self._current_bucket() - self.bucket_count:
+            return
+        count = self._completions.get(bucket, 0) + delta
+        if count > 0:
+            self._completions[bucket] = count
+        else:
+            self._completions.pop(bucket, None)
+        if len(self._completions) > self.bucket_count:
+            self._prune()
+
+    def _current_bucket(self) -> int:
+        return int(self._clock() // self.bucket_seconds)
+
+    def _prune(self):
+        oldest = self._current_bucket() - self.bucket_count + 1
+        for bucket in [bucket for bucket in self._completions if bucket < oldest]:
+            del self._completions[bucket]
+
+    def get_throughput(self) -> List[int]:
+        """
+        Get completions per bucket over the rolling window.
+
+        Returns:
+            One count per bucket, oldest first, ending with the current bucket
+        """
+        self._prune()
+        current = self._current_bucket()
+        return [self._completions.get(bucket, 0)
+                for bucket in range(current - self.bucket_count + 1, current + 1)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get all statistics as plain data.
+
+        Returns:
+            Dictionary with 'total', 'completed', 'pending', 'completion_rate',
+            'by_project' (project -> total/completed/pending/completion_rate),
+            'by_priority' (priority -> count) and 'throughput' (bucket size,
+            per-bucket completions and the window total)
+        """
+        throughput = self.get_throughput()
+        return {
+            "total": self._total,
+            "completed": self._completed,
+            "pending": self._total - self._completed,
+            "completion_rate": self._completed / self._total if self._total else 0.0,
+            "by_project": {
+                project: {
+                    "total": total,
+                    "completed": completed,
+                    "pending": total - completed,
+                    "completion_rate": completed / total
+                }
+                for project, (total, completed) in self._projects.items() if project is not None
+            },
+            "by_priority": dict(self._priorities),
+            "throughput": {
+                "bucket_seconds": self.bucket_seconds,
+                "completions": throughput,
+                "window_total": sum(throughput)
+            }
+        }
@@ -1,88 +1,818 @@
+import functools
+import gc
+import hashlib
+import heapq
 import json
 import os
-from typing import List, Optional, Dict, Any
-from .models import Task
+import threading
+import time
+from datetime import date
+from bisect import bisect_left, bisect_right, insort
+from itertools import batched, islice
+from typing import List, Optional, Dict, Any, Callable, Iterable, Iterator, MutableMapping, Set, Tuple, Union
+from .audit import AuditLog
+from .dependencies import DependencyGraph
+from .models import FrozenTask, Task
+from .indexes import HashIndex, SortedIndex
+from .history import Operation, OperationHistory
+from .persistent import PersistentMap
+from .file_codecs import DECODE_ERRORS, check_codec, open_read, open_write
+from .flusher import BackgroundFlusher
+from .json_stream import iter_members
+from .schema import SCHEMA_VERSION, check_schema_version, migrate_record
+from .spill import SpillingTaskMap
+from .stats import TaskStats
+from .validation import (
+    FIELD_VALIDATORS,
+    PRIORITIES,
+    normalize_blocked_by,
+    normalize_tags,
+    parse_due_date,
+    validate_blocked_by,
+    validate_columns,
+    validate_description,
+    validate_priority,
+    validate_project,
+    validate_tags,
+    validate_title
+)
+
+
+# Called as listener(event, task, changes) after every change to the store.
+# event is "add", "delete" or "update" (changes maps each changed field to
+# its previous value), or "reset" with task None when the whole store was
+# reloaded or replaced.
+ChangeListener = Callable[[str, Optional[Task], Dict[str, Any]], None]
+
+# Built-in named orderings, each mapping a task to the key it is sorted by.
+# Ties are always broken by task ID. "id" is the natural order of the store.
+ORDERINGS: Dict[str, Callable[[Task], Any]] = {
+    "pending_first": lambda task: task.completed,
+    "title": lambda task: task.title.casefold(),
+    "recently_updated": lambda task: -(task.updated_at or 0.0),
+    "priority": lambda task: -PRIORITIES.index(task.priority),
+    "due_date": lambda task: (task.due_date is None, task.due_date or date.max),
+}
+
+
+def task_filter(project: Optional[str] = None, tags: Union[str, Iterable[str], None] = None,
+                priority: Optional[str] = None, due_before: Union[str, date, None] = None,
+                due_after: Union[str, date, None] = None, overdue: bool = False,
+                completed: Optional[bool] = None) -> Optional[Callable[[Task], bool]]:
+    """
+    Build a predicate matching the same criteria as TaskStorage.query_tasks,
+    for filtering a stream of tasks one at a time.
+
+    Returns:
+        The predicate, or None if no criteria were given
+
+    Raises:
+        ValueError: If a date is not in YYYY-MM-DD format
+    """
+    tags = set(normalize_tags(tags))
+    due_before = parse_due_date(due_before)
+    due_after = parse_due_date(due_after)
+    if (project is None and not tags and priority is None and due_before is None
+            and due_after is None and not overdue and completed is None):
+        return None
+    today = date.today()
+
+    def matches(task: Task) -> bool:
+        if project is not None and task.project != project:
+            return False
+        if tags and not tags.issubset(task.tags):
+            return False
+        if priority is not None and task.priority != priority:
+            return False
+        if completed is not None and task.completed != completed:
+            return False
+        if due_before is not None or due_after is not None or overdue:
+            if task.due_date is None:
+                return False
+            if due_before is not None and task.due_date > due_before:
+                return False
+            if due_after is not None and task.due_date < due_after:
+                return False
+            if overdue and not task.is_overdue(today):
+                return False
+        return True
+
+    return matches
+
+
+class TaskSnapshot:
+    """
+    Read-only, point-in-time view of a TaskStorage, from TaskStorage.snapshot().
+
+    Its tasks are FrozenTask copies in a PersistentMap, which later changes
+    to the store never touch, so every read sees the store exactly as it
+    was when the snapshot was taken, without locking and without copying.
+    """
+
+    def __init__(self, tasks: PersistentMap, next_id: int, version: int):
+        self._tasks = tasks
+        self._next_id = next_id
+        self.version = version  # The store's change count when the snapshot was taken
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get_task(self, task_id: int) -> Optional[FrozenTask]:
+        """
+        Get a task by its ID.
+
+        Returns:
+            The task as of the snapshot if it existed then, None otherwise
+        """
+        return self._tasks.get(task_id)
+
+    def get_task_count(self) -> int:
+        """
+        Get the number of tasks in the snapshot.
+        """
+        return len(self._tasks)
+
+    def get_next_id(self) -> int:
+        """
+        Get the next ID the store was going to assign, as of the snapshot.
+        """
+        return self._next_id
+
+    def iter_tasks(self, filter: Optional[Callable[[Task], bool]] = None) -> Iterator[FrozenTask]:
+        """
+        Stream the snapshot's tasks in ID order.
+
+        Args:
+            filter: Predicate selecting the tasks to yield, e.g. from task_filter (optional)
+        """
+        tasks = self._tasks.values()
+        return tasks if filter is None else (task for task in tasks if filter(task))
+
+    def get_all_tasks(self) -> List[FrozenTask]:
+        """
+        Get all tasks in the snapshot, in ID order.
+        """
+        return list(self._tasks.values())
+
+    def query_tasks(self, project: Optional[str] = None, tags: Union[str, Iterable[str], None] = None,
+                    priority: Optional[str] = None, due_before: Union[str, date, None] = None,
+                    due_after: Union[str, date, None] = None, overdue: bool = False,
+                    completed: Optional[bool] = None) -> List[FrozenTask]:
+        """
+        Find tasks matching all the given criteria; see TaskStorage.query_tasks.
+
+        Returns:
+            The matching tasks in ID order
+
+        Raises:
+            ValueError: If a date is not in YYYY-MM-DD format
+        """
+        return list(self.iter_tasks(task_filter(project, tags, priority, due_before,
+                                                due_after, overdue, completed)))
+
+
+REBUILD_BATCH_SIZE = 4096
+_RECORD_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_RECORD_FIELDS = frozenset(Task.__dataclass_fields__)  # The keys of a record written by a save
+
+
+def _synchronized(method):
+    """
+    Run a TaskStorage method while holding the store lock, so background
+    saves and other threads never see a change half applied.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _gc_paused(method):
+    """
+    Run a TaskStorage method with cyclic garbage collection paused. Bulk
+    loads create hundreds of thousands of objects that all stay alive, and
+    collections triggered along the way would only re-scan them.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            if enabled:
+                gc.enable()
+    return wrapper
 
 
 class TaskStorage:
     """
     Persistent storage for tasks using file-based storage.
+
+    By default every task is held in memory. Passing max_cached_tasks or
+    max_cached_bytes keeps only that many recently used tasks in memory and
+    spills the rest to a scratch file (see SpillingTaskMap); the indexes
+    still hold one small key per task.
+
+    The sorted index behind each ordering, the query indexes, the task
+    statistics and the dependency graph are built the first time they are
+    used and kept current from then on, so opening a store only pays for
+    what it goes on to use.
+
+    By default every change is saved before the method returns. Passing
+    flush_interval_ms hands saving to a BackgroundFlusher instead: changes
+    only mark the store dirty and are saved within that many milliseconds,
+    or once flush_max_pending changes are waiting. Call flush() or close()
+    to save pending changes immediately.
+
+    The file can be written compressed with compression="gzip", "lzma" or
+    "zstd" at an optional compression_level. Loading detects the format
+    from the file itself, so switching compression needs no conversion.
+
+    snapshot() returns an immutable point-in-time view for reads that
+    must not see changes made while they run (see TaskSnapshot). The
+    first call builds a persistent copy of the store; from then on every
+    change also updates that copy, so later snapshots are O(1).
+
+    The file records its schema version. A file written with an older
+    schema is migrated record by record as it loads, and rewritten in the
+    current schema by a background thread, so opening a large old store
+    is not held up by the rewrite (see schema.register_migration).
+
+    A task can be blocked by other tasks. Blockers must exist and must not
+    create a cycle. A task is ready once every blocker is completed or
+    deleted; the ready set is maintained incrementally by a DependencyGraph,
+    so next_actionable() does not walk the graph.
+
+    Passing audit_dir records every change, with its time, actor and field
+    changes, in an AuditLog kept in that directory; history() returns a
+    task's entries. Use audit.acting_as() to name the actor.
+
+    Passing load=False opens the store empty without reading the file,
+    e.g. to restore a backup over a file that can no longer be loaded.
+    The file is only replaced by the next save.
     """
 
-    def __init__(self, filename: str = "tasks.json"):
-        self._tasks: Dict[int, Task] = {}
+    def __init__(self, filename: str = "tasks.json", history_entries: int = 1000,
+                 history_bytes: int = 1024 * 1024, max_cached_tasks: Optional[int] = None,
+                 max_cached_bytes: Optional[int] = None, flush_interval_ms: Optional[int] = None,
+                 flush_max_pending: int = 100, compression: Optional[str] = None,
+                 compression_level: Optional[int] = None, audit_dir: Optional[str] = None,
+                 load: bool = True):
+        check_codec(compression)
+        self._compression = compression
+        self._compression_level = compression_level
+        self._lock = threading.RLock()
+        self._max_cached_tasks = max_cached_tasks
+        self._max_cached_bytes = max_cached_bytes
+        self._tasks: MutableMapping[int, Task] = self._new_task_map()
+        self._ids: List[int] = []  # Sorted task IDs, used for cursor-based iteration
+        self._ordering_keys: Dict[str, Callable[[Task], Any]] = dict(ORDERINGS)
+        self._orderings: Dict[str, SortedIndex] = {}  # The orderings used so far
+        # Query indexes, built on the first query: tag/project/priority -> IDs,
+        # and tasks with a due date by date
+        self._tag_index: Optional[HashIndex] = None
+        self._project_index: Optional[HashIndex] = None
+        self._priority_index: Optional[HashIndex] = None
+        self._due_index: Optional[SortedIndex] = None
+        self._history = OperationHistory(history_entries, history_bytes)
+        self._listeners: List[ChangeListener] = []
+        # Aggregate counters, and the "blocked by" relations with the set of
+        # tasks ready to work on; built on first use, then kept current by
+        # the change notifications
+        self._stats: Optional[TaskStats] = None
+        self._dependencies: Optional[DependencyGraph] = None
+        self._versions: Dict[int, int] = {}  # Task ID -> change sequence of its last change
+        self._change_seq = 0
         self._next_id = 1
+        # Persistent copy of the tasks, kept only once snapshot() was called,
+        # and the (tasks, next ID, change count) of the last completed change
+        self._cow_tasks: Optional[PersistentMap] = None
+        self._published: Optional[Tuple[PersistentMap, int, int]] = None
         self._filename = filename
-        self.load_from_file()
+        self._checksum_filename = filename + ".sha256"
+        self._save_count = 0
+        self._bytes_written = 0  # Store and checksum file bytes written by saves
+        self._file_schema_version = SCHEMA_VERSION
+        if load:
+            self.load_from_file()
+        else:
+            self._rebuild()
+        # Registered after the initial load, so opening the store is not logged
+        self._audit: Optional[AuditLog] = None
+        if audit_dir is not None:
+            self._audit = AuditLog(audit_dir)
+            self._listeners.append(self._audit.on_change)
+        self._flusher: Optional[BackgroundFlusher] = None
+        if flush_interval_ms is not None:
+            self._flusher = BackgroundFlusher(self.save_to_file, flush_interval_ms, flush_max_pending)
+        self._upgrade: Optional[threading.Thread] = None
+        if self._file_schema_version < SCHEMA_VERSION:
+            self._upgrade = threading.Thread(target=self._upgrade_file, name="schema-upgrade",
+                                             daemon=True)
+            self._upgrade.start()
 
+    @_synchronized
+    @_gc_paused
     def load_from_file(self):
         """
-        Load tasks from the JSON file.
+        Load tasks from the JSON file, decompressing it if needed.
+
+        The file is decoded as a stream, a window of task records at a
+        time, so the whole document is never held in memory alongside the
+        tasks. When the file matches the checksum written by the last save,
+        the records are our own validated snapshot and are loaded without
+        per-task validation. Any other file is fully validated. Records
+        written with an older schema are migrated as they are read.
+
+        A file that cannot be loaded is left untouched and the store keeps
+        its current contents, so an unreadable file is never replaced by
+        an empty store.
+
+        Raises:
+            ValueError: If the file is unreadable, invalid, or written with a
+                newer schema, or if it is zstd-compressed and zstd is not available
         """
         if os.path.exists(self._filename):
+            stream = open_read(self._filename)
+            checksum = self._read_checksum()
+            digest = hashlib.sha256()
+            # Whether the file is our own snapshot is only known once it was
+            # read to the end, so with a checksum to compare against the
+            # records are loaded unvalidated and validated afterwards if the
+            # checksum does not match
+            trusted = checksum is not None
             try:
-                with open(self._filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self._tasks = {}
-                    tasks_data = data.get("tasks", {})
-                    for task_id_str, task_data in tasks_data.items():
-                        task_id = int(task_id_str)
-                        task = Task(
-                            id=task_data["id"],
-                            title=task_data["title"],
-                            description=task_data.get("description"),
-                            completed=task_data.get("completed", False)
-                        )
-                        self._tasks[task_id] = task
-
-                    self._next_id = data.get("next_id", 1)
-            except (json.JSONDecodeError, KeyError, ValueError):
-                # If there's an error loading the file, start fresh
-                self._tasks = {}
-                self._next_id = 1
+                tasks = self._new_task_map()
+                version: Optional[int] = None
+                pending: List[Tuple[str, Dict[str, Any]]] = []  # Records read before the version
+                next_id = 1
+                blank = True
+                with stream as f:
+                    for section, key, value in iter_members(f, "tasks", digest):
+                        blank = False
+                        if section is not None:
+                            if version is None:
+                                pending.append((key, value))
+                            else:
+                                tasks[int(key)] = self._load_record(value, version, trusted)
+                        elif key == "schema_version":
+                            version = check_schema_version(value)
+                            for task_id_str, task_data in pending:
+                                tasks[int(task_id_str)] = self._load_record(task_data, version, trusted)
+                            pending = []
+                        elif key == "next_id":
+                            next_id = value
+                if version is None:  # Written before schema versioning
+                    version = SCHEMA_VERSION if blank else check_schema_version(1)
+                    for task_id_str, task_data in pending:
+                        tasks[int(task_id_str)] = self._load_record(task_data, version, trusted)
+                if trusted and digest.hexdigest() != checksum:
+                    for task_id in list(tasks):
+                        tasks[task_id] = self._task_from_record(self._task_to_record(tasks[task_id]))
+            except (json.JSONDecodeError, KeyError, TypeError, AttributeError, ValueError,
+                    *DECODE_ERRORS) as e:
+                raise ValueError(f"Could not load {self._filename}: {e}. "
+                                 f"The file was left unchanged") from e
+            self._set_task_map(tasks)
+            self._next_id = next_id
+            self._file_schema_version = version
+        self._rebuild()
 
-    def save_to_file(self):
+    @classmethod
+    def _load_record(cls, task_data: Dict[str, Any], version: int, trusted: bool) -> Task:
+        if version < SCHEMA_VERSION:
+            task_data = migrate_record(task_data, version)
+        if trusted and task_data.keys() == _RECORD_FIELDS:
+            # A freshly decoded record of our own: its values become the
+            # task's fields as they are, only the due date needs converting
+            task = object.__new__(Task)
+            fields = task.__dict__
+            fields.update(task_data)
+            if fields["due_date"]:
+                fields["due_date"] = date.fromisoformat(fields["due_date"])
+            return task
+        return cls._task_from_record(task_data, trusted)
+
+    @staticmethod
+    def _task_from_record(task_data: Dict[str, Any], trusted: bool = False) -> Task:
+        get = task_data.get
+        due_date = get("due_date")
+        task = Task.from_trusted(
+            id=task_data["id"],
+            title=task_data["title"],
+            description=get("description"),
+            completed=get("completed", False),
+            updated_at=get("updated_at"),
+            tags=list(get("tags", [])),
+            project=get("project"),
+            priority=get("priority", "medium"),
+            due_date=date.fromisoformat(due_date) if due_date else None,
+            blocked_by=list(get("blocked_by", []))
+        )
+        if not trusted:
+            # The checks Task runs on assignment, without a __setattr__ call per field
+            fields = task.__dict__
+            for name, validator in FIELD_VALIDATORS.items():
+                validator(fields[name])
+        return task
+
+    @staticmethod
+    def _task_to_record(task: Task) -> Dict[str, Any]:
+        return {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "completed": task.completed,
+            "updated_at": task.updated_at,
+            "tags": task.tags,
+            "project": task.project,
+            "priority": task.priority,
+            "due_date": task.due_date.isoformat() if task.due_date else None,
+            "blocked_by": task.blocked_by
+        }
+
+    def _new_task_map(self) -> MutableMapping[int, Task]:
+        if self._max_cached_tasks is None and self._max_cached_bytes is None:
+            return {}
+        return SpillingTaskMap(self._task_to_record,
+                               lambda record: self._task_from_record(record, trusted=True),
+                               self._max_cached_tasks, self._max_cached_bytes)
+
+    def _set_task_map(self, tasks: MutableMapping[int, Task]):
+        if tasks is not self._tasks and isinstance(self._tasks, SpillingTaskMap):
+            self._tasks.close()
+        self._tasks = tasks
+
+    def get_cache_stats(self) -> Dict[str, int]:
         """
-        Save tasks to the JSON file.
+        Get working set statistics for bounded-memory stores.
+
+        Returns:
+            Dictionary with 'cached' and 'spilled' task counts, 'cached_bytes',
+            'spill_file_bytes' and cache 'hits' and 'misses'; a store without
+            a memory budget reports every task as cached
         """
-        data = {
-            "tasks": {},
-            "next_id": self._next_id
-        }
+        if isinstance(self._tasks, SpillingTaskMap):
+            return self._tasks.get_stats()
+        return {"cached": len(self._tasks), "cached_bytes": 0, "spilled": 0,
+                "spill_file_bytes": 0, "hits": 0, "misses": 0}
+
+    def _rebuild(self):
+        """
+        Rebuild all derived state after the task dict was replaced wholesale.
+        """
+        self._ids = sorted(self._tasks)
+        # Indexes, statistics and dependencies are built again when next used
+        self._orderings = {}
+        self._tag_index = self._project_index = self._priority_index = self._due_index = None
+        for derived in (self._stats, self._dependencies):
+            if derived is not None:
+                self._listeners.remove(derived.on_change)
+        self._stats = self._dependencies = None
+        self._history.clear()
+        self._versions.clear()
+        if self._cow_tasks is not None:
+            self._build_snapshot_tasks()
+        self._notify("reset", None, {})
+
+    @_gc_paused
+    def _build(self, targets: List[Any]):
+        """
+        Build derived structures from scratch from the current tasks.
+        """
+        for target in targets:
+            target.rebuild(())
+        sorted_indexes = [target for target in targets if isinstance(target, SortedIndex)]
+        others = [target for target in targets if not isinstance(target, SortedIndex)]
+        # One pass over the tasks feeds every target, a batch at a time, so a
+        # bounded-memory store reads its spilled tasks only once. Sorted
+        # indexes are sorted once after the last batch, not once per batch
+        for batch in batched(self._tasks.values(), REBUILD_BATCH_SIZE):
+            for index in sorted_indexes:
+                index.add_many(batch, sort=False)
+            for target in others:
+                target.add_many(batch)
+        for index in sorted_indexes:
+            index.sort()
+
+    def _build_snapshot_tasks(self):
+        freeze = FrozenTask.freeze
+        self._cow_tasks = PersistentMap.from_items(
+            (task_id, freeze(self._tasks[task_id])) for task_id in self._ids)
+        self._publish()
+
+    def _publish(self):
+        # One reference swap, so snapshot() never sees half of a change
+        if self._cow_tasks is not None:
+            self._published = (self._cow_tasks, self._next_id, self._change_seq)
+
+    def snapshot(self) -> TaskSnapshot:
+        """
+        Take a read-only, point-in-time view of the store.
+
+        The snapshot is unaffected by any later change. Changes that add or
+        update many tasks at once, such as an import, are seen entirely or
+        not at all. Taking a snapshot only reads one reference, except for
+        the first call, which builds the persistent copy of the store.
+
+        Returns:
+            A TaskSnapshot
+        """
+        published = self._published
+        if published is None:
+            with self._lock:
+                if self._published is None:
+                    self._build_snapshot_tasks()
+                published = self._published
+        return TaskSnapshot(*published)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every task as its persisted record, in ID order.
+
+        Returns:
+            An iterator of task record dictionaries
+        """
+        return (self._task_to_record(task) for task in self.iter_tasks())
+
+    @_synchronized
+    def get_records(self) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Take a consistent copy of the whole store as persisted records.
+
+        Returns:
+            The task records in ID order, and the next ID to be assigned
+        """
+        return list(self.iter_records()), self._next_id
+
+    @_synchronized
+    def replace_tasks(self, records: Iterator[Dict[str, Any]], next_id: int,
+                      trusted: bool = False):
+        """
+        Replace the whole store with the given task records and save it.
+
+        The new contents are built before anything is replaced, so a failure
+        part way through leaves the store unchanged. Undo history is cleared.
+
+        Args:
+            records: Task record dictionaries, as produced by iter_records
+            next_id: The next ID to assign to a new task
+            trusted: Whether the records are known to be valid already
+
+        Raises:
+            ValueError: If a record is invalid
+        """
+        tasks = self._new_task_map()
+        for task_data in records:
+            task = self._task_from_record(task_data, trusted)
+            tasks[task.id] = task
 
-        for task_id, task in self._tasks.items():
-            data["tasks"][str(task_id)] = {
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "completed": task.completed
-            }
+        self._set_task_map(tasks)
+        self._next_id = max(next_id, max(tasks, default=0) + 1)
+        self._rebuild()
+        self._persist()
 
+    def _read_checksum(self) -> Optional[str]:
         try:
-            with open(self._filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(self._checksum_filename, 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    @_synchronized
+    def save_to_file(self):
+        """
+        Save tasks to the JSON file, along with a checksum of its
+        uncompressed contents.
+
+        The file is written one batch of task records at a time, so saving
+        never holds a second copy of the whole store in memory. It is written
+        to a temporary file first and then moved into place, so an
+        interrupted save leaves the previous file intact.
+        """
+        digest = hashlib.sha256()
+        temp_filename = self._filename + ".tmp"
+        try:
+            with open_write(temp_filename, self._compression, self._compression_level) as f:
+                for chunk in self._iter_json_chunks():
+                    raw = chunk.encode('utf-8')
+                    f.write(raw)
+                    digest.update(raw)
+            written = os.path.getsize(temp_filename)
+            os.replace(temp_filename, self._filename)
+            self._file_schema_version = SCHEMA_VERSION
+            with open(self._checksum_filename, 'w', encoding='utf-8') as f:
+                written += f.write(digest.hexdigest())
+            self._save_count += 1
+            self._bytes_written += written
         except IOError:
             # If we can't save, we'll continue operating in memory
             pass
 
-    def add_task(self, title: str, description: Optional[str] = None) -> int:
+    def _persist(self):
+        """
+        Save after a change, or leave it to the background flusher if there is one.
+        """
+        self._publish()
+        if self._flusher is None:
+            self.save_to_file()
+        else:
+            self._flusher.mark_dirty()
+
+    def flush(self):
+        """
+        Save any changes the background flusher has not saved yet.
+        """
+        if self._flusher is not None:
+            self._flusher.flush()
+
+    def close(self):
+        """
+        Save pending changes and stop the background flusher, if any.
+
+        The store can still be used afterwards; changes are then saved
+        immediately.
+        """
+        if self._flusher is not None:
+            self._flusher.close()
+            self._flusher = None
+        self.wait_for_upgrade()
+        if self._audit is not None:
+            self._audit.close()
+
+    @_synchronized
+    def _upgrade_file(self):
+        # Any save since loading has already written the current schema
+        if self._file_schema_version < SCHEMA_VERSION:
+            self.save_to_file()
+
+    def wait_for_upgrade(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the background rewrite of an older schema file, if any.
+
+        Args:
+            timeout: Maximum seconds to wait (optional, waits until done if omitted)
+
+        Returns:
+            Whether the file is now in the current schema
+        """
+        if self._upgrade is not None:
+            self._upgrade.join(timeout)
+        return not self.get_schema_info()["upgrade_pending"]
+
+    @_synchronized
+    def get_schema_info(self) -> Dict[str, Any]:
+        """
+        Get the schema versions of this code and of the file on disk.
+
+        Returns:
+            Dictionary with 'schema_version' (written by this code),
+            'file_schema_version' (of the file as last loaded or saved) and
+            'upgrade_pending' (whether the file still has to be rewritten)
+        """
+        return {"schema_version": SCHEMA_VERSION, "file_schema_version": self._file_schema_version,
+                "upgrade_pending": self._file_schema_version < SCHEMA_VERSION}
+
+    def get_flush_stats(self) -> Dict[str, int]:
+        """
+        Get the number of background saves made and changes not saved yet.
+
+        Returns:
+            Dictionary with 'flushes' and 'pending' counts (both 0 when
+            changes are saved immediately)
+        """
+        if self._flusher is None:
+            return {"flushes": 0, "pending": 0}
+        return self._flusher.get_stats()
+
+    @_synchronized
+    def get_io_stats(self) -> Dict[str, int]:
+        """
+        Get the number of saves made and the bytes they wrote to disk.
+
+        Returns:
+            Dictionary with 'saves' and 'bytes_written' (after compression,
+            including the checksum file) since the store was opened
+        """
+        return {"saves": self._save_count, "bytes_written": self._bytes_written}
+
+    def _iter_json_chunks(self) -> Iterator[str]:
+        """
+        Encode the store as JSON text, one batch of task records at a time.
+        """
+        to_record = self._task_to_record
+        yield f'{{"schema_version": {SCHEMA_VERSION}, "tasks": {{'
+        separator = ""
+        for batch in batched(self._tasks.items(), REBUILD_BATCH_SIZE):
+            # Encoding a batch as one object and dropping its braces is much
+            # cheaper than one encoder call per record
+            records = {str(task_id): to_record(task) for task_id, task in batch}
+            yield separator + _RECORD_ENCODER.encode(records)[1:-1]
+            separator = ",\n"
+        yield f'}}, "next_id": {self._next_id}}}\n'
+
+    @_synchronized
+    def add_task(self, title: str, description: Optional[str] = None,
+                 tags: Union[str, Iterable[str], None] = None, project: Optional[str] = None,
+                 priority: str = "medium", due_date: Union[str, date, None] = None,
+                 blocked_by: Union[str, Iterable[int], None] = None) -> int:
         """
         Add a new task to storage.
 
         Args:
             title: The task title (required)
             description: The task description (optional)
+            tags: Tags as a list or comma-separated string (optional)
+            project: The project the task belongs to (optional)
+            priority: One of "low", "medium" or "high" (default "medium")
+            due_date: Due date as a date or YYYY-MM-DD string (optional)
+            blocked_by: IDs of existing tasks that must be done first, as a
+                list or comma-separated string (optional)
 
         Returns:
             The ID of the newly created task
+
+        Raises:
+            ValueError: If any of the values is invalid
         """
         task_id = self._next_id
-        task = Task(id=task_id, title=title, description=description, completed=False)
-        self._tasks[task_id] = task
+        blocked_by = normalize_blocked_by(blocked_by)
+        self._check_blockers(task_id, blocked_by)
+        task = Task(id=task_id, title=title, description=description, completed=False,
+                    updated_at=time.time(), tags=normalize_tags(tags), project=project or None,
+                    priority=priority, due_date=parse_due_date(due_date), blocked_by=blocked_by)
+        self._insert(task)
         self._next_id += 1
-        self.save_to_file()  # Save after each operation
+        self._history.record(("remove", task_id))
+        self._persist()  # Save after each operation
         return task_id
 
+    @_synchronized
+    def import_tasks(self, records: List[Dict[str, Any]]) -> List[int]:
+        """
+        Add many tasks at once, validating the whole batch in one pass.
+
+        The batch is all-or-nothing: if any record is invalid nothing is added.
+
+        Args:
+            records: Dictionaries with a 'title' and optional 'description',
+                'completed', 'tags', 'project', 'priority', 'due_date' and
+                'blocked_by' values; blockers must be tasks already in the store
+
+        Returns:
+            The IDs of the newly created tasks, in record order
+
+        Raises:
+            ValueError: If any record fails validation
+        """
+        for row, record in enumerate(records):
+            if "title" not in record:
+                raise ValueError(f"1 invalid record(s); record {row}: Each record needs a title")
+        titles = [record["title"] for record in records]
+        descriptions = [record.get("description") for record in records]
+        errors = validate_columns(titles, descriptions)
+        if errors:
+            row, message = errors[0]
+            raise ValueError(f"{len(errors)} invalid record(s); record {row}: {message}")
+
+        # The less common fields are checked per record before anything is added
+        extras = []
+        for row, record in enumerate(records):
+            try:
+                tags = normalize_tags(record.get("tags"))
+                project = record.get("project") or None
+                priority = record.get("priority", "medium")
+                due_date = parse_due_date(record.get("due_date"))
+                blocked_by = normalize_blocked_by(record.get("blocked_by"))
+                validate_tags(tags)
+                validate_project(project)
+                validate_priority(priority)
+                validate_blocked_by(blocked_by)
+                self._check_blockers(None, blocked_by)
+            except ValueError as e:
+                raise ValueError(f"1 invalid record(s); record {row}: {e}")
+            extras.append((tags, project, priority, due_date, blocked_by))
+
+        now = time.time()
+        task_ids = []
+        for record, title, description, (tags, project, priority, due_date, blocked_by) in zip(
+                records, titles, descriptions, extras):
+            task_id = self._next_id
+            self._insert(Task.from_trusted(id=task_id, title=title, description=description,
+                                           completed=bool(record.get("completed", False)),
+                                           updated_at=now, tags=tags, project=project,
+                                           priority=priority, due_date=due_date,
+                                           blocked_by=blocked_by))
+            self._next_id += 1
+            task_ids.append(task_id)
+
+        # The whole import is undone as one step
+        self._history.record(("batch", tuple(("remove", task_id) for task_id in task_ids)))
+        self._persist()  # One save for the whole batch
+        return task_ids
+
     def get_task(self, task_id: int) -> Optional[Task]:
         """
         Get a task by its ID.
@@ -95,39 +825,426 @@ class TaskStorage:
         """
         return self._tasks.get(task_id)
 
+    @_synchronized
     def get_all_tasks(self) -> List[Task]:
         """
         Get all tasks in storage.
 
+        The tasks are the live objects, which later changes update in place;
+        use snapshot() for a view that stays consistent while it is read.
+
         Returns:
             A list of all Task objects
         """
         return list(self._tasks.values())
 
-    def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None) -> bool:
+    def get_task_count(self) -> int:
+        """
+        Get the number of tasks in storage.
+
+        Returns:
+            The number of stored tasks
+        """
+        return len(self._tasks)
+
+    def iter_tasks(self, start_after_id: Optional[int] = None,
+                   filter: Optional[Callable[[Task], bool]] = None,
+                   order_by: str = "id") -> Iterator[Task]:
+        """
+        Stream tasks in the requested order without copying the task list.
+
+        The position is re-resolved from the last visited task on every step,
+        so tasks may be added, changed or deleted while a caller is iterating.
+
+        Args:
+            start_after_id: Only yield tasks positioned after this task ID (optional)
+            filter: Predicate a task must satisfy to be yielded (optional)
+            order_by: Name of the ordering to follow (default "id")
+
+        Returns:
+            An iterator of Task objects
+
+        Raises:
+            ValueError: If the ordering is unknown, or start_after_id is not
+                a stored task for an ordering other than "id"
+        """
+        if order_by == "id":
+            ids = self._iter_ids_from(start_after_id)
+        else:
+            ids = self._get_ordering(order_by).iter_ids(start_after_id)
+        return self._iter_tasks_for(ids, filter)
+
+    def _iter_ids_from(self, start_after_id: Optional[int]) -> Iterator[int]:
+        ids = self._ids
+        index = 0 if start_after_id is None else bisect_right(ids, start_after_id)
+        while index < len(ids):
+            task_id = ids[index]
+            yield task_id
+            index = bisect_right(ids, task_id)
+
+    def _iter_tasks_for(self, ids: Iterator[int],
+                        filter: Optional[Callable[[Task], bool]]) -> Iterator[Task]:
+        for task_id in ids:
+            task = self._tasks.get(task_id)  # None if another thread just deleted it
+            if task is not None and (filter is None or filter(task)):
+                yield task
+
+    @_synchronized
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get aggregate statistics without scanning the store.
+
+        Returns:
+            Dictionary of task counts, completion rates per project, counts
+            per priority and recent completion throughput; see TaskStats.snapshot
+        """
+        return self._get_stats().snapshot()
+
+    def get_orderings(self) -> List[str]:
+        """
+        Get the names of all orderings tasks can be listed in.
+
+        Returns:
+            A list of ordering names, starting with the natural "id" order
+        """
+        return ["id"] + list(self._ordering_keys)
+
+    def register_ordering(self, name: str, key: Callable[[Task], Any]):
+        """
+        Register an additional named ordering backed by a sorted index.
+
+        Args:
+            name: The name used to request the ordering
+            key: Function mapping a task to its sort key; ties are broken by ID
+
+        Raises:
+            ValueError: If an ordering with this name already exists
+        """
+        if name == "id" or name in self._ordering_keys:
+            raise ValueError(f"Ordering '{name}' already exists")
+        self._ordering_keys[name] = key
+
+    def _indexes(self) -> List[Any]:
+        """
+        All indexes that must be kept in step with task changes.
+        """
+        if self._tag_index is None:
+            return list(self._orderings.values())
+        return [*self._orderings.values(), self._tag_index, self._project_index,
+                self._priority_index, self._due_index]
+
+    def _get_ordering(self, name: str) -> SortedIndex:
+        index = self._orderings.get(name)
+        if index is None:
+            key = self._ordering_keys.get(name)
+            if key is None:
+                raise ValueError(f"Unknown ordering: {name}")
+            with self._lock:
+                index = self._orderings.get(name)
+                if index is None:
+                    index = SortedIndex(key)
+                    self._build([index])
+                    self._orderings[name] = index
+        return index
+
+    def _get_stats(self) -> TaskStats:
+        if self._stats is None:
+            stats = TaskStats()
+            self._build([stats])
+            self._listeners.append(stats.on_change)
+            self._stats = stats
+        return self._stats
+
+    def _get_dependencies(self) -> DependencyGraph:
+        if self._dependencies is None:
+            dependencies = DependencyGraph()
+            self._build([dependencies])
+            self._listeners.append(dependencies.on_change)
+            self._dependencies = dependencies
+        return self._dependencies
+
+    def _check_blockers(self, task_id: Optional[int], blocked_by: List[int]):
+        # Tasks without blockers need no check, so they do not build the graph
+        if blocked_by:
+            self._get_dependencies().check_blockers(task_id, blocked_by)
+
+    def _build_query_indexes(self):
+        if self._tag_index is not None:
+            return
+        self._tag_index = HashIndex(lambda task: task.tags)
+        self._project_index = HashIndex(lambda task: (task.project,))
+        self._priority_index = HashIndex(lambda task: (task.priority,))
+        self._due_index = SortedIndex(lambda task: task.due_date)
+        self._build([self._tag_index, self._project_index, self._priority_index, self._due_index])
+
+    @_synchronized
+    def get_tasks_page(self, limit: int, cursor: Optional[int] = None,
+                       filter: Optional[Callable[[Task], bool]] = None,
+                       order_by: str = "id") -> Tuple[List[Task], Optional[int]]:
+        """
+        Get one page of tasks using cursor-based paging.
+
+        Args:
+            limit: Maximum number of tasks in the page (must be positive)
+            cursor: The cursor returned with the previous page (optional)
+            filter: Predicate a task must satisfy to be included (optional)
+            order_by: Name of the ordering to follow (default "id")
+
+        Returns:
+            A tuple of the page's tasks and the cursor for the next page,
+            which is None once there are no more tasks
+        """
+        if limit < 1:
+            raise ValueError("Page limit must be a positive integer")
+
+        page = list(islice(self.iter_tasks(cursor, filter, order_by), limit + 1))
+        if len(page) > limit:
+            page = page[:limit]
+            return page, page[-1].id
+        return page, None
+
+    @_synchronized
+    def query_tasks(self, project: Optional[str] = None, tags: Union[str, Iterable[str], None] = None,
+                    priority: Optional[str] = None, due_before: Union[str, date, None] = None,
+                    due_after: Union[str, date, None] = None, overdue: bool = False,
+                    completed: Optional[bool] = None) -> List[Task]:
+        """
+        Find tasks matching all the given criteria, using the query indexes.
+
+        Each indexed criterion yields a set of candidate IDs; the sets are
+        intersected smallest first, so the cost follows the most selective
+        criterion rather than the size of the store.
+
+        Args:
+            project: Only tasks in this project (optional)
+            tags: Only tasks carrying all of these tags (optional)
+            priority: Only tasks with this priority (optional)
+            due_before: Only tasks due on or before this date (optional)
+            due_after: Only tasks due on or after this date (optional)
+            overdue: Only pending tasks whose due date has passed (default False)
+            completed: Only completed (True) or pending (False) tasks (optional)
+
+        Returns:
+            The matching tasks in ID order
+
+        Raises:
+            ValueError: If a date is not in YYYY-MM-DD format
+        """
+        due_before = parse_due_date(due_before)
+        due_after = parse_due_date(due_after)
+        if overdue:
+            # Overdue tasks are pending, so like task_filter, completed=True
+            # combined with overdue matches nothing
+            if completed:
+                return []
+            yesterday = date.fromordinal(date.today().toordinal() - 1)
+            due_before = yesterday if due_before is None else min(due_before, yesterday)
+            completed = False
+
+        self._build_query_indexes()
+        candidates: List[Set[int]] = []
+        if project is not None:
+            candidates.append(self._project_index.get(project))
+        for tag in normalize_tags(tags):
+            candidates.append(self._tag_index.get(tag))
+        if priority is not None:
+            candidates.append(self._priority_index.get(priority))
+        if due_before is not None or due_after is not None:
+            # The index range is half-open, so step past the inclusive end date
+            high = date.fromordinal(due_before.toordinal() + 1) if due_before is not None else None
+            candidates.append(set(self._due_index.range_ids(due_after, high)))
+
+        if candidates:
+            candidates.sort(key=len)
+            task_ids = sorted(candidates[0].intersection(*candidates[1:]))
+        else:
+            task_ids = self._ids
+
+        results = []
+        for task_id in task_ids:
+            task = self._tasks[task_id]
+            if completed is None or task.completed == completed:
+                results.append(task)
+        return results
+
+    @_synchronized
+    def get_tags(self) -> List[str]:
         """
-        Update a task's title and/or description.
+        Get every tag in use, alphabetically.
+        """
+        self._build_query_indexes()
+        return sorted(self._tag_index.values())
+
+    @_synchronized
+    def get_projects(self) -> List[str]:
+        """
+        Get every project in use, alphabetically.
+        """
+        self._build_query_indexes()
+        return sorted(self._project_index.values())
+
+    @_synchronized
+    def add_dependency(self, task_id: int, blocker_id: int) -> bool:
+        """
+        Mark a task as blocked by another task.
+
+        Args:
+            task_id: The ID of the task that has to wait
+            blocker_id: The ID of the task that must be done first
+
+        Returns:
+            True if the dependency was added, False if the task doesn't exist
+
+        Raises:
+            ValueError: If the blocker does not exist or would create a cycle
+        """
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        if blocker_id in task.blocked_by:
+            return True
+        return self.update_task(task_id, blocked_by=[*task.blocked_by, blocker_id])
+
+    @_synchronized
+    def remove_dependency(self, task_id: int, blocker_id: int) -> bool:
+        """
+        Remove a "blocked by" relation between two tasks.
+
+        Returns:
+            True if the dependency was removed, False if the task doesn't
+            exist or was not blocked by that task
+        """
+        task = self._tasks.get(task_id)
+        if task is None or blocker_id not in task.blocked_by:
+            return False
+        remaining = [other for other in task.blocked_by if other != blocker_id]
+        self._history.record(self._set_fields(task, {"blocked_by": remaining,
+                                                     "updated_at": time.time()}))
+        self._persist()  # Save after update
+        return True
+
+    def history(self, task_id: int) -> List[Dict[str, Any]]:
+        """
+        Get every recorded change to a task, oldest first, from the audit log.
+
+        Args:
+            task_id: The ID of the task, which may since have been deleted
+
+        Returns:
+            Entries with 'seq', 'at', 'actor', 'action', 'task_id' and
+            'changes' (field -> [old value, new value]); see AuditLog.history
+
+        Raises:
+            ValueError: If the store was opened without an audit_dir
+        """
+        if self._audit is None:
+            raise ValueError("Auditing is not enabled for this store")
+        return self._audit.history(task_id)
+
+    @_synchronized
+    def next_actionable(self, limit: Optional[int] = None) -> List[Task]:
+        """
+        Get the pending tasks whose blockers are all completed or deleted.
+
+        Only the ready tasks are looked at, however many tasks are blocked.
+
+        Args:
+            limit: Maximum number of tasks to return (optional)
+
+        Returns:
+            The ready tasks, highest priority first, then earliest due date
+            (tasks without one last), then ID
+        """
+        ready = (self._tasks[task_id] for task_id in self._get_dependencies().get_ready())
+        key = self._next_actionable_key
+        if limit is None:
+            return sorted(ready, key=key)
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        return heapq.nsmallest(limit, ready, key=key)
+
+    @staticmethod
+    def _next_actionable_key(task: Task) -> Tuple[int, bool, date, int]:
+        return (-PRIORITIES.index(task.priority), task.due_date is None,
+                task.due_date or date.max, task.id)
+
+    @_synchronized
+    def get_open_blockers(self, task_id: int) -> List[int]:
+        """
+        Get the IDs of the tasks still holding a task up.
+
+        Returns:
+            The task's blockers that exist and are pending; empty if the task
+            is ready or doesn't exist
+        """
+        return self._get_dependencies().get_open_blockers(task_id)
+
+    @_synchronized
+    def topological_order(self) -> List[int]:
+        """
+        Get every task ID in an order where each task comes after its blockers.
+        """
+        return self._get_dependencies().topological_order()
+
+    @_synchronized
+    def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None,
+                    tags: Union[str, Iterable[str], None] = None, project: Optional[str] = None,
+                    priority: Optional[str] = None, due_date: Union[str, date, None] = None,
+                    blocked_by: Union[str, Iterable[int], None] = None) -> bool:
+        """
+        Update a task's title, description, tags, project, priority, due date
+        and/or blockers.
 
         Args:
             task_id: The ID of the task to update
             title: New title (optional)
             description: New description (optional)
+            tags: New tags, replacing the current ones (optional)
+            project: New project, or "" to clear it (optional)
+            priority: New priority (optional)
+            due_date: New due date, or "" to clear it (optional)
+            blocked_by: New blocking task IDs, replacing the current ones;
+                [] or "" clears them (optional)
 
         Returns:
             True if the task was updated, False if task doesn't exist
+
+        Raises:
+            ValueError: If any of the new values is invalid, or a blocker
+                does not exist or would create a cycle
         """
         if task_id not in self._tasks:
             return False
 
-        task = self._tasks[task_id]
+        # Validate everything up front so a bad value can't leave a partial update
+        changes: Dict[str, Any] = {"updated_at": time.time()}
         if title is not None:
-            task.title = title
+            validate_title(title)
+            changes["title"] = title
         if description is not None:
-            task.description = description
+            validate_description(description)
+            changes["description"] = description
+        if tags is not None:
+            changes["tags"] = normalize_tags(tags)
+            validate_tags(changes["tags"])
+        if project is not None:
+            changes["project"] = project or None
+            validate_project(changes["project"])
+        if priority is not None:
+            validate_priority(priority)
+            changes["priority"] = priority
+        if due_date is not None:
+            changes["due_date"] = parse_due_date(due_date)
+        if blocked_by is not None:
+            changes["blocked_by"] = normalize_blocked_by(blocked_by)
+            validate_blocked_by(changes["blocked_by"])
+            self._check_blockers(task_id, changes["blocked_by"])
+        self._history.record(self._set_fields(self._tasks[task_id], changes))
 
-        self.save_to_file()  # Save after update
+        self._persist()  # Save after update
         return True
 
+    @_synchronized
     def delete_task(self, task_id: int) -> bool:
         """
         Delete a task by ID.
@@ -141,10 +1258,11 @@ class TaskStorage:
         if task_id not in self._tasks:
             return False
 
-        del self._tasks[task_id]
-        self.save_to_file()  # Save after deletion
+        self._history.record(("insert", self._remove(task_id)))
+        self._persist()  # Save after deletion
         return True
 
+    @_synchronized
     def toggle_task_status(self, task_id: int) -> bool:
         """
         Toggle the completion status of a task.
@@ -159,10 +1277,155 @@ class TaskStorage:
             return False
 
         task = self._tasks[task_id]
-        task.completed = not task.completed
-        self.save_to_file()  # Save after toggle
+        self._history.record(self._set_fields(task, {"completed": not task.completed,
+                                                     "updated_at": time.time()}))
+        self._persist()  # Save after toggle
         return True
 
+    @_synchronized
+    def undo(self) -> bool:
+        """
+        Reverse the most recent change.
+
+        Returns:
+            True if a change was undone, False if there was nothing to undo
+        """
+        operation = self._history.pop_undo()
+        if operation is None:
+            return False
+
+        self._history.push_redo(self._apply(operation))
+        self._persist()  # Undo is persisted like any other change
+        return True
+
+    @_synchronized
+    def redo(self) -> bool:
+        """
+        Re-apply the most recently undone change.
+
+        Returns:
+            True if a change was redone, False if there was nothing to redo
+        """
+        operation = self._history.pop_redo()
+        if operation is None:
+            return False
+
+        self._history.push_undo(self._apply(operation))
+        self._persist()  # Redo is persisted like any other change
+        return True
+
+    def can_undo(self) -> bool:
+        """
+        Check whether there is a change to undo.
+        """
+        return self._history.can_undo()
+
+    def can_redo(self) -> bool:
+        """
+        Check whether there is an undone change to redo.
+        """
+        return self._history.can_redo()
+
+    def _apply(self, operation: Operation) -> Operation:
+        """
+        Apply an operation and return the operation that reverses it.
+        """
+        kind = operation[0]
+        if kind == "remove":
+            return ("insert", self._remove(operation[1]))
+        if kind == "insert":
+            # Removed tasks are kept whole, so re-inserting restores every field
+            task = operation[1]
+            self._insert(task)
+            return ("remove", task.id)
+        if kind == "set":
+            return self._set_fields(self._tasks[operation[1]], operation[2])
+        if kind == "batch":
+            return ("batch", tuple(self._apply(child) for child in reversed(operation[1])))
+        raise ValueError(f"Unknown operation: {kind}")
+
+    def _insert(self, task: Task):
+        self._tasks[task.id] = task
+        if self._cow_tasks is not None:
+            self._cow_tasks = self._cow_tasks.set(task.id, FrozenTask.freeze(task))
+        insort(self._ids, task.id)
+        for index in self._indexes():
+            index.add(task)
+        self._bump_version(task.id)
+        self._notify("add", task, {})
+
+    def _remove(self, task_id: int) -> Task:
+        task = self._tasks.pop(task_id)
+        if self._cow_tasks is not None:
+            self._cow_tasks = self._cow_tasks.remove(task_id)
+        del self._ids[bisect_left(self._ids, task_id)]
+        for index in self._indexes():
+            index.remove(task_id)
+        self._versions.pop(task_id, None)
+        self._notify("delete", task, {})
+        return task
+
+    def _set_fields(self, task: Task, changes: Dict[str, Any]) -> Operation:
+        """
+        Assign fields on a task, keeping indexes in step.
+
+        Returns:
+            The "set" operation that restores the previous values
+        """
+        previous = {field: getattr(task, field) for field in changes}
+        for field, value in changes.items():
+            setattr(task, field, value)
+        self._tasks[task.id] = task  # Marks the task changed in a bounded-memory store
+        if self._cow_tasks is not None:
+            self._cow_tasks = self._cow_tasks.set(task.id, FrozenTask.freeze(task))
+        for index in self._indexes():
+            index.update(task)
+        self._bump_version(task.id)
+        self._notify("update", task, previous)
+        return ("set", task.id, previous)
+
+    def _bump_version(self, task_id: int):
+        self._change_seq += 1
+        self._versions[task_id] = self._change_seq
+
+    def get_task_version(self, task_id: int) -> int:
+        """
+        Get a version stamp that changes every time a task is changed.
+
+        Versions are unique across the store for the lifetime of this
+        object, so (task ID, version) identifies one state of a task.
+
+        Args:
+            task_id: The ID of the task
+
+        Returns:
+            The task's version; 0 if it has not changed since the store was loaded
+        """
+        return self._versions.get(task_id, 0)
+
+    def add_listener(self, listener: ChangeListener):
+        """
+        Register a function to be called after every change to the store.
+
+        Args:
+            listener: Called as listener(event, task, changes); see ChangeListener
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ChangeListener):
+        """
+        Unregister a listener added with add_listener.
+
+        Args:
+            listener: The listener to remove
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, task: Optional[Task], changes: Dict[str, Any]):
+        for listener in self._listeners:
+            listener(event, task, changes)
+
     def get_next_id(self) -> int:
         """
         Get the next available task ID.
@@ -0,0 +1,135 @@
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from .storage import TaskStorage
+
+TENANT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class TenantStore:
+    """
+    Named task lists (tenants), each in its own shard file and TaskStorage.
+
+    A tenant's shard is loaded on first access and kept in memory while it
+    is in use. At most max_loaded shards stay loaded; the least recently
+    used one is evicted when another is loaded, and shards idle for longer
+    than idle_seconds are evicted as well. Every TaskStorage saves after
+    each change, so eviction only drops the in-memory copy. Loading and
+    writing one tenant never touches another tenant's data.
+    """
+
+    def __init__(self, directory: str = "tenants", max_loaded: int = 16,
+                 idle_seconds: Optional[float] = None):
+        self.directory = directory
+        self.max_loaded = max_loaded
+        self.idle_seconds = idle_seconds
+        # Tenant -> (storage, last access time), least recently used first
+        self._loaded: "OrderedDict[str, Tuple[TaskStorage, float]]" = OrderedDict()
+        self.loads = 0
+        self.evictions = 0
+
+    def get_filename(self, tenant: str) -> str:
+        """
+        Get the shard file of a tenant.
+
+        Args:
+            tenant: The tenant name (letters, digits, '-' and '_', up to 64 characters)
+
+        Returns:
+            The path of the tenant's shard file
+
+        Raises:
+            ValueError: If the tenant name is invalid
+        """
+        if not isinstance(tenant, str) or not TENANT_NAME_PATTERN.match(tenant):
+            raise ValueError("Tenant name must be 1-64 letters, digits, '-' or '_'")
+        return os.path.join(self.directory, f"{tenant}.json")
+
+    def get(self, tenant: str) -> TaskStorage:
+        """
+        Get the storage of a tenant, loading its shard if needed.
+
+        Args:
+            tenant: The tenant name
+
+        Returns:
+            The tenant's TaskStorage
+
+        Raises:
+            ValueError: If the tenant name is invalid
+        """
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        entry = self._loaded.get(tenant)
+        if entry is not None:
+            self._loaded[tenant] = (entry[0], now)
+            self._loaded.move_to_end(tenant)
+            return entry[0]
+
+        filename = self.get_filename(tenant)
+        os.makedirs(self.directory, exist_ok=True)
+        storage = TaskStorage(filename)
+        self.loads += 1
+        self._loaded[tenant] = (storage, now)
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+            self.evictions += 1
+        return storage
+
+    def evict(self, tenant: str) -> bool:
+        """
+        Drop a tenant's shard from memory. Its file is left untouched.
+
+        Args:
+            tenant: The tenant name
+
+        Returns:
+            True if the tenant was loaded, False otherwise
+        """
+        if self._loaded.pop(tenant, None) is None:
+            return False
+        self.evictions += 1
+        return True
+
+    def _evict_idle(self, now: float):
+        if self.idle_seconds is None:
+            return
+        # Entries are in access order, so idle tenants are at the front
+        while self._loaded:
+            tenant, (_, last_access) = next(iter(self._loaded.items()))
+            if now - last_access <= self.idle_seconds:
+                break
+            self.evict(tenant)
+
+    def list_tenants(self) -> List[str]:
+        """
+        Get the names of all tenants with a shard file or loaded shard.
+
+        Returns:
+            Tenant names in alphabetical order
+        """
+        tenants = set(self._loaded)
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                tenant, extension = os.path.splitext(name)
+                if extension == ".json" and TENANT_NAME_PATTERN.match(tenant):
+                    tenants.add(tenant)
+        return sorted(tenants)
+
+    def loaded_tenants(self) -> List[str]:
+        """
+        Get the names of the tenants currently in memory.
+
+        Returns:
+            Tenant names, least recently used first
+        """
+        return list(self._loaded)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Number of loaded shards and load/eviction counters.
+        """
+        return {"loaded": len(self._loaded), "loads": self.loads, "evictions": self.evictions}
@@ -0,0 +1,239 @@
+"""
+Validation rules for task fields.
+
+Single values are checked with the validate_* functions, which the Task
+model runs whenever a field is assigned. Bulk imports use validate_columns,
+which checks whole columns of strings in one pass.
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+TITLE_MIN_LENGTH = 1
+TITLE_MAX_LENGTH = 200
+DESCRIPTION_MAX_LENGTH = 1000
+TAG_MAX_LENGTH = 50
+MAX_TAGS = 20
+PROJECT_MAX_LENGTH = 100
+PRIORITIES = ("low", "medium", "high")
+MAX_BLOCKERS = 50
+
+TITLE_ERROR = f"Title must be between {TITLE_MIN_LENGTH} and {TITLE_MAX_LENGTH} characters"
+DESCRIPTION_ERROR = f"Description must be at most {DESCRIPTION_MAX_LENGTH} characters"
+
+
+def validate_title(title: str):
+    """
+    Validate a task title.
+
+    Args:
+        title: The title to check
+
+    Raises:
+        ValueError: If the title length is out of range
+    """
+    if not (TITLE_MIN_LENGTH <= len(title) <= TITLE_MAX_LENGTH):
+        raise ValueError(TITLE_ERROR)
+
+
+def validate_description(description: Optional[str]):
+    """
+    Validate a task description.
+
+    Args:
+        description: The description to check (None means no description)
+
+    Raises:
+        ValueError: If the description is too long
+    """
+    if description and len(description) > DESCRIPTION_MAX_LENGTH:
+        raise ValueError(DESCRIPTION_ERROR)
+
+
+def validate_tags(tags: List[str]):
+    """
+    Validate a task's tag list.
+
+    Args:
+        tags: The tags to check
+
+    Raises:
+        ValueError: If there are too many tags or a tag length is out of range
+    """
+    if len(tags) > MAX_TAGS:
+        raise ValueError(f"A task can have at most {MAX_TAGS} tags")
+    for tag in tags:
+        if not (1 <= len(tag) <= TAG_MAX_LENGTH):
+            raise ValueError(f"Tags must be between 1 and {TAG_MAX_LENGTH} characters")
+
+
+def validate_project(project: Optional[str]):
+    """
+    Validate a task's project name.
+
+    Args:
+        project: The project to check (None means no project)
+
+    Raises:
+        ValueError: If the project name length is out of range
+    """
+    if project is not None and not (1 <= len(project) <= PROJECT_MAX_LENGTH):
+        raise ValueError(f"Project must be between 1 and {PROJECT_MAX_LENGTH} characters")
+
+
+def validate_priority(priority: str):
+    """
+    Validate a task's priority.
+
+    Args:
+        priority: The priority to check
+
+    Raises:
+        ValueError: If the priority is not one of PRIORITIES
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Priority must be one of: {', '.join(PRIORITIES)}")
+
+
+def validate_due_date(due_date: Optional[date]):
+    """
+    Validate a task's due date.
+
+    Args:
+        due_date: The due date to check (None means no due date)
+
+    Raises:
+        ValueError: If the due date is not a date
+    """
+    if due_date is not None and not isinstance(due_date, date):
+        raise ValueError("Due date must be a date")
+
+
+def validate_blocked_by(blocked_by: List[int]):
+    """
+    Validate the IDs of the tasks blocking a task.
+
+    Args:
+        blocked_by: The blocking task IDs
+
+    Raises:
+        ValueError: If there are too many, or an ID is not a positive integer or repeats
+    """
+    if len(blocked_by) > MAX_BLOCKERS:
+        raise ValueError(f"A task can be blocked by at most {MAX_BLOCKERS} tasks")
+    for task_id in blocked_by:
+        if not isinstance(task_id, int) or isinstance(task_id, bool) or task_id < 1:
+            raise ValueError("Blocking task IDs must be positive integers")
+    if len(set(blocked_by)) != len(blocked_by):
+        raise ValueError("Blocking task IDs must not repeat")
+
+
+def normalize_tags(tags: Union[str, Iterable[str], None]) -> List[str]:
+    """
+    Turn user input into a clean tag list.
+
+    Args:
+        tags: A list of tags or a comma-separated string
+
+    Returns:
+        Lowercased, stripped tags without blanks or duplicates, in input order
+    """
+    if tags is None:
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    normalized = (tag.strip().lower() for tag in tags)
+    return list(dict.fromkeys(tag for tag in normalized if tag))
+
+
+def normalize_blocked_by(blocked_by: Union[str, Iterable[int], None]) -> List[int]:
+    """
+    Turn user input into a list of blocking task IDs.
+
+    Args:
+        blocked_by: A list of task IDs or a comma-separated string of them
+
+    Returns:
+        The IDs, sorted and without duplicates
+
+    Raises:
+        ValueError: If an ID is not a number
+    """
+    if blocked_by is None:
+        return []
+    if isinstance(blocked_by, str):
+        blocked_by = [part for part in blocked_by.replace(",", " ").split()]
+    try:
+        return sorted({int(task_id) for task_id in blocked_by})
+    except (TypeError, ValueError):
+        raise ValueError("Blocking task IDs must be numbers")
+
+
+def parse_due_date(value: Union[str, date, None]) -> Optional[date]:
+    """
+    Turn user input into a due date.
+
+    Args:
+        value: A date, an ISO date string (YYYY-MM-DD), or None/"" for no due date
+
+    Returns:
+        The due date, or None
+
+    Raises:
+        ValueError: If the string is not a valid ISO date
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("Due date must be in YYYY-MM-DD format")
+
+
+# Validators the Task model runs when the matching attribute is assigned
+FIELD_VALIDATORS: Dict[str, Callable[[Any], None]] = {
+    "title": validate_title,
+    "description": validate_description,
+    "tags": validate_tags,
+    "project": validate_project,
+    "priority": validate_priority,
+    "due_date": validate_due_date,
+    "blocked_by": validate_blocked_by,
+}
+
+
+def validate_columns(titles: Sequence[str],
+                     descriptions: Sequence[Optional[str]]) -> List[Tuple[int, str]]:
+    """
+    Validate columns of titles and descriptions in one pass.
+
+    The lengths of each column are computed with map() and checked with
+    min()/max(), so a fully valid column never runs per-row Python code.
+    Rows are only inspected one by one when a column contains a violation.
+
+    Args:
+        titles: The title of every row
+        descriptions: The description of every row (None for no description)
+
+    Returns:
+        A list of (row index, error message) pairs, empty if every row is valid
+    """
+    errors: List[Tuple[int, str]] = []
+
+    title_lengths = list(map(len, titles))
+    if title_lengths and (min(title_lengths) < TITLE_MIN_LENGTH or max(title_lengths) > TITLE_MAX_LENGTH):
+        errors.extend(
+            (row, TITLE_ERROR) for row, length in enumerate(title_lengths)
+            if not (TITLE_MIN_LENGTH <= length <= TITLE_MAX_LENGTH)
+        )
+
+    if max(map(len, filter(None, descriptions)), default=0) > DESCRIPTION_MAX_LENGTH:
+        errors.extend(
+            (row, DESCRIPTION_ERROR) for row, description in enumerate(descriptions)
+            if description and len(description) > DESCRIPTION_MAX_LENGTH
+        )
+
+    errors.sort()
+    return errors
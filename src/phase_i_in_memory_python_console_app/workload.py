@@ -0,0 +1,547 @@
+"""
+Workload recording, synthesis and replay for load-testing the agent skill.
+
+A trace is a list of TodoAgentSkill calls, each with the time it was made
+relative to the start of the trace. Traces are recorded from a live skill
+with WorkloadRecorder or synthesized from an operation mix with
+synthesize_trace, saved as JSON lines, and replayed with replay() from
+several threads, processes or asyncio tasks against any store a skill
+factory builds.
+
+Run from the repository root:
+
+    python -m src.phase_i_in_memory_python_console_app.workload synthesize -n 100000 -o trace.jsonl
+    python -m src.phase_i_in_memory_python_console_app.workload replay trace.jsonl --workers 8
+"""
+
+import argparse
+import asyncio
+import functools
+import inspect
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from src.phase_i_in_memory_python_console_app.agent_skill import TodoAgentSkill
+from src.phase_i_in_memory_python_console_app.storage import TaskStorage
+
+READ_OPERATIONS = ("get_task", "view_tasks", "query_tasks", "get_stats")
+WRITE_OPERATIONS = ("add_task", "update_task", "mark_task_complete", "delete_task")
+# Relative weights of each operation within the reads and within the writes
+DEFAULT_MIX = {
+    "get_task": 6, "view_tasks": 2, "query_tasks": 2, "get_stats": 1,
+    "add_task": 5, "update_task": 3, "mark_task_complete": 2, "delete_task": 1,
+}
+REPLAY_MODES = ("threads", "processes", "asyncio")
+LOOP_MODES = ("closed", "open")
+PERCENTILES = (50, 90, 99, 99.9)
+PROJECTS = ("Work", "Home", "Errands", "Side project", None)
+TAGS = ("urgent", "later", "email", "phone", "review")
+
+# Per-call outcomes
+OK, FAILED, ERROR = 0, 1, 2
+
+
+@dataclass
+class TraceOperation:
+    """
+    One recorded or synthesized skill call.
+    """
+    at: float  # Seconds after the start of the trace
+    op: str  # TodoAgentSkill method name
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+def save_trace(trace: Iterable[TraceOperation], path: str) -> int:
+    """
+    Write a trace as JSON lines.
+
+    Returns:
+        The number of operations written
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for count, operation in enumerate(trace, 1):
+            f.write(json.dumps({"at": round(operation.at, 6), "op": operation.op,
+                                "args": operation.args}, ensure_ascii=False) + "\n")
+    return count
+
+
+def load_trace(path: str) -> List[TraceOperation]:
+    """
+    Read a trace written by save_trace.
+
+    Raises:
+        ValueError: If a line is not a trace operation
+    """
+    trace = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                trace.append(TraceOperation(float(record["at"]), record["op"], record.get("args", {})))
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid trace line {line_number}: {e}")
+    return trace
+
+
+class WorkloadRecorder:
+    """
+    Wraps a TodoAgentSkill and records every public method call made
+    through it, with its arguments and timing, while passing the call on.
+
+    Replaying a recorded trace against a copy of the store as it was when
+    recording started reproduces the same task IDs.
+    """
+
+    def __init__(self, skill: TodoAgentSkill, clock: Callable[[], float] = time.monotonic):
+        self.skill = skill
+        self.trace: List[TraceOperation] = []
+        self._clock = clock
+        self._start = clock()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.skill, name)
+        if name.startswith("_") or not inspect.ismethod(attribute):
+            return attribute
+        signature = inspect.signature(attribute)
+
+        @functools.wraps(attribute)
+        def recorded(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs).arguments
+            with self._lock:
+                self.trace.append(TraceOperation(self._clock() - self._start, name, dict(arguments)))
+            return attribute(*args, **kwargs)
+        return recorded
+
+    def save(self, path: str) -> int:
+        """
+        Write the calls recorded so far to a JSON lines file.
+
+        Returns:
+            The number of operations written
+        """
+        with self._lock:
+            return save_trace(list(self.trace), path)
+
+
+def _zipf_keys(rng: random.Random, key_space: int, skew: float) -> Callable[[], int]:
+    """
+    Sampler of task IDs 1..key_space where the k-th most popular ID is
+    drawn with probability proportional to 1 / k ** skew (uniform at 0).
+    Popular IDs are spread over the ID range rather than being the oldest.
+    """
+    ids = list(range(1, key_space + 1))
+    rng.shuffle(ids)
+    cum_weights = list(accumulate(1 / rank ** skew for rank in range(1, key_space + 1)))
+    return lambda: rng.choices(ids, cum_weights=cum_weights)[0]
+
+
+def synthesize_trace(count: int, read_ratio: float = 0.8, skew: float = 1.0,
+                     key_space: int = 1000, rate: Optional[float] = None,
+                     mix: Optional[Dict[str, float]] = None,
+                     seed: Optional[int] = None) -> List[TraceOperation]:
+    """
+    Generate a trace from an operation mix.
+
+    Args:
+        count: Number of operations
+        read_ratio: Fraction of operations that are reads, from 0 to 1
+        skew: Zipf exponent of the task IDs that reads and writes address
+            (0 for uniform access; around 1 for a few hot tasks)
+        key_space: Number of existing task IDs (1..key_space) to address;
+            populate() an empty store with as many tasks before replaying
+        rate: Mean operations per second, with Poisson arrivals, for open
+            loop replays (optional; every operation is due at once if omitted)
+        mix: Relative weights of operations within the reads and within the
+            writes (optional, DEFAULT_MIX if omitted)
+        seed: Random seed, for reproducible traces (optional)
+
+    Returns:
+        The trace operations, in time order
+
+    Raises:
+        ValueError: If an argument is out of range or the mix names an unknown operation
+    """
+    if count < 0 or key_space < 1:
+        raise ValueError("Operation count must not be negative and key space must be positive")
+    if not 0 <= read_ratio <= 1:
+        raise ValueError("Read ratio must be between 0 and 1")
+    if skew < 0 or (rate is not None and rate <= 0):
+        raise ValueError("Skew must not be negative and rate must be positive")
+    mix = DEFAULT_MIX if mix is None else mix
+    unknown = set(mix) - set(READ_OPERATIONS) - set(WRITE_OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in mix: {', '.join(sorted(unknown))}")
+
+    weights = {}
+    for operations, share in ((READ_OPERATIONS, read_ratio), (WRITE_OPERATIONS, 1 - read_ratio)):
+        total = sum(mix.get(op, 0) for op in operations)
+        if share and not total:
+            raise ValueError(f"Mix has no weight for any of: {', '.join(operations)}")
+        for op in operations:
+            if mix.get(op, 0) and share:
+                weights[op] = share * mix[op] / total
+    names = list(weights)
+
+    rng = random.Random(seed)
+    key = _zipf_keys(rng, key_space, skew)
+    argument_makers: Dict[str, Callable[[int], Dict[str, Any]]] = {
+        "get_task": lambda n: {"task_id": key()},
+        "view_tasks": lambda n: {"limit": 20, "cursor": rng.choice((None, key()))},
+        "query_tasks": lambda n: {"project": rng.choice(PROJECTS[:-1]), "completed": False},
+        "get_stats": lambda n: {},
+        "add_task": lambda n: {"title": f"Synthetic task {n}", "tags": rng.sample(TAGS, rng.randint(0, 2)),
+                               "project": rng.choice(PROJECTS),
+                               "priority": rng.choice(("low", "medium", "high"))},
+        "update_task": lambda n: {"task_id": key(), "title": f"Updated task {n}"},
+        "mark_task_complete": lambda n: {"task_id": key()},
+    }
+
+    # Deletes remove tasks added earlier in the trace (IDs key_space + 1
+    # onwards on a store populated with key_space tasks), so the hot
+    # existing tasks stay in place for the rest of the trace
+    added: List[int] = []
+    adds = 0
+    trace = []
+    at = 0.0
+    for n, op in enumerate(rng.choices(names, weights=[weights[name] for name in names], k=count)):
+        if rate is not None:
+            at += rng.expovariate(rate)
+        if op == "delete_task" and not added:
+            op = "add_task"
+        if op == "delete_task":
+            index = rng.randrange(len(added))
+            added[index], added[-1] = added[-1], added[index]
+            args = {"task_id": added.pop()}
+        else:
+            args = argument_makers[op](n)
+            if op == "add_task":
+                adds += 1
+                added.append(key_space + adds)
+        trace.append(TraceOperation(at, op, args))
+    return trace
+
+
+def populate(storage: TaskStorage, count: int, seed: Optional[int] = None) -> List[int]:
+    """
+    Bulk-add synthetic tasks to a store, e.g. the key space of a synthesized trace.
+
+    Returns:
+        The IDs of the added tasks
+    """
+    rng = random.Random(seed)
+    return storage.import_tasks([
+        {"title": f"Existing task {n}", "tags": rng.sample(TAGS, rng.randint(0, 2)),
+         "project": rng.choice(PROJECTS), "priority": rng.choice(("low", "medium", "high"))}
+        for n in range(1, count + 1)
+    ])
+
+
+@dataclass
+class ReplayReport:
+    """
+    Results of a replay. Latencies are in milliseconds.
+    """
+    operations: int
+    failures: int  # Calls that returned success False
+    errors: int  # Calls that raised
+    seconds: float
+    throughput: float  # Operations per second
+    latency: Dict[str, float]  # "p50", "p90", "p99", "p99.9" and "max"
+    per_operation: Dict[str, Dict[str, float]]  # "count", "p50" and "p99" per operation
+    saves: int
+    bytes_written: int
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+# A worker's results: (operation, latency in seconds, outcome) per call, and its run time
+WorkerResult = Tuple[List[Tuple[str, float, int]], float]
+
+
+def _call(skill: TodoAgentSkill, operation: TraceOperation) -> int:
+    try:
+        result = getattr(skill, operation.op)(**operation.args)
+    except Exception:
+        return ERROR
+    return FAILED if isinstance(result, dict) and result.get("success") is False else OK
+
+
+def _run_worker(skill: TodoAgentSkill, trace: List[TraceOperation], loop: str,
+                speed: float) -> WorkerResult:
+    """
+    Replay a share of the trace on the calling thread.
+
+    Open loop calls are issued at their trace time, and their latency is
+    counted from that time rather than from when the call actually started,
+    so a backlog behind a slow call shows up in the latency instead of
+    hiding in a lower request rate.
+    """
+    samples = []
+    clock = time.perf_counter
+    start = clock()
+    for operation in trace:
+        if loop == "open":
+            issued = start + operation.at / speed
+            delay = issued - clock()
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            issued = clock()
+        outcome = _call(skill, operation)
+        samples.append((operation.op, clock() - issued, outcome))
+    skill.storage.flush()
+    return samples, clock() - start
+
+
+async def _run_task(skill: TodoAgentSkill, trace: List[TraceOperation], loop: str,
+                    speed: float, start: float) -> WorkerResult:
+    # Skill calls run inline on the event loop, as in an asyncio agent server
+    samples = []
+    clock = time.perf_counter
+    for operation in trace:
+        if loop == "open":
+            issued = start + operation.at / speed
+            delay = issued - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            issued = clock()
+            await asyncio.sleep(0)  # Let the other tasks take turns
+        outcome = _call(skill, operation)
+        samples.append((operation.op, clock() - issued, outcome))
+    skill.storage.flush()
+    return samples, clock() - start
+
+
+def _process_worker(skill_factory: Callable[..., TodoAgentSkill], worker: int,
+                    trace: List[TraceOperation], loop: str, speed: float, barrier, results):
+    skill = skill_factory(worker=worker)
+    before = skill.storage.get_io_stats()
+    barrier.wait()
+    samples, seconds = _run_worker(skill, trace, loop, speed)
+    after = skill.storage.get_io_stats()
+    results.put((samples, seconds, {name: after[name] - before[name] for name in after}))
+
+
+def replay(trace: List[TraceOperation], skill_factory: Callable[[], TodoAgentSkill],
+           workers: int = 4, mode: str = "threads", loop: str = "closed",
+           speed: float = 1.0) -> ReplayReport:
+    """
+    Replay a trace and measure throughput, latency and storage writes.
+
+    The trace is dealt round-robin to the workers. A closed loop replay
+    issues each worker's next call as soon as its previous one returns; an
+    open loop replay issues every call at its trace time, whether or not
+    earlier calls have finished.
+
+    Args:
+        trace: The operations to replay
+        skill_factory: Builds the skill each worker calls; it decides the
+            storage backend. With "processes" it must be picklable (e.g. a
+            functools.partial of a module-level function) and is called in
+            each worker process with the worker's index as the worker
+            keyword. Processes cannot share one in-memory store, so each
+            should open its own file, as make_skill does
+        workers: Number of threads, processes or asyncio tasks
+        mode: "threads", "processes" or "asyncio"
+        loop: "closed" or "open"
+        speed: Trace time multiplier for open loop replays (2 replays twice as fast)
+
+    Returns:
+        A ReplayReport; bytes written count the saves of every distinct store the workers used
+
+    Raises:
+        ValueError: If the mode, loop, worker count or speed is invalid
+    """
+    if mode not in REPLAY_MODES:
+        raise ValueError(f"Replay mode must be one of: {', '.join(REPLAY_MODES)}")
+    if loop not in LOOP_MODES:
+        raise ValueError(f"Loop must be one of: {', '.join(LOOP_MODES)}")
+    if workers < 1 or speed <= 0:
+        raise ValueError("Workers and speed must be positive")
+    shares = [trace[i::workers] for i in range(workers)]
+
+    if mode == "processes":
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(workers)
+        queue = context.Queue()
+        processes = [context.Process(target=_process_worker,
+                                     args=(skill_factory, worker, share, loop, speed, barrier, queue))
+                     for worker, share in enumerate(shares)]
+        for process in processes:
+            process.start()
+        outcomes = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+        results = [(samples, seconds) for samples, seconds, _ in outcomes]
+        io = {"saves": sum(stats["saves"] for _, _, stats in outcomes),
+              "bytes_written": sum(stats["bytes_written"] for _, _, stats in outcomes)}
+    else:
+        skills = [skill_factory() for _ in range(workers)]
+        storages = list({id(skill.storage): skill.storage for skill in skills}.values())
+        before = [storage.get_io_stats() for storage in storages]
+        if mode == "threads":
+            results: List[Optional[WorkerResult]] = [None] * workers
+            barrier = threading.Barrier(workers)
+
+            def run(index: int):
+                barrier.wait()
+                results[index] = _run_worker(skills[index], shares[index], loop, speed)
+
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        else:
+            async def run_all() -> List[WorkerResult]:
+                start = time.perf_counter()
+                return await asyncio.gather(*(_run_task(skill, share, loop, speed, start)
+                                              for skill, share in zip(skills, shares)))
+            results = asyncio.run(run_all())
+        after = [storage.get_io_stats() for storage in storages]
+        io = {name: sum(stats[name] for stats in after) - sum(stats[name] for stats in before)
+              for name in ("saves", "bytes_written")}
+
+    return _build_report(results, io)
+
+
+def _build_report(results: List[WorkerResult], io: Dict[str, int]) -> ReplayReport:
+    by_operation: Dict[str, List[float]] = {}
+    latencies = []
+    counts = [0, 0, 0]
+    for samples, _ in results:
+        for op, latency, outcome in samples:
+            latencies.append(latency * 1000)
+            by_operation.setdefault(op, []).append(latency * 1000)
+            counts[outcome] += 1
+    latencies.sort()
+    seconds = max((seconds for _, seconds in results), default=0.0)
+    per_operation = {}
+    for op, values in sorted(by_operation.items()):
+        values.sort()
+        per_operation[op] = {"count": len(values), "p50": _percentile(values, 50),
+                             "p99": _percentile(values, 99)}
+    latency = {f"p{percent:g}": _percentile(latencies, percent) for percent in PERCENTILES}
+    latency["max"] = latencies[-1] if latencies else 0.0
+    return ReplayReport(operations=len(latencies), failures=counts[FAILED], errors=counts[ERROR],
+                        seconds=seconds, throughput=len(latencies) / seconds if seconds else 0.0,
+                        latency=latency, per_operation=per_operation,
+                        saves=io["saves"], bytes_written=io["bytes_written"])
+
+
+def format_report(report: ReplayReport) -> str:
+    """
+    Render a replay report as a plain text summary.
+    """
+    lines = [
+        f"Operations:    {report.operations} ({report.failures} failed, {report.errors} raised)",
+        f"Duration:      {report.seconds:.2f} s",
+        f"Throughput:    {report.throughput:,.0f} ops/s",
+        "Latency (ms):  " + "  ".join(f"{name} {value:.3f}" for name, value in report.latency.items()),
+        f"Storage:       {report.bytes_written / 1024 / 1024:.1f} MiB written in {report.saves} saves",
+        "",
+        f"{'Operation':<22}{'Count':>10}{'p50 ms':>12}{'p99 ms':>12}",
+    ]
+    for op, stats in report.per_operation.items():
+        lines.append(f"{op:<22}{stats['count']:>10}{stats['p50']:>12.3f}{stats['p99']:>12.3f}")
+    return "\n".join(lines)
+
+
+def make_skill(filename: str, compression: Optional[str] = None,
+               flush_interval_ms: Optional[int] = None, worker: Optional[int] = None) -> TodoAgentSkill:
+    """
+    Skill factory for file-backed stores, usable with every replay mode.
+
+    Given a worker index, as replay passes to each worker process, the
+    skill works on a fresh copy of the store in filename + ".<worker>", so
+    processes do not overwrite each other's saves in one file.
+    """
+    if worker is not None:
+        copy = f"{filename}.{worker}"
+        for suffix in ("", ".sha256"):  # With its checksum, the copy loads without validation
+            if os.path.exists(filename + suffix):
+                shutil.copyfile(filename + suffix, copy + suffix)
+        filename = copy
+    return TodoAgentSkill(storage=TaskStorage(filename, compression=compression,
+                                              flush_interval_ms=flush_interval_ms))
+
+
+def _shared_skill_factory(filename: str, compression: Optional[str],
+                          flush_interval_ms: Optional[int]) -> Callable[[], TodoAgentSkill]:
+    # Thread and asyncio workers share one store, as the sessions of a SkillPool do
+    storage = TaskStorage(filename, compression=compression, flush_interval_ms=flush_interval_ms)
+    return lambda: TodoAgentSkill(storage=storage)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Record, synthesize and replay agent skill workloads")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    synthesize = commands.add_parser("synthesize", help="generate a trace from an operation mix")
+    synthesize.add_argument("-n", "--count", type=int, default=10000, help="number of operations")
+    synthesize.add_argument("-o", "--output", required=True, help="trace file to write")
+    synthesize.add_argument("--read-ratio", type=float, default=0.8, help="fraction of reads")
+    synthesize.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of task access")
+    synthesize.add_argument("--key-space", type=int, default=1000, help="number of existing tasks addressed")
+    synthesize.add_argument("--rate", type=float, help="mean operations per second, for open loop replays")
+    synthesize.add_argument("--seed", type=int, help="random seed")
+
+    run = commands.add_parser("replay", help="replay a trace and report throughput and latency")
+    run.add_argument("trace", help="trace file to replay")
+    run.add_argument("--file", help="task store to replay against (default: a temporary store)")
+    run.add_argument("--populate", type=int, default=0,
+                     help="add this many tasks to the store first, e.g. the trace's key space")
+    run.add_argument("--workers", type=int, default=4, help="number of concurrent workers")
+    run.add_argument("--mode", choices=REPLAY_MODES, default="threads")
+    run.add_argument("--loop", choices=LOOP_MODES, default="closed")
+    run.add_argument("--speed", type=float, default=1.0, help="open loop trace time multiplier")
+    run.add_argument("--compression", choices=["gzip", "lzma", "zstd"], help="store compression")
+    run.add_argument("--flush-interval-ms", type=int, help="save changes in the background")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "synthesize":
+            trace = synthesize_trace(args.count, args.read_ratio, args.skew, args.key_space,
+                                     args.rate, seed=args.seed)
+            print(f"Wrote {save_trace(trace, args.output)} operations to {args.output}")
+            return
+
+        trace = load_trace(args.trace)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = args.file or os.path.join(tmp_dir, "tasks.json")
+            if args.populate:
+                storage = TaskStorage(filename, compression=args.compression)
+                populate(storage, args.populate)
+            if args.mode == "processes":
+                factory = functools.partial(make_skill, filename, args.compression,
+                                            args.flush_interval_ms)
+            else:
+                factory = _shared_skill_factory(filename, args.compression, args.flush_interval_ms)
+            report = replay(trace, factory, args.workers, args.mode, args.loop, args.speed)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"Error: {e}")
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
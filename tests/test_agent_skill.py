@@ -5,10 +5,23 @@ Test script to verify the agent skill functionality for reusable intelligence.
 
 import sys
 import os
+import tempfile
+import threading
 # Add the src directory to the path so we can import the modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from phase_i_in_memory_python_console_app.agent_skill import TodoAgentSkill
+from phase_i_in_memory_python_console_app.agent_skill import SkillPool, TodoAgentSkill
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+from phase_i_in_memory_python_console_app.tenants import TenantStore
+from phase_i_in_memory_python_console_app.workload import (
+    WorkloadRecorder,
+    load_trace,
+    make_skill,
+    populate,
+    replay,
+    save_trace,
+    synthesize_trace
+)
 
 
 def test_agent_skill():
@@ -114,12 +127,379 @@ def test_agent_skill_validation():
     print("All validation tests passed!\n")
 
 
+def test_agent_skill_paging():
+    """Test paging through tasks with the agent skill"""
+    print("Testing agent skill paging...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        skill = TodoAgentSkill(os.path.join(tmp_dir, "tasks.json"))
+        for i in range(5):
+            skill.add_task(f"Task {i}")
+
+        result = skill.view_tasks(limit=2)
+        assert result["success"] == True
+        assert [task["id"] for task in result["tasks"]] == [1, 2]
+        assert result["next_cursor"] == 2
+
+        result = skill.view_tasks(limit=10, cursor=result["next_cursor"])
+        assert [task["id"] for task in result["tasks"]] == [3, 4, 5]
+        assert result["next_cursor"] is None
+        print("PASS: Agent skill - Paging works")
+
+        result = skill.view_tasks(limit=0)
+        assert result["success"] == False
+        print("PASS: Agent skill - Invalid page limit is reported")
+
+    print("All paging tests passed!\n")
+
+
+def test_agent_skill_undo_redo():
+    """Test undo and redo through the agent skill"""
+    print("Testing agent skill undo/redo...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        skill = TodoAgentSkill(os.path.join(tmp_dir, "tasks.json"))
+        task_id = skill.add_task("Keep me")["task_id"]
+        skill.delete_task(task_id)
+
+        result = skill.undo()
+        assert result["success"] == True
+        assert skill.get_task(task_id)["success"] == True
+        print("PASS: Agent skill - Undo works")
+
+        result = skill.redo()
+        assert result["success"] == True
+        assert skill.get_task(task_id)["success"] == False
+        assert skill.redo()["success"] == False
+        print("PASS: Agent skill - Redo works")
+
+    print("All undo/redo tests passed!\n")
+
+
+def test_agent_skill_queries():
+    """Test task fields and queries through the agent skill"""
+    print("Testing agent skill queries...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        skill = TodoAgentSkill(os.path.join(tmp_dir, "tasks.json"))
+        result = skill.add_task("Fix bug", tags=["work", "urgent"], project="App",
+                                priority="high", due_date="2020-05-01")
+        assert result["success"] == True
+        task_id = result["task_id"]
+        skill.add_task("Plan trip", project="Personal")
+
+        task = skill.get_task(task_id)["task"]
+        assert task["tags"] == ["work", "urgent"] and task["due_date"] == "2020-05-01"
+        print("PASS: Task fields are returned")
+
+        result = skill.query_tasks(project="App", tags=["urgent"], overdue=True)
+        assert [t["id"] for t in result["tasks"]] == [task_id]
+        print("PASS: Query tasks works")
+
+        assert task["blocked_by"] == []
+        blocked = skill.add_task("Release", blocked_by=[task_id])["task_id"]
+        assert [t["id"] for t in skill.next_actionable()["tasks"]] == [task_id, task_id + 1]
+        assert skill.add_dependency(task_id, blocked)["success"] == False
+        assert skill.remove_dependency(blocked, task_id)["success"] == True
+        assert skill.get_task(blocked)["task"]["blocked_by"] == []
+        assert skill.add_dependency(blocked, task_id + 1)["success"] == True
+        skill.delete_task(blocked)
+        print("PASS: Dependencies work")
+
+        assert skill.update_task(task_id, priority="low")["success"] == True
+        assert skill.get_task(task_id)["task"]["priority"] == "low"
+        assert skill.update_task(task_id, due_date="soon")["success"] == False
+        assert skill.query_tasks(due_before="not a date")["success"] == False
+        print("PASS: Invalid field values are reported")
+
+        skill.mark_task_complete(task_id)
+        stats = skill.get_stats()["stats"]
+        assert stats["total"] == 2 and stats["completed"] == 1
+        assert stats["by_project"]["App"]["completion_rate"] == 1.0
+        print("PASS: Get stats works")
+
+        path = os.path.join(tmp_dir, "tasks.csv")
+        result = skill.export("csv", path, project="App")
+        assert result["success"] == True and result["count"] == 1
+        with open(path, encoding='utf-8') as f:
+            assert f.read().splitlines()[1].startswith(f"{task_id},Fix bug")
+        result = skill.export("md", order_by="title")
+        assert result["count"] == 2 and result["content"].splitlines()[2].startswith(f"| {task_id} |")
+        assert skill.export("pdf")["success"] == False
+        print("PASS: Export works")
+
+    print("All agent skill query tests passed!\n")
+
+
+def test_agent_skill_schedules():
+    """Test reminders and repeating tasks through the agent skill"""
+    print("Testing agent skill schedules...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        skill = TodoAgentSkill(os.path.join(tmp_dir, "tasks.json"))
+        task_id = skill.add_task("Call dentist")["task_id"]
+
+        result = skill.add_reminder(task_id, "2020-01-01 09:00", "Book a checkup")
+        assert result["success"] == True
+        assert skill.add_reminder(task_id, "tomorrow")["success"] == False
+        assert skill.add_recurring_task("Water plants", "every 2 days", start="2020-01-01")["success"] == True
+        assert skill.add_recurring_task("Bad", "hourly")["success"] == False
+        schedules = skill.get_schedules()["schedules"]
+        assert [s["kind"] for s in schedules] == ["reminder", "recurring"]
+        assert schedules[1]["task"]["title"] == "Water plants"
+        print("PASS: Reminders and repeating tasks are scheduled")
+
+        events = skill.get_due_events()["events"]
+        assert [(e["kind"], e["message"]) for e in events] == [("reminder", "Book a checkup"),
+                                                               ("recurring", "Water plants")]
+        assert skill.get_task(events[1]["task_id"])["task"]["title"] == "Water plants"
+        assert skill.get_due_events()["events"] == []
+        print("PASS: Due events are delivered once")
+
+        other = TodoAgentSkill(os.path.join(tmp_dir, "tasks.json"))
+        repeat_id = other.get_schedules()["schedules"][0]["id"]
+        assert other.cancel_schedule(repeat_id)["success"] == True
+        assert other.cancel_schedule(repeat_id)["success"] == False
+        print("PASS: Schedules persist and can be cancelled")
+
+    print("All agent skill schedule tests passed!\n")
+
+
+def test_agent_skill_duplicates():
+    """Test near-duplicate handling in the agent skill"""
+    print("Testing agent skill duplicates...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        skill = TodoAgentSkill(filename)
+        first = skill.add_task("Renew passport", "Book an appointment")["task_id"]
+        result = skill.add_task("renew passport!", "book an appointment")
+        assert result["success"] == True and "duplicates" not in result
+        second = result["task_id"]
+        skill.add_task("Water the plants")
+
+        groups = skill.find_duplicates()["groups"]
+        assert [[task["id"] for task in group] for group in groups] == [[first, second]]
+        print("PASS: Find duplicates works")
+
+        flagging = TodoAgentSkill(filename, duplicates="flag")
+        result = flagging.add_task("Renew the passport", "Book an appointment")
+        assert result["success"] == True
+        assert [match["id"] for match in result["duplicates"]][:1] == [first]
+        print("PASS: Near-duplicates are flagged")
+
+        rejecting = TodoAgentSkill(filename, duplicates="reject")
+        result = rejecting.add_task("Water the plants!")
+        assert result["success"] == False and result["duplicates"][0]["title"] == "Water the plants"
+        assert rejecting.add_task("Buy stamps")["success"] == True
+        print("PASS: Near-duplicates are rejected")
+
+        related = skill.find_related("passport appointment", k=2)
+        assert related["success"] == True and related["tasks"][0]["id"] == first
+        assert len(related["tasks"]) == 2 and 0 < related["tasks"][0]["score"] <= 1
+        skill.add_task("Appointment for the new passport photo")
+        assert len(skill.find_related("passport photo")["tasks"]) == 3
+        print("PASS: Related tasks are found by meaning")
+
+        try:
+            TodoAgentSkill(filename, duplicates="merge")
+            assert False, "Should have raised ValueError for an unknown mode"
+        except ValueError:
+            print("PASS: Unknown duplicate modes are rejected")
+
+    print("All agent skill duplicate tests passed!\n")
+
+
+def test_agent_skill_tenants():
+    """Test addressing separate tenants through the agent skill"""
+    print("Testing agent skill tenants...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tenants = TenantStore(os.path.join(tmp_dir, "tenants"), max_loaded=1)
+        alice = TodoAgentSkill(tenant="alice", tenants=tenants)
+        bob = alice.for_tenant("bob")
+
+        alice.add_task("Alice's task")
+        bob.add_task("Bob's task")
+        bob.add_task("Another task")
+        assert [t["title"] for t in alice.view_tasks()["tasks"]] == ["Alice's task"]
+        assert len(bob.view_tasks()["tasks"]) == 2
+        print("PASS: Tenants have separate task lists")
+
+        assert tenants.loaded_tenants() == ["bob"]
+        assert os.path.exists(os.path.join(tmp_dir, "tenants", "alice.json"))
+        print("PASS: Idle tenants are evicted and reloaded on demand")
+
+        try:
+            TodoAgentSkill(tenant="../etc", tenants=tenants)
+            assert False, "Should have raised ValueError for an invalid tenant name"
+        except ValueError:
+            print("PASS: Invalid tenant names are rejected")
+
+    print("All agent skill tenant tests passed!\n")
+
+
+def test_agent_skill_audit():
+    """Test task history through the agent skill"""
+    print("Testing agent skill audit log...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        skill = TodoAgentSkill(os.path.join(tmp_dir, "tasks.json"), actor="planner",
+                               audit_dir=os.path.join(tmp_dir, "audit"))
+        task_id = skill.add_task("Draft plan")["task_id"]
+        skill.update_task(task_id, description="First draft")
+        skill.mark_task_complete(task_id)
+        skill.storage.update_task(task_id, title="Final plan")
+
+        history = skill.history(task_id)["history"]
+        assert [entry["action"] for entry in history] == ["add", "update", "update", "update"]
+        assert [entry["actor"] for entry in history[:3]] == ["planner"] * 3
+        assert history[3]["actor"] != "planner" and "T" in history[0]["at"]
+        assert history[1]["changes"] == {"description": [None, "First draft"]}
+        print("PASS: History records the skill's actor and changes")
+
+        assert TodoAgentSkill(os.path.join(tmp_dir, "other.json")).history(task_id)["success"] == False
+        print("PASS: History without an audit log is reported")
+
+    print("All agent skill audit tests passed!\n")
+
+
+def test_skill_pool():
+    """Test concurrent sessions through a pool of skills sharing one store"""
+    print("Testing skill pool...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        pool = SkillPool(filename, size=3, semantic=True)
+
+        def run_session(session: int):
+            with pool.session(timeout=10) as skill:
+                for i in range(50):
+                    assert skill.add_task(f"Session {session} task {i}")["success"] == True
+                skill.view_tasks(limit=10)
+
+        threads = [threading.Thread(target=run_session, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with pool.session() as skill:
+            tasks = skill.view_tasks()["tasks"]
+        assert len(tasks) == 400 and len({task["id"] for task in tasks}) == 400
+        assert TodoAgentSkill(filename).view_tasks()["tasks"] == tasks
+        print("PASS: Concurrent sessions share one consistent store")
+
+        stats = pool.get_stats()
+        assert stats["size"] == 3 and stats["idle"] == 3 and stats["checkouts"] == 9
+        print("PASS: Skills are checked back in")
+
+        listeners = len(pool.storage._listeners)
+        with pool.session() as first, pool.session() as second:
+            assert first.find_related("Session 3 task 7")["tasks"][0]["title"] == "Session 3 task 7"
+            second.find_related("Session 5")
+            assert first.semantic_index is second.semantic_index is pool.semantic_index
+        assert len(pool.storage._listeners) == listeners
+        print("PASS: Sessions share one semantic index")
+
+        listeners = len(pool.storage._listeners)
+        assert SkillPool(storage=pool.storage, size=2).semantic_index is None
+        assert len(pool.storage._listeners) == listeners
+        print("PASS: A pool builds no semantic index unless asked to")
+
+        skills = [pool.checkout() for _ in range(3)]
+        try:
+            pool.checkout(timeout=0.01)
+            assert False, "Should have raised TimeoutError with no idle skill"
+        except TimeoutError:
+            print("PASS: Checkout times out when every skill is in use")
+        for skill in skills:
+            pool.checkin(skill)
+
+    print("All skill pool tests passed!\n")
+
+
+def test_workload():
+    """Test recording, synthesizing and replaying skill workloads"""
+    import functools
+    print("Testing workload replay...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trace = synthesize_trace(2000, read_ratio=0.75, skew=1.2, key_space=100, rate=50000, seed=7)
+        assert trace == synthesize_trace(2000, read_ratio=0.75, skew=1.2, key_space=100, rate=50000, seed=7)
+        reads = sum(op.op in ("get_task", "view_tasks", "query_tasks", "get_stats") for op in trace)
+        assert 0.7 < reads / len(trace) < 0.8
+        assert all(trace[i].at <= trace[i + 1].at for i in range(len(trace) - 1))
+        path = os.path.join(tmp_dir, "trace.jsonl")
+        assert save_trace(trace, path) == 2000
+        loaded = load_trace(path)
+        assert [(op.op, op.args) for op in loaded] == [(op.op, op.args) for op in trace]
+        assert abs(loaded[-1].at - trace[-1].at) < 1e-5
+        try:
+            synthesize_trace(10, mix={"rename_task": 1})
+            assert False, "Should have raised ValueError for an unknown operation"
+        except ValueError:
+            print("PASS: Traces are synthesized reproducibly from an operation mix")
+
+        report = replay(trace, make_skill_for(tmp_dir, "threads.json"), workers=4)
+        assert report.operations == 2000 and report.errors == 0
+        assert report.throughput > 0 and report.latency["p50"] <= report.latency["p99"] <= report.latency["max"]
+        assert report.saves > 0 and report.bytes_written > 0
+        assert sum(stats["count"] for stats in report.per_operation.values()) == 2000
+        report = replay(trace, make_skill_for(tmp_dir, "async.json"), workers=4, mode="asyncio",
+                        loop="open", speed=10)
+        assert report.operations == 2000 and report.errors == 0
+        print("PASS: Traces replay from threads and asyncio tasks, closed and open loop")
+
+        filename = os.path.join(tmp_dir, "processes.json")
+        populate(TaskStorage(filename), 100)
+        with open(filename, "rb") as f:
+            original = f.read()
+        report = replay(trace[:200], functools.partial(make_skill, filename), workers=2, mode="processes")
+        assert report.operations == 200 and report.errors == 0 and report.bytes_written > 0
+        copies = [TaskStorage(f"{filename}.{worker}") for worker in range(2)]
+        assert all(copy.get_task_count() >= 100 for copy in copies)
+        with open(filename, "rb") as f:
+            assert f.read() == original
+        print("PASS: Traces replay from worker processes")
+
+        recorder = WorkloadRecorder(TodoAgentSkill(os.path.join(tmp_dir, "recorded.json")))
+        task_id = recorder.add_task("Recorded task", tags=["work"])["task_id"]
+        recorder.update_task(task_id, priority="high")
+        assert recorder.get_task(task_id)["task"]["priority"] == "high"
+        assert [op.op for op in recorder.trace] == ["add_task", "update_task", "get_task"]
+        assert recorder.trace[1].args == {"task_id": task_id, "priority": "high"}
+        recorder.save(path)
+        replayed = TodoAgentSkill(os.path.join(tmp_dir, "replayed.json"))
+        report = replay(load_trace(path), lambda: replayed, workers=1)
+        assert report.failures == 0 and replayed.get_task(task_id)["task"]["priority"] == "high"
+        print("PASS: Recorded calls replay against a fresh store")
+
+    print("All workload tests passed!\n")
+
+
+def make_skill_for(directory: str, name: str):
+    """Return a factory of skills sharing one store populated with 100 tasks."""
+    storage = TaskStorage(os.path.join(directory, name), flush_interval_ms=50)
+    populate(storage, 100)
+    return lambda: TodoAgentSkill(storage=storage)
+
+
 def main():
     """Run all agent skill tests"""
     print("Running Todo Agent Skill tests...\n")
     
     test_agent_skill()
     test_agent_skill_validation()
+    test_agent_skill_paging()
+    test_agent_skill_undo_redo()
+    test_agent_skill_queries()
+    test_agent_skill_schedules()
+    test_agent_skill_duplicates()
+    test_agent_skill_tenants()
+    test_agent_skill_audit()
+    test_skill_pool()
+    test_workload()
     
     print("All agent skill tests passed! Reusable intelligence is working correctly.")
 
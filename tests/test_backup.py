@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script to verify incremental, deduplicated backups.
+"""
+
+import sys
+import os
+import tempfile
+import time
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from phase_i_in_memory_python_console_app.backup import BackupStore
+from phase_i_in_memory_python_console_app.main import main as app_main
+from phase_i_in_memory_python_console_app.storage import TaskStorage
+
+
+def test_backup_and_restore():
+    """Test backups deduplicate unchanged tasks and restore any point in time"""
+    print("Testing backup and restore...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        storage.import_tasks([{"title": f"Task {i}", "description": "x" * 40} for i in range(2000)])
+        backups = BackupStore(os.path.join(tmp_dir, "backups"))
+
+        first = backups.backup(storage)
+        assert first.task_count == 2000
+        assert first.new_chunk_count == first.chunk_count
+        print("PASS: Full backup works")
+
+        storage.update_task(1000, title="Changed")
+        storage.delete_task(1500)
+        second = backups.backup(storage)
+        assert second.task_count == 1999
+        assert second.new_chunk_count <= 4
+        assert second.stored_bytes < second.logical_bytes / 10
+        print("PASS: Unchanged task ranges are deduplicated")
+
+        backups.restore(storage, backup_id=first.backup_id)
+        assert storage.get_task_count() == 2000
+        assert storage.get_task(1000).title == "Task 999"
+        assert TaskStorage(os.path.join(tmp_dir, "tasks.json")).get_task(1500) is not None
+        print("PASS: Restoring a backup by ID works")
+
+        backups.restore(storage, at=time.time())
+        assert storage.get_task(1000).title == "Changed"
+        assert storage.get_task(1500) is None
+        print("PASS: Restoring the latest backup at a point in time works")
+
+        try:
+            backups.restore(storage, at=0)
+            assert False, "Should have raised ValueError for a time before any backup"
+        except ValueError:
+            print("PASS: Missing restore point is reported")
+
+        assert [backup["id"] for backup in backups.list_backups()] == [first.backup_id, second.backup_id]
+        print("PASS: Backups are listed oldest first")
+
+        filename = os.path.join(tmp_dir, "tasks.json")
+        app_main(["--file", filename, "backup", "--backup-dir", os.path.join(tmp_dir, "backups")])
+        assert not os.path.exists(filename + ".audit")
+        print("PASS: Read-only commands do not create an audit log")
+
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write('{"tasks": {"1": ')
+        app_main(["--file", filename, "--no-audit", "restore",
+                  "--backup-dir", os.path.join(tmp_dir, "backups"), "--id", first.backup_id])
+        restored = TaskStorage(filename)
+        assert restored.get_task_count() == 2000 and restored.get_task(1000).title == "Task 999"
+        print("PASS: Restoring replaces a corrupt store file")
+
+        try:
+            app_main(["--file", filename, "--no-audit", "restore",
+                      "--backup-dir", os.path.join(tmp_dir, "backups"), "--at", "garbage"])
+            assert False, "Should have exited for an invalid time"
+        except SystemExit as e:
+            assert str(e).startswith("Error: Invalid time")
+        print("PASS: An invalid restore time is reported")
+
+    print("All backup tests passed!\n")
+
+
+def main():
+    """Run all backup tests"""
+    print("Running backup tests...\n")
+
+    test_backup_and_restore()
+
+    print("All backup tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,31 @@ Test script to verify all functionality of the Todo Console App.
 
 import sys
 import os
+import json
+import random
+import struct
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pytest
 # Add the src directory to the path so we can import the modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from phase_i_in_memory_python_console_app.models import Task
-from phase_i_in_memory_python_console_app.storage import TaskStorage
+from phase_i_in_memory_python_console_app.models import FrozenTask, Task
+from phase_i_in_memory_python_console_app.audit import AuditLog, acting_as
+from phase_i_in_memory_python_console_app.storage import TaskStorage, task_filter
+from phase_i_in_memory_python_console_app.file_codecs import MAGIC_NUMBERS, available_codecs, open_read
+from phase_i_in_memory_python_console_app.json_stream import iter_members
+from phase_i_in_memory_python_console_app.stats import TaskStats
+from phase_i_in_memory_python_console_app.tenants import TenantStore
+from phase_i_in_memory_python_console_app.replica import ReplicaPublisher, ReplicaReader
+from phase_i_in_memory_python_console_app.scheduler import TaskScheduler, parse_recurrence
+from phase_i_in_memory_python_console_app.export import export_tasks, iter_export_chunks
+from phase_i_in_memory_python_console_app.persistent import PersistentMap
+from phase_i_in_memory_python_console_app.schema import SCHEMA_VERSION, migrate_records
+from phase_i_in_memory_python_console_app.dedup import DuplicateIndex, minhash, shingles, signature_values
+from phase_i_in_memory_python_console_app.semantic import SemanticIndex, hashing_embedding
 
 
 def test_models():
@@ -117,6 +137,1246 @@ def test_storage():
     print("All TaskStorage tests passed!\n")
 
 
+def test_iter_tasks():
+    """Test streaming iteration and cursor-based paging"""
+    print("Testing task iteration and paging...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        for i in range(1, 6):
+            storage.add_task(f"Task {i}")
+
+        assert [task.id for task in storage.iter_tasks()] == [1, 2, 3, 4, 5]
+        assert [task.id for task in storage.iter_tasks(start_after_id=3)] == [4, 5]
+        assert storage.get_task_count() == 5
+        print("PASS: Task iteration works")
+
+        storage.toggle_task_status(2)
+        pending = storage.iter_tasks(filter=lambda task: not task.completed)
+        assert [task.id for task in pending] == [1, 3, 4, 5]
+        print("PASS: Filtered iteration works")
+
+        # Deleting while iterating must not skip or repeat tasks
+        seen = []
+        for task in storage.iter_tasks():
+            seen.append(task.id)
+            if task.id == 2:
+                storage.delete_task(3)
+        assert seen == [1, 2, 4, 5]
+        print("PASS: Iteration tolerates concurrent deletes")
+
+        page, cursor = storage.get_tasks_page(2)
+        assert [task.id for task in page] == [1, 2]
+        page, cursor = storage.get_tasks_page(2, cursor)
+        assert [task.id for task in page] == [4, 5]
+        assert cursor is None
+        print("PASS: Cursor-based paging works")
+
+        try:
+            storage.get_tasks_page(0)
+            assert False, "Should have raised ValueError for non-positive limit"
+        except ValueError:
+            print("PASS: Page limit validation works")
+
+    print("All iteration tests passed!\n")
+
+
+def test_orderings():
+    """Test named orderings backed by sorted indexes"""
+    print("Testing task orderings...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        storage = TaskStorage(filename)
+        storage.add_task("banana")
+        storage.add_task("Apple")
+        storage.add_task("cherry")
+        storage.toggle_task_status(1)
+
+        by_title = [task.title for task in storage.iter_tasks(order_by="title")]
+        assert by_title == ["Apple", "banana", "cherry"]
+        print("PASS: Title ordering works")
+
+        pending_first = [task.id for task in storage.iter_tasks(order_by="pending_first")]
+        assert pending_first == [2, 3, 1]
+        print("PASS: Pending-first ordering works")
+
+        storage.update_task(2, title="date")
+        by_title = [task.title for task in storage.iter_tasks(order_by="title")]
+        assert by_title == ["banana", "cherry", "date"]
+        assert next(storage.iter_tasks(order_by="recently_updated")).id == 2
+        print("PASS: Orderings are maintained on update")
+
+        storage.delete_task(3)
+        page, cursor = storage.get_tasks_page(1, order_by="title")
+        assert [task.id for task in page] == [1]
+        page, cursor = storage.get_tasks_page(1, cursor, order_by="title")
+        assert [task.id for task in page] == [2]
+        assert cursor is None
+        print("PASS: Ordered paging works")
+
+        # Orderings are rebuilt when the store is reloaded
+        reloaded = TaskStorage(filename)
+        assert [task.id for task in reloaded.iter_tasks(order_by="recently_updated")] == [2, 1]
+        print("PASS: Orderings survive reload")
+
+        reloaded.register_ordering("title_length", lambda task: len(task.title))
+        assert [task.id for task in reloaded.iter_tasks(order_by="title_length")] == [2, 1]
+        try:
+            reloaded.iter_tasks(order_by="missing")
+            assert False, "Should have raised ValueError for unknown ordering"
+        except ValueError:
+            print("PASS: Custom and unknown orderings are handled")
+
+        lazy = TaskStorage(filename)
+        assert lazy._orderings == {} and lazy._tag_index is None
+        assert lazy._stats is None and lazy._dependencies is None
+        print("PASS: Loading builds no index until it is used")
+
+        assert [task.id for task in lazy.iter_tasks(order_by="recently_updated")] == [2, 1]
+        assert list(lazy._orderings) == ["recently_updated"]
+        lazy.add_task("Aardvark", tags="zoo")
+        assert [task.title for task in lazy.iter_tasks(order_by="title")][0] == "Aardvark"
+        assert [task.id for task in lazy.iter_tasks(order_by="recently_updated")][0] == 4
+        assert [task.id for task in lazy.query_tasks(tags="zoo")] == [4]
+        assert lazy.stats()["total"] == 3 and len(lazy.next_actionable()) == 2
+        print("PASS: Indexes built on first use see later changes")
+
+    print("All ordering tests passed!\n")
+
+
+def test_validation():
+    """Test trusted loads, bulk validation and validation on update"""
+    print("Testing validation paths...")
+
+    task = Task(id=1, title="Valid title")
+    try:
+        task.title = ""
+        assert False, "Should have raised ValueError when assigning an empty title"
+    except ValueError:
+        assert task.title == "Valid title"
+        print("PASS: Assignment validation works")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        storage = TaskStorage(filename)
+        task_id = storage.add_task("Original", "Description")
+
+        try:
+            storage.update_task(task_id, "New title", "x" * 1001)
+            assert False, "Should have raised ValueError for long description"
+        except ValueError:
+            assert storage.get_task(task_id).title == "Original"
+            print("PASS: Update validation is all-or-nothing")
+
+        task_ids = storage.import_tasks([
+            {"title": "Imported 1"},
+            {"title": "Imported 2", "description": "Details", "completed": True},
+        ])
+        assert task_ids == [2, 3]
+        assert storage.get_task(3).completed == True
+        try:
+            storage.import_tasks([{"title": "Fine"}, {"title": ""}, {"title": "x" * 201}])
+            assert False, "Should have raised ValueError for invalid records"
+        except ValueError as e:
+            assert "2 invalid" in str(e)
+            assert storage.get_task_count() == 3
+        try:
+            storage.import_tasks([{"title": "Fine"}, {"description": "No title"}])
+            assert False, "Should have raised ValueError for a record without a title"
+        except ValueError as e:
+            assert "record 1: Each record needs a title" in str(e)
+            assert storage.get_task_count() == 3
+            print("PASS: Bulk import validation works")
+
+        assert os.path.exists(filename + ".sha256")
+        assert TaskStorage(filename).get_task_count() == 3
+        print("PASS: Checksummed snapshot loads")
+
+        # A hand-edited file no longer matches its checksum and is fully validated
+        with open(filename, "r", encoding="utf-8") as f:
+            content = f.read()
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(content.replace('"Imported 1"', '""'))
+        try:
+            TaskStorage(filename)
+            assert False, "Should have raised ValueError for an invalid record"
+        except ValueError:
+            print("PASS: Tampered snapshot is validated")
+
+    print("All validation tests passed!\n")
+
+
+def test_undo_redo():
+    """Test undo/redo through the compact operation log"""
+    print("Testing undo/redo...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        storage = TaskStorage(filename)
+        assert storage.undo() == False
+        assert storage.redo() == False
+
+        task_id = storage.add_task("Write report", "Quarterly numbers")
+        storage.update_task(task_id, title="Write final report")
+        storage.toggle_task_status(task_id)
+        storage.delete_task(task_id)
+        assert storage.get_task(task_id) is None
+
+        assert storage.undo() == True
+        restored = storage.get_task(task_id)
+        assert restored.title == "Write final report" and restored.completed == True
+        print("PASS: Undo delete restores the task")
+
+        # Undo is persisted through the normal save path
+        assert TaskStorage(filename).get_task(task_id) is not None
+
+        assert storage.undo() == True
+        assert storage.get_task(task_id).completed == False
+        assert storage.undo() == True
+        assert storage.get_task(task_id).title == "Write report"
+        assert storage.undo() == True
+        assert storage.get_task(task_id) is None
+        assert storage.can_undo() == False
+        print("PASS: Undo walks back through every change")
+
+        assert storage.redo() == True
+        assert storage.redo() == True
+        assert storage.get_task(task_id).title == "Write final report"
+        assert next(storage.iter_tasks(order_by="title")).id == task_id
+        print("PASS: Redo re-applies changes and keeps indexes in step")
+
+        storage.add_task("New change")
+        assert storage.can_redo() == False
+        print("PASS: A new change clears redo history")
+
+        storage.import_tasks([{"title": "A"}, {"title": "B"}])
+        assert storage.undo() == True
+        assert storage.get_task_count() == 2
+        print("PASS: Imports are undone as one step")
+
+        bounded = TaskStorage(os.path.join(tmp_dir, "bounded.json"), history_entries=2)
+        for i in range(5):
+            bounded.add_task(f"Task {i}")
+        assert bounded.undo() and bounded.undo() and not bounded.undo()
+        assert bounded.get_task_count() == 3
+        print("PASS: History respects its budget")
+
+    print("All undo/redo tests passed!\n")
+
+
+def test_task_fields_and_queries():
+    """Test tags, projects, priority and due dates with indexed queries"""
+    print("Testing task fields and queries...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        storage = TaskStorage(filename)
+        late = storage.add_task("Pay rent", tags="Urgent, home", project="House",
+                                priority="high", due_date="2020-01-01")
+        soon = storage.add_task("Call plumber", tags=["urgent"], project="House",
+                                due_date=date.today() + timedelta(days=7))
+        other = storage.add_task("Read book", project="Leisure", priority="low")
+
+        task = storage.get_task(late)
+        assert task.tags == ["urgent", "home"] and task.due_date == date(2020, 1, 1)
+        assert task.is_overdue() == True
+        print("PASS: New fields are normalized and stored")
+
+        overdue = storage.query_tasks(project="House", tags="urgent", overdue=True)
+        assert [t.id for t in overdue] == [late]
+        assert storage.query_tasks(overdue=True, completed=True) == []
+        assert storage.query_tasks(overdue=True, completed=False) == overdue
+        assert [t for t in storage.get_all_tasks() if task_filter(overdue=True, completed=True)(t)] == []
+        assert [t.id for t in storage.query_tasks(tags="urgent")] == [late, soon]
+        assert [t.id for t in storage.query_tasks(priority="low")] == [other]
+        assert [t.id for t in storage.query_tasks(due_after="2021-01-01")] == [soon]
+        assert [t.id for t in storage.query_tasks(due_before="2020-01-01")] == [late]
+        storage.toggle_task_status(late)
+        assert storage.query_tasks(overdue=True) == []
+        print("PASS: Tag, project, priority and due date queries work")
+
+        assert next(storage.iter_tasks(order_by="priority")).id == late
+        assert [t.id for t in storage.iter_tasks(order_by="due_date")] == [late, soon, other]
+        print("PASS: Priority and due date orderings work")
+
+        storage.update_task(soon, project="", due_date="", tags="errand")
+        assert storage.get_projects() == ["House", "Leisure"]
+        assert storage.query_tasks(tags="urgent")[0].id == late
+        assert storage.query_tasks(due_after="2021-01-01") == []
+        print("PASS: Updates keep the indexes in step")
+
+        storage.delete_task(late)
+        assert storage.undo() == True
+        assert storage.get_task(late).tags == ["urgent", "home"]
+        assert TaskStorage(filename).get_task(late).due_date == date(2020, 1, 1)
+        print("PASS: New fields survive undo and reload")
+
+        for bad in [{"priority": "urgent"}, {"due_date": "tomorrow"}, {"tags": ["x" * 51]}]:
+            try:
+                storage.add_task("Bad", **bad)
+                assert False, f"Should have raised ValueError for {bad}"
+            except ValueError:
+                pass
+        print("PASS: Invalid field values are rejected")
+
+    print("All task field tests passed!\n")
+
+
+def test_stats():
+    """Test incrementally maintained statistics"""
+    print("Testing statistics...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        storage = TaskStorage(filename)
+        first = storage.add_task("Write spec", project="App", priority="high")
+        second = storage.add_task("Ship it", project="App")
+        storage.add_task("Water plants")
+        storage.toggle_task_status(first)
+
+        stats = storage.stats()
+        assert (stats["total"], stats["completed"], stats["pending"]) == (3, 1, 2)
+        assert stats["by_project"]["App"]["completion_rate"] == 0.5
+        assert stats["by_priority"] == {"low": 0, "medium": 2, "high": 1}
+        assert stats["throughput"]["window_total"] == 1
+        assert stats["throughput"]["completions"][-1] == 1
+        print("PASS: Counters follow adds and toggles")
+
+        storage.update_task(second, project="Web")
+        storage.delete_task(first)
+        stats = storage.stats()
+        assert stats["total"] == 2 and stats["completed"] == 0
+        assert "App" not in stats["by_project"] and stats["by_project"]["Web"]["total"] == 1
+        print("PASS: Counters follow updates and deletes")
+
+        storage.undo()
+        storage.undo()
+        assert storage.stats()["by_project"]["App"]["completed"] == 1
+        storage.toggle_task_status(first)
+        assert storage.stats()["throughput"]["window_total"] == 0
+        print("PASS: Reopening a task takes back its completion")
+
+        storage.toggle_task_status(first)
+        reloaded = TaskStorage(filename).stats()
+        assert reloaded["completed"] == 1 and reloaded["throughput"]["window_total"] == 1
+        print("PASS: Statistics are rebuilt on load")
+
+    clock = [0.0]
+    stats = TaskStats(bucket_seconds=60, bucket_count=3, clock=lambda: clock[0])
+    task = Task(id=1, title="Task", completed=True, updated_at=0.0)
+    stats.on_change("add", Task(id=1, title="Task"), {})
+    stats.on_change("update", task, {"completed": False, "updated_at": None})
+    assert stats.get_throughput() == [0, 0, 1]
+    clock[0] = 150.0
+    assert stats.get_throughput() == [1, 0, 0]
+    clock[0] = 1000.0
+    assert stats.get_throughput() == [0, 0, 0]
+    print("PASS: Throughput buckets roll over")
+
+    print("All statistics tests passed!\n")
+
+
+def test_tenant_store():
+    """Test lazily loaded, LRU-evicted tenant shards"""
+    print("Testing tenant store...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tenants = TenantStore(tmp_dir, max_loaded=2)
+        tenants.get("a").add_task("Task for a")
+        tenants.get("b").add_task("Task for b")
+        assert tenants.get_stats() == {"loaded": 2, "loads": 2, "evictions": 0}
+        assert tenants.get("a").get_task_count() == 1
+        print("PASS: Shards are loaded once and reused")
+
+        tenants.get("c")
+        assert tenants.loaded_tenants() == ["a", "c"]
+        assert tenants.list_tenants() == ["a", "b", "c"]
+        assert tenants.get("b").get_task(1).title == "Task for b"
+        assert tenants.get_stats()["evictions"] == 2
+        print("PASS: Least recently used shards are evicted and reloaded")
+
+        idle = TenantStore(tmp_dir, idle_seconds=0)
+        idle.get("a")
+        time.sleep(0.01)
+        idle.get("b")
+        assert idle.loaded_tenants() == ["b"]
+        print("PASS: Idle shards are evicted")
+
+        try:
+            tenants.get("no/slashes")
+            assert False, "Should have raised ValueError for an invalid tenant name"
+        except ValueError:
+            print("PASS: Invalid tenant names are rejected")
+
+    print("All tenant store tests passed!\n")
+
+
+def test_bounded_memory():
+    """Test the bounded working set that spills cold tasks to disk"""
+    print("Testing bounded-memory storage...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        TaskStorage(filename).import_tasks([{"title": f"Task {i}", "project": f"p{i % 3}"}
+                                            for i in range(500)])
+
+        storage = TaskStorage(filename, max_cached_tasks=50)
+        stats = storage.get_cache_stats()
+        assert stats["cached"] == 50 and stats["spilled"] == 450
+        assert storage.get_task_count() == 500
+        print("PASS: Only the working set is kept in memory")
+
+        assert storage.get_task(1).title == "Task 0"
+        assert storage.get_task(1).title == "Task 0"
+        stats = storage.get_cache_stats()
+        assert stats["misses"] == 1 and stats["hits"] == 1
+        print("PASS: Cold tasks are read back on demand")
+
+        storage.update_task(2, title="Changed")
+        storage.toggle_task_status(3)
+        for task_id in range(100, 200):
+            storage.get_task(task_id)
+        assert storage.get_task(2).title == "Changed"
+        assert storage.get_task(3).completed == True
+        assert storage.get_cache_stats()["cached"] == 50
+        print("PASS: Changed tasks survive eviction")
+
+        storage.delete_task(4)
+        assert len(storage.query_tasks(project="p0")) == 166
+        assert [t.id for t in storage.iter_tasks()][:3] == [1, 2, 3]
+        reloaded = TaskStorage(filename)
+        assert reloaded.get_task(2).title == "Changed" and reloaded.get_task(4) is None
+        assert reloaded.get_task_count() == 499
+        print("PASS: Queries and saves see spilled tasks")
+
+        by_bytes = TaskStorage(filename, max_cached_bytes=10000)
+        stats = by_bytes.get_cache_stats()
+        assert 0 < stats["cached_bytes"] <= 10000 and stats["spilled"] > 0
+        print("PASS: Byte budget is respected")
+
+    print("All bounded-memory tests passed!\n")
+
+
+def test_background_flush():
+    """Test coalesced saves on the background flusher thread"""
+    print("Testing background flush...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        storage = TaskStorage(filename, flush_interval_ms=60000, flush_max_pending=1000)
+        for i in range(10):
+            storage.add_task(f"Task {i}")
+        assert storage.get_flush_stats() == {"flushes": 0, "pending": 10}
+        assert TaskStorage(filename).get_task_count() == 0
+        print("PASS: Changes are not saved synchronously")
+
+        storage.flush()
+        assert TaskStorage(filename).get_task_count() == 10
+        assert storage.get_flush_stats()["pending"] == 0
+        print("PASS: Flush saves pending changes")
+
+        batched = TaskStorage(filename, flush_interval_ms=60000, flush_max_pending=5)
+        for task_id in range(1, 6):
+            batched.toggle_task_status(task_id)
+        deadline = time.time() + 5
+        while batched.get_flush_stats()["flushes"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert batched.get_flush_stats()["flushes"] == 1
+        print("PASS: A full batch of changes triggers a save")
+
+        timed = TaskStorage(filename, flush_interval_ms=20)
+        timed.delete_task(10)
+        deadline = time.time() + 5
+        while TaskStorage(filename).get_task(10) is not None and time.time() < deadline:
+            time.sleep(0.01)
+        assert TaskStorage(filename).get_task(10) is None
+        print("PASS: Changes are saved within the flush interval")
+
+        storage.add_task("Last change")
+        storage.close()
+        storage.close()
+        assert TaskStorage(filename).get_task(11).title == "Last change"
+        storage.add_task("After close")
+        assert TaskStorage(filename).get_task(12) is not None
+        print("PASS: Close saves pending changes and later changes save immediately")
+
+    print("All background flush tests passed!\n")
+
+
+def test_compressed_storage():
+    """Test compressed store files"""
+    print("Testing compressed storage...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        for codec in available_codecs():
+            storage = TaskStorage(filename, compression=codec, compression_level=1)
+            storage.replace_tasks(iter([]), 1)
+            storage.import_tasks([{"title": f"Task {i}", "tags": ["same"]} for i in range(200)])
+            with open(filename, 'rb') as f:
+                assert f.read(6).startswith(MAGIC_NUMBERS[codec])
+            assert os.path.getsize(filename) < 200 * 50
+
+            reloaded = TaskStorage(filename)
+            assert reloaded.get_task_count() == 200
+            assert reloaded.get_task(200).title == "Task 199"
+        print("PASS: Compressed files are written and read back")
+
+        TaskStorage(filename).save_to_file()
+        with open(filename, 'rb') as f:
+            assert f.read(1) == b"{"
+        print("PASS: Compression can be switched off without conversion")
+
+        storage = TaskStorage(filename, compression="gzip")
+        storage.save_to_file()
+        with open(filename, 'r+b') as f:
+            f.truncate(40)
+        try:
+            TaskStorage(filename)
+            assert False, "Should have raised ValueError for a truncated file"
+        except ValueError:
+            assert os.path.getsize(filename) == 40
+            print("PASS: Truncated compressed files are detected")
+
+        os.remove(filename)
+        storage = TaskStorage(filename, compression="gzip")
+        storage.import_tasks([{"title": f"Tâche ✓ {i}", "tags": ["ünï"], "priority": "high"}
+                              for i in range(50)])
+        with open_read(filename) as f:
+            expected = json.loads(f.read())
+        with open_read(filename) as f:
+            members = list(iter_members(f, "tasks", chunk_bytes=7))
+        assert {key: value for section, key, value in members if section is None} == \
+            {key: value for key, value in expected.items() if key != "tasks"}
+        assert {key: value for section, key, value in members if section == "tasks"} == expected["tasks"]
+        print("PASS: Files are decoded as a stream across chunk boundaries")
+
+        import io
+        tricky = {str(i): {"title": f'Quote, "{i}": {{', "extra": {"1": {"2": {}}, "3": [i]}}
+                  for i in range(300)}
+        document = json.dumps({"tasks": tricky, "other": {"4": {}}}).encode()
+        for chunk_bytes in (64, 4096, len(document)):
+            members = list(iter_members(io.BytesIO(document), "tasks", chunk_bytes=chunk_bytes))
+            assert {key: value for section, key, value in members if section == "tasks"} == tricky
+            assert [(key, value) for section, key, value in members if section is None] == \
+                [("other", {"4": {}})]
+        print("PASS: Member-like text inside strings and nested objects is not split")
+
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump({"tasks": expected["tasks"], "next_id": 123456, "schema_version": SCHEMA_VERSION}, f)
+        reordered = TaskStorage(filename)
+        assert reordered.get_task_count() == 50 and reordered.get_task(7).title == "Tâche ✓ 6"
+        assert reordered.get_next_id() == 123456
+        print("PASS: Members load in any order")
+
+        try:
+            TaskStorage(filename, compression="rar")
+            assert False, "Should have raised ValueError for an unknown compression"
+        except ValueError:
+            print("PASS: Unknown compression is rejected")
+
+    print("All compressed storage tests passed!\n")
+
+
+def test_read_replicas():
+    """Test shared-memory read replicas"""
+    import subprocess
+    print("Testing read replicas...")
+
+    name = f"todo-test-{os.getpid()}"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        for i in range(5):
+            storage.add_task(f"Task {i}", project="work" if i % 2 else None, tags=["x"])
+        publisher = ReplicaPublisher(storage, name)
+        reader = ReplicaReader(name)
+        try:
+            assert reader.version == 0
+            assert reader.get_task(1) is None and reader.get_all_tasks() == []
+
+            assert publisher.publish() == 1
+            assert reader.version == 1
+            assert reader.get_task(3).title == "Task 2"
+            assert reader.get_task(99) is None
+            assert [task.id for task in reader.get_all_tasks()] == [1, 2, 3, 4, 5]
+            assert [task.id for task in reader.query_tasks(project="work", tags="x")] == [2, 4]
+            assert reader.get_next_id() == 6
+            print("PASS: Readers serve the published snapshot")
+
+            script = ("from phase_i_in_memory_python_console_app.replica import ReplicaReader\n"
+                      f"reader = ReplicaReader({name!r})\n"
+                      "print(reader.version, reader.get_task_count(), reader.get_task(2).title)\n"
+                      "reader.close()\n")
+            src_dir = os.path.join(os.path.dirname(__file__), '..', 'src')
+            output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                                    env={**os.environ, "PYTHONPATH": src_dir}, check=True).stdout
+            assert output.split() == ["1", "5", "Task", "1"]
+            print("PASS: Other processes map the same snapshot")
+
+            storage.update_task(2, title="Changed")
+            storage.delete_task(1)
+            assert reader.get_task(2).title == "Task 1"
+            pending = reader.iter_tasks()
+            assert next(pending).id == 1
+            publisher.publish()
+            assert reader.get_task(2).title == "Changed"
+            assert reader.get_task(1) is None
+            assert [task.id for task in pending] == [2, 3, 4, 5]
+            print("PASS: Readers switch versions atomically on republish")
+
+            control = publisher._control.buf
+            sequence = struct.unpack_from("<Q", control, 0)[0]
+            struct.pack_into("<Q", control, 0, sequence + 1)  # A writer mid-switch
+            assert reader._read_version() is None
+            struct.pack_into("<Q", control, 0, sequence)
+            assert reader._read_version() == publisher.version
+            print("PASS: Readers retry while the version is being switched")
+
+            # A reader process checks every snapshot it sees while this
+            # process republishes: all tasks of one snapshot share a round
+            for task_id in range(6, 41):
+                storage.add_task(f"Task {task_id}")
+            script = ("import time\n"
+                      "from phase_i_in_memory_python_console_app.replica import ReplicaReader\n"
+                      f"reader = ReplicaReader({name!r})\n"
+                      "versions, deadline = [], time.monotonic() + 1.5\n"
+                      "while time.monotonic() < deadline:\n"
+                      "    version = reader.version\n"
+                      "    titles = {task.title for task in reader.iter_tasks()}\n"
+                      "    assert len(titles) == 1 and reader.get_task_count() == 39, titles\n"
+                      "    versions.append(version)\n"
+                      "assert versions == sorted(versions)\n"
+                      "print(len(set(versions)))\n"
+                      "reader.close()\n")
+            for task_id in range(2, 41):
+                storage.update_task(task_id, title="Round 0")
+            publisher.publish()
+            process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE, text=True,
+                                       env={**os.environ, "PYTHONPATH": src_dir})
+            round_number = 0
+            while process.poll() is None:
+                round_number += 1
+                for task_id in range(2, 41):
+                    storage.update_task(task_id, title=f"Round {round_number}")
+                publisher.publish()
+            output, errors = process.communicate()
+            assert process.returncode == 0, errors
+            assert int(output) > 1
+            print("PASS: Concurrent readers never see a torn snapshot")
+        finally:
+            reader.close()
+            publisher.close()
+
+    print("All read replica tests passed!\n")
+
+
+def test_scheduler():
+    """Test reminders and recurring tasks"""
+    from datetime import datetime
+    print("Testing scheduler...")
+
+    def days(rule, start, count=3):
+        recurrence = parse_recurrence(rule)
+        day = recurrence.first_on_or_after(start)
+        result = []
+        for _ in range(count):
+            result.append(day)
+            day = recurrence.next_after(day)
+        return result
+
+    sunday = date(2026, 10, 18)
+    assert days("daily", sunday) == [sunday, date(2026, 10, 19), date(2026, 10, 20)]
+    assert days("Every 3 days", sunday)[2] == date(2026, 10, 24)
+    assert days("weekdays", sunday) == [date(2026, 10, 19), date(2026, 10, 20), date(2026, 10, 21)]
+    assert days("every mon, thu", sunday) == [date(2026, 10, 19), date(2026, 10, 22), date(2026, 10, 26)]
+    for rule in ["hourly", "every 0 days", "every mo"]:
+        try:
+            parse_recurrence(rule)
+            assert False, f"Should have rejected {rule!r}"
+        except ValueError:
+            pass
+    print("PASS: Repeat rules are parsed")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json.schedule.json")
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        now = [datetime(2026, 10, 19, 8, 0).timestamp()]
+        scheduler = TaskScheduler(storage, filename, clock=lambda: now[0])
+        events = []
+        scheduler.add_listener(events.append)
+
+        rent = storage.add_task("Pay rent")
+        done = storage.add_task("Already done")
+        scheduler.add_reminder(rent, "2026-10-19 08:30", "Due today")
+        scheduler.add_reminder(done, "2026-10-19 08:30")
+        storage.toggle_task_status(done)
+        standup = scheduler.add_recurring("Standup", "weekdays", project="Team",
+                                          start="2026-10-19", at="09:15")
+        try:
+            scheduler.add_reminder(99, "2026-10-19 08:30")
+            assert False, "Should have raised ValueError for a missing task"
+        except ValueError:
+            pass
+
+        assert scheduler.tick() == []
+        assert scheduler.next_due() == datetime(2026, 10, 19, 8, 30).timestamp()
+        now[0] = datetime(2026, 10, 19, 10, 0).timestamp()
+        fired = scheduler.tick()
+        assert [(event.kind, event.message) for event in fired] == [("reminder", "Due today"),
+                                                                    ("recurring", "Standup")]
+        created = storage.get_task(fired[1].task_id)
+        assert created.title == "Standup" and created.project == "Team"
+        assert created.due_date == date(2026, 10, 19)
+        assert events == fired and scheduler.drain_events() == fired
+        assert scheduler.drain_events() == []
+        print("PASS: Due reminders fire and recurring tasks are created")
+
+        # A week later only the latest missed occurrence is created
+        now[0] = datetime(2026, 10, 27, 10, 0).timestamp()
+        fired = scheduler.tick()
+        assert len(fired) == 1 and storage.get_task(fired[0].task_id).due_date == date(2026, 10, 27)
+        assert scheduler.next_due() == datetime(2026, 10, 28, 9, 15).timestamp()
+        print("PASS: Missed occurrences are caught up once")
+
+        reloaded = TaskScheduler(storage, filename, clock=lambda: now[0])
+        assert [schedule.id for schedule in reloaded.get_schedules()] == [standup]
+        assert reloaded.cancel(standup) and not reloaded.cancel(standup)
+        assert reloaded.next_due() is None
+        assert TaskScheduler(storage, filename).get_schedules() == []
+        print("PASS: Schedules are saved and can be cancelled")
+
+    print("All scheduler tests passed!\n")
+
+
+def test_duplicate_index():
+    """Test near-duplicate detection"""
+    import hashlib
+    import struct
+    print("Testing duplicate index...")
+
+    text_shingles = shingles("buy milk and bread")
+    expected = tuple(map(min, zip(*(
+        struct.unpack("<64H", hashlib.shake_128(shingle.encode()).digest(128))
+        for shingle in text_shingles))))
+    assert signature_values(minhash(text_shingles)) == expected
+    print("PASS: Packed MinHash signatures match per-position minimums")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        for title in ["Buy milk and bread", "buy milk & bread!", "Buy some milk and bread",
+                      "Call the dentist", "Write the quarterly report", "Pay rent"]:
+            storage.add_task(title)
+        index = DuplicateIndex(storage)
+        assert index.find_duplicates() == [[1, 2, 3]]
+        assert index.find_similar("Call the dentist") == [(4, 1.0)]
+        assert index.find_similar("Call the dentist", exclude=4) == []
+        assert index.find_similar("Walk the dog") == []
+        print("PASS: Near-duplicates are found")
+
+        storage.delete_task(2)
+        storage.update_task(6, title="Call the dentist!")
+        storage.add_task("Write quarterly report")
+        assert index.find_duplicates() == [[1, 3], [4, 6], [5, 7]]
+        assert index.find_duplicates(threshold=1.0) == [[4, 6]]
+        storage.replace_tasks(iter([]), 1)
+        assert len(index) == 0 and index.find_duplicates() == []
+        print("PASS: The index follows store changes")
+
+        try:
+            DuplicateIndex(threshold=0)
+            assert False, "Should have raised ValueError for a zero threshold"
+        except ValueError:
+            print("PASS: Invalid thresholds are rejected")
+
+    print("All duplicate index tests passed!\n")
+
+
+def test_export():
+    """Test streaming exports"""
+    import csv
+    import io
+    import json
+    print("Testing export...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        storage.add_task("Fix | pipe", 'Two\nlines, "quoted"', tags="work,urgent",
+                         project="App", priority="high", due_date="2020-01-01")
+        storage.add_task("<b>Bold</b> & co", project="Home")
+        storage.add_task("Another app task", project="App", priority="low")
+        storage.toggle_task_status(2)
+
+        output = io.StringIO()
+        assert export_tasks(storage, output, "csv") == 3
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        assert rows[0][:3] == ["id", "title", "description"]
+        assert rows[1][1:3] == ["Fix | pipe", 'Two\nlines, "quoted"'] and rows[1][6] == "work,urgent"
+        print("PASS: CSV export round-trips through a CSV reader")
+
+        output = io.StringIO()
+        export_tasks(storage, output, "jsonl", order_by="priority")
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [record["id"] for record in records] == [1, 2, 3]
+        assert records[0]["due_date"] == "2020-01-01" and records[1]["completed"] == True
+        print("PASS: JSON lines export follows the requested order")
+
+        output = io.StringIO()
+        export_tasks(storage, output, "md", filter=task_filter(project="App", completed=False))
+        lines = output.getvalue().splitlines()
+        assert len(lines) == 4 and "Fix \\| pipe" in lines[2] and "Two lines" in lines[2]
+        output = io.StringIO()
+        export_tasks(storage, output, "html")
+        assert "&lt;b&gt;Bold&lt;/b&gt; &amp; co" in output.getvalue()
+        assert output.getvalue().rstrip().endswith("</html>")
+        print("PASS: Markdown and HTML cells are escaped and filters apply")
+
+        chunks = list(iter_export_chunks((Task(i, f"Task {i}") for i in range(1, 11)), "jsonl", batch_size=4))
+        assert len(chunks) == 3 and chunks[2].count("\n") == 2
+        try:
+            export_tasks(storage, io.StringIO(), "pdf")
+            assert False, "Should have raised ValueError for an unknown format"
+        except ValueError:
+            print("PASS: Tasks are rendered in batches and unknown formats are rejected")
+
+    print("All export tests passed!\n")
+
+
+def test_schema_migration():
+    """Test versioned task files and migration of older ones"""
+    import json
+    print("Testing schema migration...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        legacy = {"tasks": {"1": {"id": 1, "title": "Old task", "completed": True},
+                            "2": {"id": 2, "title": "Tagged", "tags": ["home"], "priority": "high"}},
+                  "next_id": 3}
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+
+        storage = TaskStorage(filename)
+        old_task = storage.get_task(1)
+        assert old_task.completed == True and old_task.tags == [] and old_task.priority == "medium"
+        assert storage.get_task(2).tags == ["home"] and storage.get_next_id() == 3
+        assert storage.wait_for_upgrade(timeout=10) == True
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert data["schema_version"] == SCHEMA_VERSION
+        assert data["tasks"]["1"]["priority"] == "medium" and data["tasks"]["1"]["due_date"] is None
+        assert storage.get_schema_info() == {"schema_version": SCHEMA_VERSION,
+                                             "file_schema_version": SCHEMA_VERSION,
+                                             "upgrade_pending": False}
+        print("PASS: Unversioned files are migrated on load and rewritten in the background")
+
+        records = list(migrate_records([{"id": 5, "title": "Backup"}], 1))
+        assert records[0]["tags"] == [] and records[0]["completed"] == False
+        print("PASS: Records from older backups are migrated")
+
+        data["schema_version"] = SCHEMA_VERSION + 1
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        for contents in (json.dumps(data), '{"tasks": {"1": {"id": 1,'):
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(contents)
+            try:
+                TaskStorage(filename)
+                assert False, "Should have raised ValueError for an unloadable file"
+            except ValueError:
+                pass
+            with open(filename, 'r', encoding='utf-8') as f:
+                assert f.read() == contents
+        print("PASS: Newer and corrupt files are rejected and left unchanged")
+
+    print("All schema migration tests passed!\n")
+
+
+def test_snapshots():
+    """Test copy-on-write snapshots of the store"""
+    import random
+    import threading
+    print("Testing snapshots...")
+
+    versions = []
+    reference = {}
+    tree = PersistentMap()
+    rng = random.Random(3)
+    for step in range(3000):
+        key = rng.randrange(1, 5000)
+        if rng.random() < 0.3:
+            tree, _ = tree.remove(key), reference.pop(key, None)
+        else:
+            tree, reference[key] = tree.set(key, step), step
+        if step % 500 == 0:
+            versions.append((tree, sorted(reference.items())))
+    assert all(list(version.items()) == items for version, items in versions)
+    assert list(PersistentMap.from_items(sorted(reference.items())).items()) == sorted(reference.items())
+    print("PASS: Persistent map versions are unaffected by later changes")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"), max_cached_tasks=2)
+        first = storage.add_task("First", tags="home")
+        second = storage.add_task("Second")
+        before = storage.snapshot()
+        storage.update_task(first, title="Renamed", tags="work")
+        storage.toggle_task_status(second)
+        third = storage.add_task("Third")
+        storage.delete_task(second)
+        assert [task.title for task in before.get_all_tasks()] == ["First", "Second"]
+        assert before.get_task(first).tags == ("home",) and before.get_task(second).completed == False
+        assert before.get_task(third) is None and before.get_next_id() == 3
+        after = storage.snapshot()
+        assert [task.title for task in after.iter_tasks()] == ["Renamed", "Third"]
+        assert after.version > before.version and len(after) == 2
+        assert [task.id for task in after.query_tasks(tags="work")] == [first]
+        storage.undo()
+        assert storage.snapshot().get_task(second).completed == True and len(after) == 2
+        try:
+            before.get_task(first).title = "Changed"
+            assert False, "Should have raised AttributeError for a snapshot task"
+        except AttributeError:
+            assert isinstance(before.get_task(first), FrozenTask)
+        print("PASS: Snapshots keep their point-in-time state and are read-only")
+
+        done = threading.Event()
+        torn = []
+
+        def read():
+            while not done.is_set():
+                snapshot = storage.snapshot()
+                count = sum(1 for _ in snapshot.iter_tasks())
+                if count != len(snapshot) or count % 10:
+                    torn.append(count)
+
+        reader = threading.Thread(target=read)
+        storage.delete_task(third)
+        storage.delete_task(first)
+        storage.delete_task(second)
+        reader.start()
+        for batch in range(50):
+            storage.import_tasks([{"title": f"Batch {batch} task {i}"} for i in range(10)])
+        done.set()
+        reader.join()
+        assert not torn and storage.snapshot().get_task_count() == 500
+        print("PASS: Concurrent readers never see half of a batch")
+
+    print("All snapshot tests passed!\n")
+
+
+def test_dependencies():
+    """Test task dependencies and the ready set"""
+    import random
+    print("Testing task dependencies...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tasks.json")
+        storage = TaskStorage(filename)
+        design = storage.add_task("Design", priority="low")
+        build = storage.add_task("Build", blocked_by=[design])
+        test = storage.add_task("Test", blocked_by="1, 2", priority="high")
+        docs = storage.add_task("Docs", due_date="2030-01-01")
+        assert storage.get_task(test).blocked_by == [design, build]
+        assert [task.id for task in storage.next_actionable()] == [docs, design]
+        assert storage.get_open_blockers(test) == [design, build]
+        print("PASS: Blocked tasks are not actionable")
+
+        for blockers, message in (([test], "cycle"), ([build], "cycle"), ([design], "itself"),
+                                  ([99], "not found")):
+            try:
+                storage.update_task(design, blocked_by=blockers)
+                assert False, f"Should have rejected blockers {blockers}"
+            except ValueError as e:
+                assert message in str(e)
+        try:
+            storage.add_task("Orphan", blocked_by=[99])
+            assert False, "Should have raised ValueError for a missing blocker"
+        except ValueError:
+            assert storage.get_task_count() == 4
+        print("PASS: Missing blockers and cycles are rejected")
+
+        storage.toggle_task_status(design)
+        assert [task.id for task in storage.next_actionable()] == [docs, build]
+        storage.delete_task(build)
+        assert [task.id for task in storage.next_actionable(limit=1)] == [test]
+        storage.undo()
+        assert test not in [task.id for task in storage.next_actionable()]
+        assert storage.remove_dependency(test, build) and storage.add_dependency(docs, test)
+        assert [task.id for task in storage.next_actionable()] == [test, build]
+        assert storage.topological_order().index(test) < storage.topological_order().index(docs)
+        print("PASS: Completing, deleting and undoing update the ready set")
+
+        storage.close()
+        reloaded = TaskStorage(filename)
+        assert reloaded.get_task(docs).blocked_by == [test]
+        assert [task.id for task in reloaded.next_actionable()] == [test, build]
+        print("PASS: Dependencies are saved and reloaded")
+
+        rng = random.Random(5)
+        storage = TaskStorage(os.path.join(tmp_dir, "random.json"))
+        for step in range(600):
+            task_ids = [task.id for task in storage.iter_tasks()]
+            choice = rng.random()
+            try:
+                if choice < 0.3 or not task_ids:
+                    storage.add_task(f"Task {step}",
+                                     blocked_by=rng.sample(task_ids, min(len(task_ids), 2)))
+                elif choice < 0.55:
+                    storage.add_dependency(rng.choice(task_ids), rng.choice(task_ids))
+                elif choice < 0.75:
+                    storage.toggle_task_status(rng.choice(task_ids))
+                elif choice < 0.85:
+                    storage.delete_task(rng.choice(task_ids))
+                else:
+                    storage.undo()
+            except ValueError:
+                pass
+            tasks = {task.id: task for task in storage.get_all_tasks()}
+            expected = {task.id for task in tasks.values() if not task.completed and
+                        all(blocker not in tasks or tasks[blocker].completed for blocker in task.blocked_by)}
+            assert {task.id for task in storage.next_actionable()} == expected
+        position = {task_id: i for i, task_id in enumerate(storage.topological_order())}
+        assert all(position[blocker] < position[task.id] for task in tasks.values()
+                   for blocker in task.blocked_by if blocker in tasks)
+        print("PASS: The ready set and order match a full recomputation")
+
+    print("All dependency tests passed!\n")
+
+
+def test_audit_log():
+    """Test the audit log and per-task history"""
+    print("Testing audit log...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        audit_dir = os.path.join(tmp_dir, "audit")
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"), audit_dir=audit_dir)
+        task_id = storage.add_task("Write report", tags="work", due_date="2030-01-31")
+        with acting_as("agent"):
+            storage.update_task(task_id, title="Write the report", priority="high")
+        storage.toggle_task_status(task_id)
+        storage.undo()
+        storage.delete_task(task_id)
+
+        entries = storage.history(task_id)
+        assert [entry["action"] for entry in entries] == ["add", "update", "update", "update", "delete"]
+        assert entries[0]["changes"]["due_date"] == [None, "2030-01-31"]
+        assert entries[1]["actor"] == "agent" and entries[0]["actor"] != "agent"
+        assert entries[1]["changes"] == {"title": ["Write report", "Write the report"],
+                                         "priority": ["medium", "high"]}
+        assert entries[3]["changes"] == {"completed": [True, False]}
+        assert entries[4]["changes"]["title"] == ["Write the report", None]
+        assert [entry["seq"] for entry in entries] == [1, 2, 3, 4, 5]
+        storage.close()
+        print("PASS: Changes are recorded with actor and field changes")
+
+        reopened = TaskStorage(os.path.join(tmp_dir, "tasks.json"), audit_dir=audit_dir)
+        assert reopened.history(task_id) == entries
+        other = reopened.add_task("Other")
+        assert reopened.history(other)[0]["seq"] == 6
+        try:
+            TaskStorage(os.path.join(tmp_dir, "plain.json")).history(1)
+            assert False, "Should have raised ValueError without an audit log"
+        except ValueError:
+            pass
+        print("PASS: The log is reloaded and continues where it stopped")
+
+        log = AuditLog(os.path.join(tmp_dir, "rotating"), segment_bytes=8000, block_bytes=1000)
+        storage = TaskStorage(os.path.join(tmp_dir, "rotating.json"))
+        storage.add_listener(log.on_change)
+        for i in range(300):
+            new_id = storage.add_task(f"Task {i}")
+            storage.update_task(i % 7 + 1, description=f"Change {i}")
+        stats = log.get_stats()
+        assert stats["entries"] == 600 and stats["sealed_segments"] > 3
+        for task_id in (1, 7, 300):
+            expected = [entry for entry in log.iter_entries() if entry["task_id"] == task_id]
+            assert log.history(task_id) == expected and expected
+        first_history = log.history(1)
+        assert len(first_history) == 1 + 43
+        storage.remove_listener(log.on_change)
+        log.close()
+
+        reloaded = AuditLog(os.path.join(tmp_dir, "rotating"), segment_bytes=8000, block_bytes=1000,
+                            max_segments=2)
+        assert reloaded.history(1) == first_history
+        storage.add_listener(reloaded.on_change)
+        for i in range(100):
+            storage.update_task(new_id, description=f"Late change {i}")
+        assert reloaded.get_stats()["sealed_segments"] == 2
+        kept = reloaded.history(1)
+        assert len(kept) < len(first_history) and first_history[len(first_history) - len(kept):] == kept
+        assert len(reloaded.history(new_id)) >= 100
+        print("PASS: Segments rotate, compress and expire, and history reads only the task's blocks")
+
+    print("All audit log tests passed!\n")
+
+
+def test_semantic_index():
+    """Test related-task search over the semantic index"""
+    print("Testing semantic index...")
+
+    vector = hashing_embedding("Quarterly report for the board")
+    assert abs(sum(value * value for value in vector.values()) - 1.0) < 1e-9
+    assert hashing_embedding("the and of") == {}
+    print("PASS: Embeddings are unit length and ignore stop words")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        report = storage.add_task("Draft the quarterly report", "Numbers for Q3")
+        storage.add_task("Water the plants")
+        slides = storage.add_task("Slides for the board meeting", "Summarize quarter results")
+        index = SemanticIndex(storage)
+        related = index.find_related("anything about the quarterly report?")
+        assert related[0][0] == report and 0 < related[0][1] <= 1
+        assert all(score >= next_score for (_, score), (_, next_score) in zip(related, related[1:]))
+        assert index.find_related("quarterly report", k=1, exclude=[report])[0][0] == slides
+        assert index.find_related("zebra xylophone") == []
+        print("PASS: Tasks are ranked by similarity to the query")
+
+        flight = storage.add_task("Book a flight to Berlin")
+        assert index.find_related("flight booking", k=1)[0][0] == flight
+        storage.update_task(flight, title="Renew passport")
+        assert index.find_related("passport", k=1)[0][0] == flight
+        storage.delete_task(report)
+        assert report not in [task_id for task_id, _ in index.find_related("quarterly report")]
+        storage.undo()
+        assert index.find_related("quarterly report", k=1)[0][0] == report
+        assert index.related_to_task(report, k=1)[0][0] == slides
+        assert len(index) == storage.get_task_count()
+        print("PASS: The index follows adds, updates, deletes and undo")
+
+        for i in range(300):
+            storage.add_task(f"Filler task {i}", f"Routine item number {i}")
+        approximate = SemanticIndex(storage, approximate=True)
+        queries = ["quarterly report", "board meeting slides", "renew passport", "water plants"]
+        for query in queries:
+            exact = index.find_related(query, k=1)
+            assert approximate.find_related(query, k=1)[0][0] == exact[0][0]
+        assert approximate.get_stats()["approximate"] == True
+        print("PASS: Approximate search finds the close matches")
+
+        custom = SemanticIndex(storage, dimensions=3,
+                               embedder=lambda text: [text.count("a"), text.count("e"), 1])
+        assert len(custom) == storage.get_task_count()
+        bad = SemanticIndex(dimensions=4, embedder=lambda text: [1.0, 2.0])
+        try:
+            bad.add(1, "Mismatched")
+            assert False, "Should have raised ValueError for a vector of the wrong length"
+        except ValueError:
+            pass
+        print("PASS: Custom embedders are used and their vector length is checked")
+
+    print("All semantic index tests passed!\n")
+
+
+def test_semantic_backends():
+    """Test that the NumPy and sparse semantic backends agree"""
+    pytest.importorskip("numpy")
+    print("Testing semantic index backends...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        words = ["report", "budget", "flight", "hotel", "invoice", "slides", "contract", "garden",
+                 "passport", "dentist", "roadmap", "offsite", "taxes", "newsletter", "review"]
+        rng = random.Random(3)
+        storage.import_tasks([{"title": " ".join(rng.sample(words, 3)), "description": f"Note {i}"}
+                              for i in range(400)])
+        queries = ["quarterly report budget", "flight and hotel", "renew passport", "garden"]
+        for approximate in (False, True):
+            numpy_index = SemanticIndex(storage, backend="numpy", approximate=approximate)
+            sparse_index = SemanticIndex(storage, backend="sparse", approximate=approximate)
+            for i in range(40):  # Incremental updates after the bulk load
+                storage.update_task(rng.randint(1, 400), title=" ".join(rng.sample(words, 2)))
+            storage.delete_task(rng.randint(1, 400))
+            for query in queries:
+                expected = sparse_index.find_related(query, k=8)
+                actual = numpy_index.find_related(query, k=8)
+                assert len(actual) == len(expected)
+                assert all(abs(a[1] - e[1]) < 1e-5 for a, e in zip(actual, expected))
+            if approximate:
+                assert numpy_index._band_keys == sparse_index._band_keys
+            storage.remove_listener(numpy_index._on_change)
+            storage.remove_listener(sparse_index._on_change)
+        assert numpy_index.get_stats()["backend"] == "numpy"
+        print("PASS: Both backends return the same scores and buckets")
+
+    print("All semantic backend tests passed!\n")
+
+
+def test_render_cache():
+    """Test cached task renderings are invalidated per task"""
+    print("Testing render cache...")
+    import io
+    from rich.console import Console
+    from phase_i_in_memory_python_console_app.render_cache import RenderCache
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        first = storage.add_task("First")
+        second = storage.add_task("Second")
+        cache = RenderCache(Console(file=io.StringIO(), width=80, force_terminal=True), storage)
+        row = lambda task: f"[bold]{task.title}[/]"
+
+        text = cache.render(storage.get_task(first), "row", row)
+        assert "First" in text and "\x1b[" in text
+        cache.render(storage.get_task(second), "row", row)
+        cache.render(storage.get_task(first), "row", row)
+        assert cache.get_stats() == {"tasks": 2, "hits": 1, "misses": 2}
+        print("PASS: Renderings are cached")
+
+        storage.update_task(first, title="Renamed")
+        assert "Renamed" in cache.render(storage.get_task(first), "row", row)
+        cache.render(storage.get_task(second), "row", row)
+        assert cache.get_stats()["hits"] == 2 and cache.get_stats()["misses"] == 3
+        print("PASS: Only the changed task is re-rendered")
+
+        storage.delete_task(second)
+        assert cache.get_stats()["tasks"] == 1
+        print("PASS: Deleted tasks are evicted")
+
+        misses = cache.get_stats()["misses"]
+        cache._day = date.today() - timedelta(days=1)  # As if the cache was filled yesterday
+        cache.render(storage.get_task(first), "row", row)
+        assert cache.get_stats()["misses"] == misses + 1
+        print("PASS: Renderings are redone when the date changes")
+
+    print("All render cache tests passed!\n")
+
+
+def test_fuzzy_index():
+    """Test incremental fuzzy matching over task titles"""
+    print("Testing fuzzy task index...")
+    from phase_i_in_memory_python_console_app.search import FuzzyIndex
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = TaskStorage(os.path.join(tmp_dir, "tasks.json"))
+        for title in ["Buy groceries", "Write quarterly report", "Call Bob", "Book flights"]:
+            storage.add_task(title)
+        index = FuzzyIndex(storage)
+
+        assert index.search("report") == [2]
+        assert index.search("bk") == [4]
+        assert index.search("b") == [4, 1, 3]
+        print("PASS: Contiguous and subsequence matches work")
+
+        # Typing more characters narrows the previous matches
+        assert index.search("bo") == [4, 3, 1]
+        assert index.search("boo") == [4]
+        assert index.search("xyz") == []
+        print("PASS: Incremental narrowing works")
+
+        assert index.search("3")[0] == 3
+        print("PASS: Typing a task ID selects that task")
+
+        storage.update_task(3, title="Call Alice")
+        storage.delete_task(4)
+        assert index.search("bob") == []
+        assert index.search("alice") == [3]
+        print("PASS: Index follows storage changes")
+
+    print("All fuzzy index tests passed!\n")
+
+
 def test_cli_commands():
     """Test CLI command handling"""
     print("Testing CLI command handling...")
@@ -158,6 +1418,31 @@ def main():
     
     test_models()
     test_storage()
+    test_iter_tasks()
+    test_orderings()
+    test_validation()
+    test_undo_redo()
+    test_task_fields_and_queries()
+    test_stats()
+    test_tenant_store()
+    test_bounded_memory()
+    test_background_flush()
+    test_compressed_storage()
+    test_read_replicas()
+    test_scheduler()
+    test_duplicate_index()
+    test_export()
+    test_schema_migration()
+    test_snapshots()
+    test_dependencies()
+    test_audit_log()
+    test_semantic_index()
+    try:
+        test_semantic_backends()
+    except pytest.skip.Exception:
+        print("SKIP: NumPy is not installed\n")
+    test_render_cache()
+    test_fuzzy_index()
     test_cli_commands()
     
     print("All tests passed! The Todo Console App is working correctly.")